@@ -1,3 +1,5 @@
-from .pygosolnp import solve, Result, Results
+from .pygosolnp import solve, solve_iter, solve_async, solve_async_iter, Solver, Result, Results, EvaluationSettings
+from .backends import Backend, SerialBackend, ThreadBackend, ProcessBackend, ExecutorBackend
+from .distributed import DistributedBackend
 from .model import EvaluationType
 from .sampling import UniformDistribution, NormalDistribution
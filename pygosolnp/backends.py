@@ -0,0 +1,358 @@
+import abc
+import itertools
+import os
+import threading
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, wait
+from functools import partial
+from multiprocessing import Pool
+from typing import Callable, Iterable, Optional, List
+try:
+    from queue import SimpleQueue
+except ImportError:
+    # SimpleQueue is only available from Python 3.7
+    from queue import Queue as SimpleQueue
+
+from pygosolnp.evaluation_functions import initialize_worker_problem_functions
+from pygosolnp.shared_array import start_shared_memory_tracking
+
+
+class Backend(abc.ABC):
+    """
+    Runs the tasks of a solve, that is the evaluations of the starting guesses and the pysolnp restarts.
+    A backend is started once with the problem functions before it runs any tasks, and closed when it is no longer used.
+    """
+
+    @property
+    @abc.abstractmethod
+    def number_of_workers(self) -> int:
+        pass
+
+    @property
+    def is_in_process(self) -> bool:
+        """
+        True if the tasks run in this process and read the resources of the run from it, False if the tasks run in
+        other processes and the resources of the run are sent along with the tasks.
+        """
+        return True
+
+    @property
+    def is_remote(self) -> bool:
+        """
+        True if the tasks run where the memory of this process can not be shared, for example on other machines. The rows
+        of the buffers that a task reads are then sent along with it, and the rows that it writes are sent back.
+        Only used when is_in_process is False.
+        """
+        return False
+
+    @property
+    def registers_problem_functions(self) -> bool:
+        """
+        True if start registers the problem functions in the processes of the backend, otherwise the problem functions
+        are sent along with the resources of each run. Only used when is_in_process is False.
+        """
+        return False
+
+    def start(self, problem_functions: tuple):
+        """
+        :param problem_functions: The arguments for initialize_worker_problem_functions
+        """
+        pass
+
+    @abc.abstractmethod
+    def run_tasks(self, function: Callable, iterable: Iterable[tuple]) -> list:
+        """
+        Runs function(*arguments) for each tuple of arguments and returns the return values in order, like Pool.starmap.
+        """
+        pass
+
+    @abc.abstractmethod
+    def submit_tasks(self, completed: SimpleQueue, function: Callable, iterable: Iterable[tuple]) -> list:
+        """
+        Starts function(*arguments) for each tuple of arguments without waiting for them, and puts the return value or
+        the raised exception of each task in completed as the task finishes.
+        Backends that run the tasks in the calling thread can put a functools.partial of the task in completed instead,
+        the task then runs when its result is taken.
+        :return: The submitted tasks, in the form that cancel_tasks takes them
+        """
+        pass
+
+    def cancel_tasks(self, tasks: list):
+        """
+        Cancels submitted tasks that have not finished, their results are no longer needed. Tasks that have not started
+        are dropped and running tasks are stopped where the backend is able to.
+        :param tasks: Tasks returned by submit_tasks
+        """
+        pass
+
+    def close(self):
+        pass
+
+
+def _put_future_result(completed: SimpleQueue, future: Future):
+    try:
+        completed.put(future.result())
+    except BaseException as exception:
+        completed.put(exception)
+
+
+class SerialBackend(Backend):
+    """
+    Runs all tasks one at a time in this process.
+    """
+
+    @property
+    def number_of_workers(self) -> int:
+        return 1
+
+    def run_tasks(self, function: Callable, iterable: Iterable[tuple]) -> list:
+        return [function(*arguments) for arguments in iterable]
+
+    def submit_tasks(self, completed: SimpleQueue, function: Callable, iterable: Iterable[tuple]) -> list:
+        # The tasks are queued unevaluated and run when their result is taken, so there is nothing to cancel
+        for arguments in iterable:
+            completed.put(partial(function, *arguments))
+        return []
+
+
+class ExecutorBackend(Backend):
+    """
+    Runs the tasks with a concurrent.futures.Executor, for example a ThreadPoolExecutor, a ProcessPoolExecutor or the
+    executor of a cluster. The executor is not shut down when the backend is closed.
+    Tasks that run in other processes receive the problem functions and the resources of each run in pickled form, so
+    the problem functions need to be pickleable.
+    """
+
+    def __init__(self, executor: Executor, number_of_workers: Optional[int] = None, is_in_process: Optional[bool] = None):
+        """
+        :param executor: The executor to submit the tasks to
+        :param number_of_workers: [Optional, default None] The number of tasks the executor runs at the same time, used
+        to size the evaluation tasks. If None, the max_workers of the executor or else the number of CPUs.
+        :param is_in_process: [Optional, default None] If the executor runs the tasks in this process, if None only a
+        ThreadPoolExecutor is assumed to run the tasks in this process
+        """
+        if number_of_workers is not None and (type(number_of_workers) is not int or number_of_workers < 1):
+            raise ValueError("number_of_workers needs to be None or a positive integer value")
+
+        if number_of_workers is None:
+            # The standard library executors keep their max_workers in this attribute
+            number_of_workers = getattr(executor, "_max_workers", None) or os.cpu_count() or 1
+        if is_in_process is None:
+            is_in_process = isinstance(executor, ThreadPoolExecutor)
+
+        self.__executor = executor
+        self.__number_of_workers = number_of_workers
+        self.__is_in_process = is_in_process
+
+    @property
+    def number_of_workers(self) -> int:
+        return self.__number_of_workers
+
+    @property
+    def is_in_process(self) -> bool:
+        return self.__is_in_process
+
+    @property
+    def executor(self) -> Executor:
+        return self.__executor
+
+    def start(self, problem_functions: tuple):
+        if not self.__is_in_process:
+            start_shared_memory_tracking()
+
+    def run_tasks(self, function: Callable, iterable: Iterable[tuple]) -> list:
+        futures = [self.__executor.submit(function, *arguments) for arguments in iterable]
+        return [future.result() for future in futures]
+
+    def submit_tasks(self, completed: SimpleQueue, function: Callable, iterable: Iterable[tuple]) -> List[Future]:
+        futures = []
+        for arguments in iterable:
+            future = self.__executor.submit(function, *arguments)
+            future.add_done_callback(partial(_put_future_result, completed))
+            futures.append(future)
+        return futures
+
+    def cancel_tasks(self, tasks: List[Future]):
+        # Executors can not stop running calls, they finish and their results are dropped
+        running_futures = [future for future in tasks if not future.cancel()]
+        if self.__is_in_process:
+            # Tasks in this process write to the resources of the run, which the next run replaces
+            wait(running_futures)
+
+
+class ThreadBackend(ExecutorBackend):
+    """
+    Runs the tasks in a pool of threads in this process. Nothing is pickled or copied between the threads, which suits
+    problem functions that release the GIL, such as compiled extensions.
+    """
+
+    def __init__(self, number_of_threads: int):
+        """
+        :param number_of_threads: The number of threads in the pool
+        """
+        if type(number_of_threads) is not int or number_of_threads < 1:
+            raise ValueError("number_of_threads needs to be a positive integer value")
+
+        self.__thread_pool = ThreadPoolExecutor(max_workers=number_of_threads)
+        # The submitted tasks that have not finished, cancelled on close
+        self.__futures = set()
+        self.__futures_lock = threading.Lock()
+        super().__init__(executor=self.__thread_pool, number_of_workers=number_of_threads, is_in_process=True)
+
+    def submit_tasks(self, completed: SimpleQueue, function: Callable, iterable: Iterable[tuple]) -> List[Future]:
+        futures = super().submit_tasks(completed=completed, function=function, iterable=iterable)
+        with self.__futures_lock:
+            self.__futures.update(futures)
+        for future in futures:
+            future.add_done_callback(self.__forget)
+        return futures
+
+    def __forget(self, future: Future):
+        with self.__futures_lock:
+            self.__futures.discard(future)
+
+    def close(self):
+        # ThreadPoolExecutor.shutdown only cancels the queued tasks itself from Python 3.9
+        with self.__futures_lock:
+            futures = list(self.__futures)
+        for future in futures:
+            future.cancel()
+        self.__thread_pool.shutdown(wait=True)
+
+
+class ProcessBackend(Backend):
+    """
+    Runs the tasks in a multiprocessing.Pool, which registers the problem functions once in each process when it starts.
+    The tasks are handed to the pool as its processes become free, so cancelled tasks that have not started are dropped.
+    Cancelling running tasks terminates the processes and starts new ones, the other running tasks are then started
+    again.
+    """
+
+    def __init__(self, number_of_processes: int):
+        """
+        :param number_of_processes: The number of processes in the pool
+        """
+        if type(number_of_processes) is not int or number_of_processes < 1:
+            raise ValueError(
+                "number_of_processes needs to be a positive integer value and is recommended to be greater than or equal to 2")
+
+        self.__number_of_processes = number_of_processes
+        self.__problem_functions = None
+        self.__pool = None
+        # The (completed, function, arguments, index) of each unfinished task by task id
+        self.__tasks = {}
+        self.__task_ids = itertools.count()
+        # The ids of the tasks waiting for a free process, and of the tasks handed to the pool
+        self.__queued_task_ids = deque()
+        self.__running_task_ids = set()
+        # Taken to replace the pool, the callbacks of the pool only take the lock of the tasks
+        self.__pool_lock = threading.RLock()
+        self.__tasks_lock = threading.Lock()
+
+    @property
+    def number_of_workers(self) -> int:
+        return self.__number_of_processes
+
+    @property
+    def is_in_process(self) -> bool:
+        return False
+
+    @property
+    def registers_problem_functions(self) -> bool:
+        return True
+
+    def start(self, problem_functions: tuple):
+        # The processes need to report to the shared memory tracker of this process, so it is started before them
+        start_shared_memory_tracking()
+        self.__problem_functions = problem_functions
+        self.__pool = self.__create_pool()
+
+    def __create_pool(self) -> Pool:
+        return Pool(processes=self.__number_of_processes,
+                    initializer=initialize_worker_problem_functions,
+                    initargs=self.__problem_functions)
+
+    def __submit(self, completed: SimpleQueue, function: Callable, arguments: tuple, index: Optional[int] = None) -> int:
+        with self.__tasks_lock:
+            task_id = next(self.__task_ids)
+            self.__tasks[task_id] = (completed, function, arguments, index)
+            self.__queued_task_ids.append(task_id)
+            self.__start_queued_tasks()
+        return task_id
+
+    def __start_queued_tasks(self):
+        # Called with the lock of the tasks held. Each task is handed to the pool on its own when a process is free, so
+        # the tasks that the pool holds are the running ones
+        while self.__pool is not None and len(self.__running_task_ids) < self.__number_of_processes and \
+                len(self.__queued_task_ids) > 0:
+            task_id = self.__queued_task_ids.popleft()
+            # Cancelled tasks are only removed from the tasks
+            if task_id not in self.__tasks:
+                continue
+            _, function, arguments, _ = self.__tasks[task_id]
+            self.__running_task_ids.add(task_id)
+            finish = partial(self.__finish, task_id)
+            self.__pool.apply_async(function, arguments, callback=finish, error_callback=finish)
+
+    def __finish(self, task_id: int, result):
+        with self.__tasks_lock:
+            # Tasks that were cancelled or started again in a new pool are not reported
+            if task_id not in self.__running_task_ids:
+                return
+            self.__running_task_ids.remove(task_id)
+            completed, _, _, index = self.__tasks.pop(task_id)
+            self.__start_queued_tasks()
+        completed.put(result if index is None else (index, result))
+
+    def run_tasks(self, function: Callable, iterable: Iterable[tuple]) -> list:
+        completed = SimpleQueue()
+        number_of_tasks = 0
+        for index, arguments in enumerate(iterable):
+            self.__submit(completed=completed, function=function, arguments=arguments, index=index)
+            number_of_tasks += 1
+
+        results = [None] * number_of_tasks
+        for _ in range(number_of_tasks):
+            index, result = completed.get()
+            results[index] = result
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return results
+
+    def submit_tasks(self, completed: SimpleQueue, function: Callable, iterable: Iterable[tuple]) -> List[int]:
+        return [self.__submit(completed=completed, function=function, arguments=arguments) for arguments in iterable]
+
+    def cancel_tasks(self, tasks: List[int]):
+        with self.__pool_lock:
+            with self.__tasks_lock:
+                is_running_task_cancelled = False
+                for task_id in tasks:
+                    if task_id in self.__tasks:
+                        del self.__tasks[task_id]
+                        is_running_task_cancelled |= task_id in self.__running_task_ids
+                if not is_running_task_cancelled:
+                    return
+                # The pool can not stop single tasks, so all of its processes are replaced and the other running
+                # tasks are started again first
+                restarted_task_ids = sorted(task_id for task_id in self.__running_task_ids if task_id in self.__tasks)
+                self.__queued_task_ids = deque(restarted_task_ids + list(self.__queued_task_ids))
+                self.__running_task_ids.clear()
+                pool = self.__pool
+                self.__pool = None
+
+            pool.terminate()
+            pool.join()
+            new_pool = self.__create_pool()
+            with self.__tasks_lock:
+                self.__pool = new_pool
+                self.__start_queued_tasks()
+
+    def close(self):
+        with self.__pool_lock:
+            with self.__tasks_lock:
+                pool = self.__pool
+                self.__pool = None
+            if pool is not None:
+                pool.terminate()
+                pool.join()
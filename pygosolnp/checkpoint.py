@@ -0,0 +1,192 @@
+"""
+Stores the progress of a solve in a directory, so that a solve that was interrupted can resume where it stopped.
+
+Each problem gets its own subdirectory, named after a fingerprint of the problem, its settings and its sampling:
+    evaluations.npz  The number of evaluated samples and the best guesses so far, written after each evaluation chunk
+    restarts.npz     The started restarts and the restart_results rows of the finished ones, written as they change
+"""
+import hashlib
+import os
+import pickle
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy
+
+from pygosolnp.model import ProblemModel
+from pygosolnp.sampling import Sampling
+
+EVALUATIONS_FILE_NAME = "evaluations.npz"
+RESTARTS_FILE_NAME = "restarts.npz"
+
+
+def __function_name(function: Optional[Callable]) -> Optional[str]:
+    if function is None:
+        return None
+    return f"{getattr(function, '__module__', None)}:{getattr(function, '__qualname__', repr(function))}"
+
+
+def __list_value(values) -> Optional[List[float]]:
+    if values is None:
+        return None
+    return [float(value) for value in values]
+
+
+def problem_fingerprint(model: ProblemModel, sampling: Sampling, restart_result_size: int) -> str:
+    """
+    A hash of everything that decides the starting guesses, the evaluations and the restarts of a solve. The problem
+    functions are identified by name, so a solve with changed function bodies needs another checkpoint directory.
+    :param sampling: The Sampling of the solve before it generated any samples
+    :param restart_result_size: The number of values in each restart_results row
+    """
+    try:
+        sampling_state = pickle.dumps(sampling)
+    except Exception:
+        # Samplings that can not be pickled are only told apart by their type
+        sampling_state = type(sampling).__qualname__.encode()
+
+    problem = (
+        [__function_name(function) for function in
+         [model.obj_func, model.eq_func, model.ineq_func, model.obj_func_batch, model.eq_func_batch,
+          model.ineq_func_batch]],
+        __list_value(model.par_lower_limit),
+        __list_value(model.par_upper_limit),
+        __list_value(model.eq_values),
+        __list_value(model.ineq_lower_bounds),
+        __list_value(model.ineq_upper_bounds),
+        model.number_of_restarts,
+        model.number_of_evaluations,
+        model.evaluation_type.value,
+        model.evaluation_chunk_size,
+        model.sample_in_workers,
+        model.early_restart_index,
+        model.critical_distance,
+        model.rho,
+        model.max_major_iter,
+        model.max_minor_iter,
+        model.delta,
+        model.tolerance,
+        restart_result_size
+    )
+    digest = hashlib.sha256(pickle.dumps(problem))
+    digest.update(sampling_state)
+    previous_results = model.previous_results
+    if previous_results is not None:
+        # The reused guesses of an earlier solve
+        digest.update(pickle.dumps((previous_results.evaluation_settings, previous_results.is_partial,
+                                    previous_results.has_all_guesses)))
+        digest.update(numpy.ascontiguousarray(previous_results.starting_guess_array).tobytes())
+        digest.update(numpy.ascontiguousarray(previous_results.starting_guess_scores).tobytes())
+    return digest.hexdigest()[:32]
+
+
+def _save(path: str, arrays: Dict[str, numpy.ndarray]):
+    # Written next to the previous file and then swapped in, so an interrupted write keeps the previous file
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as file:
+        numpy.savez(file, **arrays)
+    os.replace(temporary_path, path)
+
+
+def _load(path: str) -> Optional[Dict[str, numpy.ndarray]]:
+    if not os.path.exists(path):
+        return None
+    with numpy.load(path) as arrays:
+        return {name: arrays[name] for name in arrays.files}
+
+
+class Checkpoint:
+    """
+    The checkpoint files of one solve. Without resume, the progress of earlier solves of the same problem is discarded.
+    """
+
+    def __init__(self, directory: str, fingerprint: str, resume: bool, number_of_parameters: int):
+        """
+        :param directory: The checkpoint directory, the files are stored in a subdirectory named after the fingerprint
+        :param fingerprint: The problem_fingerprint of the solve
+        :param resume: If True, the progress stored by an earlier solve of the same problem is used
+        :param number_of_parameters: The number of parameters of the problem
+        """
+        self.__directory = os.path.join(os.fspath(directory), fingerprint)
+        os.makedirs(self.__directory, exist_ok=True)
+        self.__evaluations_path = os.path.join(self.__directory, EVALUATIONS_FILE_NAME)
+        self.__restarts_path = os.path.join(self.__directory, RESTARTS_FILE_NAME)
+
+        self.__evaluations = None
+        self.__started_sample_indices = numpy.empty(shape=0, dtype=numpy.int64)
+        self.__started_guesses = numpy.empty(shape=(0, number_of_parameters), dtype=numpy.float64)
+        self.__finished_restarts = {}
+        if resume:
+            self.__evaluations = _load(self.__evaluations_path)
+            restarts = _load(self.__restarts_path)
+            if restarts is not None:
+                self.__started_sample_indices = restarts["started_sample_indices"]
+                self.__started_guesses = restarts["started_guesses"]
+                self.__finished_restarts = dict(zip(restarts["finished_sample_indices"].tolist(),
+                                                    restarts["finished_rows"]))
+        else:
+            for path in [self.__evaluations_path, self.__restarts_path]:
+                if os.path.exists(path):
+                    os.remove(path)
+
+    @property
+    def directory(self) -> str:
+        return self.__directory
+
+    @property
+    def number_of_evaluated_samples(self) -> int:
+        # The number of samples that the stored evaluations cover, 0 if there are none
+        if self.__evaluations is None:
+            return 0
+        return int(self.__evaluations["number_of_evaluated_samples"])
+
+    @property
+    def evaluations(self) -> Optional[Dict[str, numpy.ndarray]]:
+        """
+        The arrays of the last save_evaluations call, None if there are none.
+        """
+        return self.__evaluations
+
+    @property
+    def started_restarts(self) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        The sample indices and the guesses of the started restarts, in the order they were started.
+        """
+        return self.__started_sample_indices, self.__started_guesses
+
+    def finished_restart(self, sample_index: int) -> Optional[numpy.ndarray]:
+        """
+        The restart_results row of the finished restart from the guess with this sample index, None if not finished.
+        """
+        return self.__finished_restarts.get(sample_index)
+
+    def save_evaluations(self, number_of_evaluated_samples: int, **arrays: numpy.ndarray):
+        """
+        :param number_of_evaluated_samples: The number of samples evaluated so far
+        :param arrays: The arrays to restore the evaluations from, see evaluations
+        """
+        self.__evaluations = dict(arrays, number_of_evaluated_samples=numpy.array(number_of_evaluated_samples))
+        _save(path=self.__evaluations_path, arrays=self.__evaluations)
+
+    def add_started_restarts(self, sample_indices: numpy.ndarray, guesses: numpy.ndarray):
+        # Restarts that are started again after resuming are already stored
+        is_new = ~numpy.isin(sample_indices, self.__started_sample_indices)
+        if not is_new.any():
+            return
+        self.__started_sample_indices = numpy.concatenate((self.__started_sample_indices, sample_indices[is_new]))
+        self.__started_guesses = numpy.concatenate((self.__started_guesses, guesses[is_new]))
+        self.__save_restarts()
+
+    def add_finished_restart(self, sample_index: int, restart_row: numpy.ndarray):
+        self.__finished_restarts[sample_index] = restart_row
+        self.__save_restarts()
+
+    def __save_restarts(self):
+        number_of_parameters = self.__started_guesses.shape[1]
+        finished_rows = list(self.__finished_restarts.values())
+        _save(path=self.__restarts_path, arrays={
+            "started_sample_indices": self.__started_sample_indices,
+            "started_guesses": self.__started_guesses,
+            "finished_sample_indices": numpy.array(list(self.__finished_restarts), dtype=numpy.int64),
+            "finished_rows": numpy.stack(finished_rows) if len(finished_rows) > 0 else numpy.empty(
+                shape=(0, number_of_parameters), dtype=numpy.float64)
+        })
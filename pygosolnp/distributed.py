@@ -0,0 +1,253 @@
+"""
+Runs the tasks of a solve in worker processes on other machines, connected over TCP.
+
+Start one worker per CPU to use on each machine, each listening on its own port:
+    python -m pygosolnp.distributed_worker --host 0.0.0.0 --port 6000 --authkey secret
+and pass their addresses to a DistributedBackend. The messages are pickled, so only run workers on trusted networks.
+"""
+import importlib
+import pickle
+import threading
+import time
+from concurrent.futures import Executor, Future
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any, Callable, List, Optional, Tuple
+try:
+    from queue import SimpleQueue
+except ImportError:
+    # SimpleQueue is only available from Python 3.7
+    from queue import Queue as SimpleQueue
+
+import numpy
+
+from pygosolnp import resources
+from pygosolnp.backends import ExecutorBackend
+from pygosolnp.evaluation_functions import initialize_session_run, task_buffer_rows
+
+# Seconds to keep retrying to connect to a worker that is not listening yet
+CONNECT_TIMEOUT_SECONDS = 10.0
+
+
+def function_reference(function: Optional[Callable]) -> Optional[str]:
+    """
+    The "module:qualified name" that a worker imports the function by.
+    Functions defined in __main__, lambdas and closures can not be imported by the workers.
+    """
+    if function is None:
+        return None
+    module = getattr(function, "__module__", None)
+    qualified_name = getattr(function, "__qualname__", None)
+    if module is None or module == "__main__" or qualified_name is None or "<" in qualified_name:
+        raise ValueError(
+            f"Problem function {function!r} can not be imported by the distributed workers, define it at the top level of a module that the workers can import.")
+    return f"{module}:{qualified_name}"
+
+
+def import_function(reference: Optional[str]) -> Optional[Callable]:
+    if reference is None:
+        return None
+    module_name, qualified_name = reference.split(":")
+    function = importlib.import_module(module_name)
+    for name in qualified_name.split("."):
+        function = getattr(function, name)
+    return function
+
+
+def run_remote_task(run_id: str, run_data: bytes, function: Callable, arguments: tuple, inputs: list) -> Tuple[Any, list]:
+    """
+    Runs function(*arguments) in a worker that does not share memory with the coordinator.
+    :param run_id: Identifies the run, the run data is only unpickled by the first task of a run in each worker
+    :param run_data: The pickled run_resources of initialize_session_run, with the problem functions as references under
+    "session_functions" and the shapes of the buffers under "buffer_shapes"
+    :param inputs: The (resource name, start row, rows) that the task reads, see task_buffer_rows
+    :return: The return value of the function and the (resource name, start row, rows) that the task wrote
+    """
+    if resources.session_run_id != run_id:
+        run_resources = pickle.loads(run_data)
+        run_resources["session_functions"] = {name: import_function(reference) for name, reference in
+                                              run_resources["session_functions"].items()}
+        for name, shape in run_resources.pop("buffer_shapes").items():
+            run_resources[name] = numpy.zeros(shape=shape, dtype=numpy.float64)
+        initialize_session_run(run_id=run_id, run_resources=run_resources)
+
+    for name, start_row, rows in inputs:
+        getattr(resources, name)[start_row:start_row + len(rows)] = rows
+
+    return_value = function(*arguments)
+
+    _, written_rows = task_buffer_rows(function=function, arguments=arguments)
+    outputs = [(name, start_row, getattr(resources, name)[start_row:end_row].copy()) for name, start_row, end_row in
+               written_rows]
+    return return_value, outputs
+
+
+def _connect(address: Tuple[str, int], authkey: bytes, timeout: float) -> Connection:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return Client(address, authkey=authkey)
+        except ConnectionRefusedError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+class DistributedExecutor(Executor):
+    """
+    A concurrent.futures.Executor that runs each submitted call in one of the connected workers, see run_worker.
+    A worker runs one call at a time and takes the next call when it is done, so faster workers run more of the calls.
+    The calls, their arguments and return values are pickled, functions are pickled by reference and imported by name.
+    """
+
+    def __init__(self, addresses: List[Tuple[str, int]], authkey: bytes, connect_timeout: float = CONNECT_TIMEOUT_SECONDS):
+        """
+        :param addresses: The (host, port) of each worker
+        :param authkey: The authentication key that the workers were started with
+        :param connect_timeout: [Optional, default CONNECT_TIMEOUT_SECONDS] Seconds to wait for a worker to start listening
+        """
+        self.__connections = [_connect(address=tuple(address), authkey=authkey, timeout=connect_timeout) for address in
+                              addresses]
+        self.__work_items = SimpleQueue()
+        self.__lock = threading.Lock()
+        self.__number_of_connected_workers = len(self.__connections)
+        self.__is_shutdown = False
+        self.__threads = [threading.Thread(target=self.__dispatch, args=(connection,), daemon=True) for connection in
+                          self.__connections]
+        for thread in self.__threads:
+            thread.start()
+
+    @property
+    def number_of_workers(self) -> int:
+        return len(self.__connections)
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        with self.__lock:
+            if self.__is_shutdown:
+                raise RuntimeError("Can not submit calls after shutdown.")
+            if self.__number_of_connected_workers == 0:
+                raise ConnectionError("All distributed workers have disconnected.")
+            future = Future()
+            self.__work_items.put((future, fn, args, kwargs))
+        return future
+
+    def __dispatch(self, connection: Connection):
+        while True:
+            work_item = self.__work_items.get()
+            if work_item is None:
+                return
+            future, function, args, kwargs = work_item
+            # Calls retried after a lost worker are already running
+            if not future.running() and not future.set_running_or_notify_cancel():
+                continue
+            try:
+                connection.send((function, args, kwargs))
+                succeeded, value = connection.recv()
+            except (OSError, EOFError) as error:
+                self.__disconnect(work_item=work_item, error=error)
+                return
+            except Exception as exception:
+                # For example a value that can not be pickled, the connection is still usable
+                future.set_exception(exception)
+                continue
+            if succeeded:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    def __disconnect(self, work_item: tuple, error: BaseException):
+        # The call of the lost worker is taken by another worker, unless none are left
+        with self.__lock:
+            self.__number_of_connected_workers -= 1
+            if self.__number_of_connected_workers > 0:
+                self.__work_items.put(work_item)
+                return
+        work_item[0].set_exception(error)
+        while not self.__work_items.empty():
+            remaining_work_item = self.__work_items.get()
+            if remaining_work_item is not None and remaining_work_item[0].set_running_or_notify_cancel():
+                remaining_work_item[0].set_exception(error)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        with self.__lock:
+            self.__is_shutdown = True
+        if cancel_futures:
+            while not self.__work_items.empty():
+                work_item = self.__work_items.get()
+                if work_item is not None:
+                    work_item[0].cancel()
+        for _ in self.__threads:
+            self.__work_items.put(None)
+        if wait:
+            for thread in self.__threads:
+                thread.join()
+        for connection in self.__connections:
+            connection.close()
+
+
+class DistributedBackend(ExecutorBackend):
+    """
+    Runs the tasks in workers on other machines, see run_worker. The workers do not share memory with this process, so
+    the rows of the starting guesses that a task evaluates are sent with it, and the evaluation results and restart
+    optimums it produces are sent back. The problem functions are imported by name in the workers, so they need to be
+    defined at the top level of a module that the workers can import.
+    """
+
+    def __init__(self, addresses: List[Tuple[str, int]], authkey: bytes, connect_timeout: float = CONNECT_TIMEOUT_SECONDS):
+        """
+        :param addresses: The (host, port) of each worker
+        :param authkey: The authentication key that the workers were started with
+        :param connect_timeout: [Optional, default CONNECT_TIMEOUT_SECONDS] Seconds to wait for a worker to start listening
+        """
+        if len(addresses) == 0:
+            raise ValueError("addresses needs to contain at least one (host, port) address")
+        if not isinstance(authkey, bytes):
+            raise ValueError("authkey needs to be bytes")
+
+        self.__executor = DistributedExecutor(addresses=addresses, authkey=authkey, connect_timeout=connect_timeout)
+        super().__init__(executor=self.__executor, number_of_workers=len(addresses), is_in_process=False)
+
+    @property
+    def is_remote(self) -> bool:
+        return True
+
+    def start(self, problem_functions: tuple):
+        # Fail before any tasks are sent if a problem function can not be imported by the workers
+        for function in problem_functions:
+            function_reference(function)
+
+    def close(self):
+        self.__executor.shutdown(wait=True, cancel_futures=True)
+
+
+def __serve(connection: Connection):
+    while True:
+        try:
+            function, args, kwargs = connection.recv()
+        except (OSError, EOFError):
+            return
+        except Exception as exception:
+            # The message was read but could not be unpickled, for example a module that can not be imported
+            connection.send((False, exception))
+            continue
+
+        try:
+            result = (True, function(*args, **kwargs))
+        except Exception as exception:
+            result = (False, exception)
+        connection.send(result)
+
+
+def run_worker(address: Tuple[str, int], authkey: bytes, number_of_connections: Optional[int] = None):
+    """
+    Listens at address and runs the calls of one connected DistributedExecutor at a time.
+    :param address: The (host, port) to listen at
+    :param authkey: The authentication key that the coordinators need to connect with
+    :param number_of_connections: [Optional, default None] Stop after serving this many connections, None serves forever
+    """
+    with Listener(tuple(address), authkey=authkey) as listener:
+        number_of_served_connections = 0
+        while number_of_connections is None or number_of_served_connections < number_of_connections:
+            with listener.accept() as connection:
+                __serve(connection)
+            number_of_served_connections += 1
+
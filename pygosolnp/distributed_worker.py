@@ -0,0 +1,20 @@
+"""
+Runs a pygosolnp distributed worker, see pygosolnp.distributed:
+    python -m pygosolnp.distributed_worker --host 0.0.0.0 --port 6000 --authkey secret --import my_problem_module
+"""
+import argparse
+import importlib
+
+from pygosolnp.distributed import run_worker
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Runs a pygosolnp distributed worker.")
+    parser.add_argument("--host", default="localhost", help="The host to listen at")
+    parser.add_argument("--port", type=int, required=True, help="The port to listen at")
+    parser.add_argument("--authkey", required=True, help="The authentication key that the coordinators connect with")
+    parser.add_argument("--import", dest="modules", action="append", default=[],
+                        help="A module to import before serving, for example the module of the problem functions")
+    arguments = parser.parse_args()
+    for module_name in arguments.modules:
+        importlib.import_module(module_name)
+    run_worker(address=(arguments.host, arguments.port), authkey=arguments.authkey.encode())
@@ -1,10 +1,19 @@
+import pickle
+import time
 from ctypes import c_long, c_bool, c_double, c_int
-from typing import Any
+from functools import partial
+from typing import Any, Optional, Callable, List, Tuple
 
+import numpy
 import pysolnp
 
 from pygosolnp import resources
-from pygosolnp.model import EvaluationType
+from pygosolnp.model import EvaluationType, is_feasible_solution
+from pygosolnp.shared_array import SharedArray, MemmapArray
+
+# Columns of a restart_results row after the optimum: the objective value, whether the optimum is feasible and whether
+# pysolnp converged. They are followed by the equality and then the inequality function values of the optimum.
+RESTART_INFO_COLUMNS = 3
 
 
 def initialize_worker_process_resources(obj_func,
@@ -25,7 +34,11 @@ def initialize_worker_process_resources(obj_func,
                                         evaluation_type,
                                         number_of_parameters,
                                         eval_results,
-                                        restart_results):
+                                        restart_results,
+                                        sampling=None,
+                                        obj_func_batch=None,
+                                        eq_func_batch=None,
+                                        ineq_func_batch=None):
     """
     This function is used to provide the functions in this file access to shared resources when running pygosolnp.
      In multiprocess-mode it will pass multiprocess-safe types for each process, in single-processing it will simply have regular Python types.
@@ -37,7 +50,7 @@ def initialize_worker_process_resources(obj_func,
     :param ineq_func: [Optional, default None] A pickleable (global) callback inequality function
     :param ineq_lower_bounds: [Optional, default None] An List / multiprocessing.Array (float) representing the inequality lower constraints
     :param ineq_upper_bounds: [Optional, default None] An List / multiprocessing.Array (float) representing the inequality upper constraints
-    :param parameter_guesses: An List / multiprocessing.Array (float) representing randomly generated starting guesses
+    :param parameter_guesses: A numpy.ndarray / SharedArray / MemmapArray (float) of shape (number_of_guesses, number_of_parameters) representing randomly generated starting guesses
     :param pysolnp_delta: An double / multiprocessing.Value (float) representing pyolnp delta parameter
     :param pysolnp_rho: An double / multiprocessing.Value (float) representing pyolnp rho parameter
     :param pysolnp_max_major_iter: An int / multiprocessing.Value (int) representing pyolnp max major iterations parameter
@@ -46,8 +59,12 @@ def initialize_worker_process_resources(obj_func,
     :param pysolnp_debug: An bool / multiprocessing.Value (bool) representing pyolnp debug parameter
     :param evaluation_type: An int / multiprocessing.Value (int) representing the EvaluationType enum mappings for pygosolnp
     :param number_of_parameters: An int / multiprocessing.Value (int) representing the number of parameters for this problem (a.k.a len(par_lower_limit))
-    :param eval_results: An List / multiprocessing.Array (float) for storing the evaluation function results
-    :param restart_results: An List / multiprocessing.Array (float) for storing the pysolnp calculation parameter results
+    :param eval_results: A numpy.ndarray / SharedArray / MemmapArray (float) of shape (number_of_guesses,) for storing the evaluation function results
+    :param restart_results: A numpy.ndarray / SharedArray / MemmapArray (float) of shape (number_of_restarts, number_of_parameters) for storing the pysolnp calculation parameter results
+    :param sampling: [Optional, default None] A pickleable Sampling instance, used when generating starting guesses in the worker processes
+    :param obj_func_batch: [Optional, default None] A pickleable (global) callback objective function for a 2d array of guesses
+    :param eq_func_batch: [Optional, default None] A pickleable (global) callback equality function for a 2d array of guesses
+    :param ineq_func_batch: [Optional, default None] A pickleable (global) callback inequality function for a 2d array of guesses
     """
     resources.obj_func = obj_func
     resources.par_lower_limit = par_lower_limit
@@ -57,7 +74,7 @@ def initialize_worker_process_resources(obj_func,
     resources.ineq_func = ineq_func
     resources.ineq_lower_bounds = ineq_lower_bounds
     resources.ineq_upper_bounds = ineq_upper_bounds
-    resources.parameter_guesses = parameter_guesses
+    resources.parameter_guesses = __array_value(parameter_guesses)
     resources.pysolnp_delta = pysolnp_delta
     resources.pysolnp_rho = pysolnp_rho
     resources.pysolnp_max_major_iter = pysolnp_max_major_iter
@@ -66,8 +83,103 @@ def initialize_worker_process_resources(obj_func,
     resources.pysolnp_debug = pysolnp_debug
     resources.evaluation_type = evaluation_type
     resources.number_of_parameters = number_of_parameters
-    resources.eval_results = eval_results
-    resources.restart_results = restart_results
+    resources.eval_results = __array_value(eval_results)
+    resources.restart_results = __array_value(restart_results)
+    resources.sampling = sampling
+    resources.obj_func_batch = obj_func_batch
+    resources.eq_func_batch = eq_func_batch
+    resources.ineq_func_batch = ineq_func_batch
+
+
+def initialize_worker_problem_functions(obj_func,
+                                        eq_func=None,
+                                        ineq_func=None,
+                                        obj_func_batch=None,
+                                        eq_func_batch=None,
+                                        ineq_func_batch=None):
+    """
+    Process initializer for a Solver session, registers the problem functions once in each process.
+    The other resources differ between the runs of the session and are passed along with the tasks, see run_session_task.
+    The parameters are the same as for initialize_worker_process_resources.
+    """
+    resources.session_functions = {
+        "obj_func": obj_func,
+        "eq_func": eq_func,
+        "ineq_func": ineq_func,
+        "obj_func_batch": obj_func_batch,
+        "eq_func_batch": eq_func_batch,
+        "ineq_func_batch": ineq_func_batch
+    }
+    resources.session_run_id = None
+    resources.session_run_resources = None
+
+
+def initialize_session_run(run_id: str, run_resources: dict):
+    """
+    Initializes the resources of a run in a process of a Solver session, and detaches the shared memory of the previous run.
+    :param run_id: Identifies the run
+    :param run_resources: The dict of initialize_worker_process_resources arguments for the run, except for the problem
+    functions. Processes that were not initialized with initialize_worker_problem_functions receive the problem
+    functions as a dict under "session_functions".
+    """
+    previous_run_resources = resources.session_run_resources
+    functions = run_resources.pop("session_functions", None) or resources.session_functions
+    has_eq_bounds = run_resources["eq_values"] is not None
+    has_ineq_bounds = run_resources["ineq_lower_bounds"] is not None
+    initialize_worker_process_resources(obj_func=functions["obj_func"],
+                                        eq_func=functions["eq_func"] if has_eq_bounds else None,
+                                        ineq_func=functions["ineq_func"] if has_ineq_bounds else None,
+                                        obj_func_batch=functions["obj_func_batch"],
+                                        eq_func_batch=functions["eq_func_batch"] if has_eq_bounds else None,
+                                        ineq_func_batch=functions["ineq_func_batch"] if has_ineq_bounds else None,
+                                        **run_resources)
+    resources.session_run_id = run_id
+    # Keeps the shared memory of this run attached, and detaches the shared memory of the previous run
+    resources.session_run_resources = run_resources
+    if previous_run_resources is not None:
+        for value in previous_run_resources.values():
+            if isinstance(value, (SharedArray, MemmapArray)):
+                value.release()
+
+
+def run_session_task(run_id: str, run_data: bytes, function: Callable, arguments: tuple):
+    """
+    Runs function(*arguments) in a process of a Solver session.
+    :param run_id: Identifies the run, the run data is only unpickled by the first task of a run in each process
+    :param run_data: The pickled run_resources of initialize_session_run
+    :return: The return value of the function
+    """
+    if resources.session_run_id != run_id:
+        initialize_session_run(run_id=run_id, run_resources=pickle.loads(run_data))
+
+    return function(*arguments)
+
+
+def task_buffer_rows(function: Callable, arguments: tuple) -> Tuple[List[Tuple[str, int, int]], List[Tuple[str, int, int]]]:
+    """
+    The rows of the parameter_guesses, eval_results and restart_results resources that function(*arguments) reads and
+    writes, used to send the rows along with tasks that run where the resources of this process are not shared.
+    :return: The (resource name, start row, end row) ranges that the task reads, and the ranges that it writes
+    """
+    if function is evaluate_starting_guesses or function is evaluate_starting_guess_range:
+        buffer_index, number_of_samples = arguments
+        end_index = buffer_index + number_of_samples
+        return [("parameter_guesses", buffer_index, end_index)], [("eval_results", buffer_index, end_index)]
+    if function is generate_and_evaluate_starting_guesses:
+        _, buffer_index, number_of_samples = arguments
+        end_index = buffer_index + number_of_samples
+        return [], [("parameter_guesses", buffer_index, end_index), ("eval_results", buffer_index, end_index)]
+    if function is pysolnp_solve:
+        solve_index, guess_index = arguments[:2]
+        return [("parameter_guesses", guess_index, guess_index + 1)], [("restart_results", solve_index, solve_index + 1)]
+    raise ValueError(f"The rows used by the task function {function.__name__} are not known.")
+
+
+def __array_value(resource: Any):
+    # Workers use the numpy view of arrays in shared memory or memory-mapped files
+    if isinstance(resource, (SharedArray, MemmapArray)):
+        return resource.array
+    return resource
 
 
 def __resource_value(resource: Any):
@@ -82,11 +194,9 @@ def objective_func_exclude_ineq(variables, obj_func, eq_func, eq_values, ineq_fu
     if ineq_func is not None:
         # Exclude any inequality violations by setting their value to infinity
         ineq_values = ineq_func(variables)
-        is_outside_ineq_constraints = any(
-            value < ineq_lower_bounds[index] or value > ineq_upper_bounds[index] for index, value in
-            enumerate(ineq_values))
-        if is_outside_ineq_constraints:
-            return float("inf")
+        for index, value in enumerate(ineq_values):
+            if value < ineq_lower_bounds[index] or value > ineq_upper_bounds[index]:
+                return float("inf")
 
     if obj_func is None:
         raise ValueError(f"The objective function supplied could not be identified.")
@@ -94,60 +204,246 @@ def objective_func_exclude_ineq(variables, obj_func, eq_func, eq_values, ineq_fu
     return obj_value
 
 
+def __barrier_value(value: float) -> float:
+    if value <= 0.0:
+        return 0.0
+    return (0.9 + value) ** 2
+
+
 def penalty_barrier_function(variables, obj_func, eq_func, eq_values, ineq_func, ineq_lower_bounds, ineq_upper_bounds):
     objective_result = obj_func(variables)
     if ineq_func is not None and ineq_upper_bounds is not None and ineq_lower_bounds is not None:
-        def barrier_value_function(value: float):
-            if value <= 0.0:
-                return 0.0
-            else:
-                return (0.9 + value) ** 2
-
         inequality_values = ineq_func(variables)
         for index, value in enumerate(inequality_values):
             objective_result += 100.0 * (
-                    barrier_value_function(ineq_lower_bounds[index] - value) +
-                    barrier_value_function(value - ineq_upper_bounds[index])
+                    __barrier_value(ineq_lower_bounds[index] - value) +
+                    __barrier_value(value - ineq_upper_bounds[index])
             )
 
     if eq_func is not None and eq_values is not None:
         equality_values = eq_func(variables)
-        objective_result += sum((value - eq_values[index]) ** 2 for index, value in enumerate(equality_values)) / 100.0
+        equality_penalty = 0.0
+        for index, value in enumerate(equality_values):
+            equality_penalty += (value - eq_values[index]) ** 2
+        objective_result += equality_penalty / 100.0
 
     return objective_result
 
 
-def evaluate_starting_guess(simulation_index: int):
-    guesses = __resource_value(resources.parameter_guesses)
-    eval_type = __resource_value(resources.evaluation_type)
-    number_of_parameters = __resource_value(resources.number_of_parameters)
+def __constraint_values(func, variables: numpy.ndarray) -> numpy.ndarray:
+    # Constraint values as a (number_of_guesses, number_of_constraints) array
+    return numpy.asarray(func(variables), dtype=numpy.float64).reshape(len(variables), -1)
+
+
+def __barrier_values(values: numpy.ndarray) -> numpy.ndarray:
+    return numpy.where(values <= 0.0, 0.0, (0.9 + values) ** 2)
+
+
+def inside_inequality_bounds(ineq_values: numpy.ndarray, ineq_lower_bounds, ineq_upper_bounds) -> numpy.ndarray:
+    """
+    :param ineq_values: A (number_of_guesses, number_of_constraints) array of inequality function values
+    :return: A boolean array which is True for the guesses that satisfy all the inequality constraints
+    """
+    is_outside_ineq_constraints = (ineq_values < numpy.asarray(ineq_lower_bounds, dtype=numpy.float64)) | \
+                                  (ineq_values > numpy.asarray(ineq_upper_bounds, dtype=numpy.float64))
+    return ~is_outside_ineq_constraints.any(axis=1)
+
+
+def penalty_barrier_values(obj_values: numpy.ndarray,
+                           eq_func_values: Optional[numpy.ndarray],
+                           eq_values,
+                           ineq_func_values: Optional[numpy.ndarray],
+                           ineq_lower_bounds,
+                           ineq_upper_bounds) -> numpy.ndarray:
+    """
+    The penalty barrier function for already evaluated objective and constraint function values.
+    The penalties are accumulated one constraint at a time, in the same order as penalty_barrier_function, so the
+    result is identical to evaluating each guess separately.
+    :param obj_values: A (number_of_guesses,) array of objective function values
+    :param eq_func_values: A (number_of_guesses, number_of_eq_constraints) array or None
+    :param ineq_func_values: A (number_of_guesses, number_of_ineq_constraints) array or None
+    """
+    objective_result = numpy.array(obj_values, dtype=numpy.float64)
+    if ineq_func_values is not None:
+        for index in range(ineq_func_values.shape[1]):
+            values = ineq_func_values[:, index]
+            objective_result += 100.0 * (__barrier_values(ineq_lower_bounds[index] - values) +
+                                         __barrier_values(values - ineq_upper_bounds[index]))
+
+    if eq_func_values is not None:
+        equality_penalty = numpy.zeros(shape=len(objective_result), dtype=numpy.float64)
+        for index in range(eq_func_values.shape[1]):
+            equality_penalty += (eq_func_values[:, index] - eq_values[index]) ** 2
+        objective_result += equality_penalty / 100.0
+
+    return objective_result
+
+
+def objective_func_exclude_ineq_batch(variables, obj_func, eq_func, eq_values, ineq_func, ineq_lower_bounds,
+                                      ineq_upper_bounds):
+    """
+    Same as objective_func_exclude_ineq for a (number_of_guesses, number_of_parameters) array of guesses,
+    where each callback takes a 2d array of guesses and returns one value or row of values per guess.
+    obj_func is only called for the guesses within the inequality bounds.
+    """
+    if obj_func is None:
+        raise ValueError(f"The objective function supplied could not be identified.")
+
+    obj_values = numpy.full(shape=len(variables), fill_value=float("inf"), dtype=numpy.float64)
+    if ineq_func is not None:
+        is_inside_ineq_constraints = inside_inequality_bounds(ineq_values=__constraint_values(ineq_func, variables),
+                                                              ineq_lower_bounds=ineq_lower_bounds,
+                                                              ineq_upper_bounds=ineq_upper_bounds)
+        if not is_inside_ineq_constraints.all():
+            if is_inside_ineq_constraints.any():
+                obj_values[is_inside_ineq_constraints] = numpy.asarray(
+                    obj_func(variables[is_inside_ineq_constraints]), dtype=numpy.float64).reshape(-1)
+            return obj_values
+
+    obj_values[:] = numpy.asarray(obj_func(variables), dtype=numpy.float64).reshape(-1)
+    return obj_values
+
+
+def penalty_barrier_function_batch(variables, obj_func, eq_func, eq_values, ineq_func, ineq_lower_bounds,
+                                   ineq_upper_bounds):
+    """
+    Same as penalty_barrier_function for a (number_of_guesses, number_of_parameters) array of guesses,
+    where each callback takes a 2d array of guesses and returns one value or row of values per guess.
+    """
+    has_ineq = ineq_func is not None and ineq_upper_bounds is not None and ineq_lower_bounds is not None
+    has_eq = eq_func is not None and eq_values is not None
+    return penalty_barrier_values(obj_values=numpy.asarray(obj_func(variables), dtype=numpy.float64).reshape(-1),
+                                  eq_func_values=__constraint_values(eq_func, variables) if has_eq else None,
+                                  eq_values=eq_values,
+                                  ineq_func_values=__constraint_values(ineq_func, variables) if has_ineq else None,
+                                  ineq_lower_bounds=ineq_lower_bounds,
+                                  ineq_upper_bounds=ineq_upper_bounds)
+
 
-    start_index = simulation_index * number_of_parameters
-    end_index = (simulation_index + 1) * number_of_parameters
+def __batch_function(batch_func, func):
+    # Use the batch callback if supplied, otherwise call the regular callback once per guess
+    if batch_func is not None or func is None:
+        return batch_func
+    return lambda variables: [func(guess) for guess in variables.tolist()]
+
+
+def evaluate_starting_guesses(buffer_index: int, number_of_samples: int) -> float:
+    """
+    Evaluates the guesses buffer_index to buffer_index + number_of_samples - 1.
+    The guesses are evaluated at once with the batch callbacks, or the regular callbacks called once per guess when no
+    batch callback is supplied, and scored with the vectorized evaluation functions. If this raises an error the guesses
+    are evaluated one by one instead, so that only the failing guesses are set to infinity.
+    :return: The time in seconds spent on the evaluations
+    """
+    start_time = time.perf_counter()
+    eval_type = __resource_value(resources.evaluation_type)
+    guesses = resources.parameter_guesses[buffer_index: buffer_index + number_of_samples]
+    guesses.flags.writeable = False
     try:
         eval_objective_function = {
-            EvaluationType.OBJECTIVE_FUNC_EXCLUDE_INEQ.value: objective_func_exclude_ineq,
-            EvaluationType.PENALTY_BARRIER_FUNCTION.value: penalty_barrier_function
+            EvaluationType.OBJECTIVE_FUNC_EXCLUDE_INEQ.value: objective_func_exclude_ineq_batch,
+            EvaluationType.PENALTY_BARRIER_FUNCTION.value: penalty_barrier_function_batch
         }
 
         eval_func = eval_objective_function[eval_type]
-        eval_result = eval_func(variables=guesses[start_index: end_index],
-                                obj_func=__resource_value(resources.obj_func),
-                                eq_func=__resource_value(resources.eq_func),
-                                eq_values=__resource_value(resources.eq_values),
-                                ineq_func=__resource_value(resources.ineq_func),
-                                ineq_lower_bounds=__resource_value(resources.ineq_lower_bounds),
-                                ineq_upper_bounds=__resource_value(resources.ineq_upper_bounds))
+        eval_results = eval_func(variables=guesses,
+                                 obj_func=__batch_function(resources.obj_func_batch, resources.obj_func),
+                                 eq_func=__batch_function(resources.eq_func_batch, resources.eq_func),
+                                 eq_values=__resource_value(resources.eq_values),
+                                 ineq_func=__batch_function(resources.ineq_func_batch, resources.ineq_func),
+                                 ineq_lower_bounds=__resource_value(resources.ineq_lower_bounds),
+                                 ineq_upper_bounds=__resource_value(resources.ineq_upper_bounds))
+        resources.eval_results[buffer_index: buffer_index + number_of_samples] = eval_results
+    except Exception:
+        # Fall back on evaluating the guesses one by one, failing guesses are then set to infinity individually
+        evaluate_starting_guess_range(buffer_index=buffer_index, number_of_samples=number_of_samples)
+
+    return time.perf_counter() - start_time
+
+
+def __scalar_evaluation_function() -> Callable[[List[float]], float]:
+    # The evaluation function for the configured EvaluationType with all the problem resources bound
+    eval_objective_function = {
+        EvaluationType.OBJECTIVE_FUNC_EXCLUDE_INEQ.value: objective_func_exclude_ineq,
+        EvaluationType.PENALTY_BARRIER_FUNCTION.value: penalty_barrier_function
+    }
+
+    eval_func = eval_objective_function[__resource_value(resources.evaluation_type)]
+    return partial(eval_func,
+                   obj_func=__resource_value(resources.obj_func),
+                   eq_func=__resource_value(resources.eq_func),
+                   eq_values=__resource_value(resources.eq_values),
+                   ineq_func=__resource_value(resources.ineq_func),
+                   ineq_lower_bounds=__resource_value(resources.ineq_lower_bounds),
+                   ineq_upper_bounds=__resource_value(resources.ineq_upper_bounds))
+
+
+def evaluate_starting_guess_range(buffer_index: int, number_of_samples: int) -> float:
+    """
+    Evaluates the guesses buffer_index to buffer_index + number_of_samples - 1 one by one with the regular callbacks.
+    The results are collected in a local buffer and written to eval_results in one copy.
+    :return: The time in seconds spent on the evaluations
+    """
+    start_time = time.perf_counter()
+    # The regular callbacks get each guess as a list, converted for the whole range at once
+    guesses = resources.parameter_guesses[buffer_index: buffer_index + number_of_samples].tolist()
+
+    results = numpy.full(shape=number_of_samples, fill_value=float("inf"), dtype=numpy.float64)
+    try:
+        eval_func = __scalar_evaluation_function()
+    except Exception:
+        eval_func = None
+
+    if eval_func is not None:
+        for index in range(number_of_samples):
+            try:
+                results[index] = eval_func(variables=guesses[index])
+            except Exception:
+                pass
+
+    resources.eval_results[buffer_index: buffer_index + number_of_samples] = results
+    return time.perf_counter() - start_time
+
+
+def evaluate_starting_guess(simulation_index: int):
+    try:
+        eval_func = __scalar_evaluation_function()
+        eval_result = eval_func(variables=resources.parameter_guesses[simulation_index].tolist())
         resources.eval_results[simulation_index] = eval_result
     except Exception as ex:
         resources.eval_results[simulation_index] = float("inf")
 
 
-def pysolnp_solve(solve_index: int, guess_index: int):
+def generate_and_evaluate_starting_guesses(sample_index: int, buffer_index: int, number_of_samples: int) -> float:
+    """
+    Generates the samples sample_index to sample_index + number_of_samples - 1 with the shared Sampling instance,
+    stores them in parameter_guesses from buffer_index onwards and evaluates them.
+    :return: The time in seconds spent on the evaluations
+    """
     number_of_parameters = __resource_value(resources.number_of_parameters)
+    samples = resources.sampling.generate_indexed_samples(start_index=sample_index,
+                                                          number_of_samples=number_of_samples,
+                                                          sample_size=number_of_parameters)
+    resources.parameter_guesses[buffer_index: buffer_index + number_of_samples] = \
+        numpy.asarray(samples, dtype=numpy.float64).reshape(number_of_samples, number_of_parameters)
+
+    return evaluate_starting_guesses(buffer_index=buffer_index, number_of_samples=number_of_samples)
+
+
+def pysolnp_solve(solve_index: int, guess_index: int, max_major_iter: Optional[int] = None) -> int:
+    """
+    Runs pysolnp from the guess in row guess_index of parameter_guesses and stores the optimum in row solve_index of
+    restart_results, followed by its objective value, feasibility, the convergence of pysolnp and the constraint
+    function values, see RESTART_INFO_COLUMNS.
+    :param max_major_iter: [Optional, default None] The max_major_iter of this restart, if None pysolnp_max_major_iter
+    :return: The solve_index, to identify the restart when results are collected as they finish
+    """
     debug = __resource_value(resources.pysolnp_debug)
-    start_value = resources.parameter_guesses[(guess_index * number_of_parameters): (
-            (guess_index + 1) * number_of_parameters)]
+    start_value = resources.parameter_guesses[guess_index].tolist()
+    restart_result = resources.restart_results[solve_index]
+    number_of_parameters = len(start_value)
+    obj_value = None
+    pysolnp_converged = False
 
     try:
         solve_result: pysolnp.Result = pysolnp.solve(obj_func=__resource_value(resources.obj_func),
@@ -160,14 +456,47 @@ def pysolnp_solve(solve_index: int, guess_index: int):
                                                      ineq_lower_bounds=__resource_value(resources.ineq_lower_bounds),
                                                      ineq_upper_bounds=__resource_value(resources.ineq_upper_bounds),
                                                      rho=__resource_value(resources.pysolnp_rho),
-                                                     max_major_iter=__resource_value(resources.pysolnp_max_major_iter),
+                                                     max_major_iter=__resource_value(
+                                                         resources.pysolnp_max_major_iter) if max_major_iter is None else max_major_iter,
                                                      max_minor_iter=__resource_value(resources.pysolnp_max_minor_iter),
                                                      delta=__resource_value(resources.pysolnp_delta),
                                                      tolerance=__resource_value(resources.pysolnp_tolerance),
                                                      debug=debug)
 
-        resources.restart_results[(solve_index * number_of_parameters): (
-                (solve_index + 1) * number_of_parameters)] = solve_result.optimum
+        restart_result[:number_of_parameters] = solve_result.optimum
+        # pysolnp evaluates the objective function at the optimum when it finishes
+        obj_value = solve_result.solve_value
+        pysolnp_converged = solve_result.converged
     except ValueError as value_error:
         if debug:
             print(f"Error happened when running pysolnp for guess with index {guess_index}, ignoring this result. Error message: {value_error}")
+
+    solution = restart_result[:number_of_parameters].tolist()
+    if obj_value is None:
+        obj_value = __resource_value(resources.obj_func)(solution)
+
+    eq_func = __resource_value(resources.eq_func)
+    eq_values = __resource_value(resources.eq_values)
+    eq_func_values = eq_func(solution) if eq_func is not None and eq_values is not None else None
+    ineq_func = __resource_value(resources.ineq_func)
+    ineq_lower_bounds = __resource_value(resources.ineq_lower_bounds)
+    ineq_func_values = ineq_func(solution) if ineq_func is not None and ineq_lower_bounds is not None else None
+    is_feasible = is_feasible_solution(parameters=solution,
+                                       par_lower_limit=__resource_value(resources.par_lower_limit),
+                                       par_upper_limit=__resource_value(resources.par_upper_limit),
+                                       tolerance=__resource_value(resources.pysolnp_tolerance),
+                                       eq_func_values=eq_func_values,
+                                       eq_values=eq_values,
+                                       ineq_func_values=ineq_func_values,
+                                       ineq_lower_bounds=ineq_lower_bounds,
+                                       ineq_upper_bounds=__resource_value(resources.ineq_upper_bounds))
+
+    info_end = number_of_parameters + RESTART_INFO_COLUMNS
+    restart_result[number_of_parameters:info_end] = [obj_value, is_feasible, pysolnp_converged]
+    number_of_eq_values = len(eq_values) if eq_func_values is not None else 0
+    if eq_func_values is not None:
+        restart_result[info_end:info_end + number_of_eq_values] = eq_func_values
+    if ineq_func_values is not None:
+        restart_result[info_end + number_of_eq_values:] = ineq_func_values
+
+    return solve_index
@@ -1,9 +1,28 @@
+import math
+import os
 from enum import Enum
 from multiprocessing import Array
-from typing import Callable, Optional, Union, List
+from typing import Callable, Optional, Union, List, TYPE_CHECKING
 
 from pygosolnp.sampling import Distribution, DefaultSampling
 
+if TYPE_CHECKING:
+    from pygosolnp.pygosolnp import Results
+
+# The sigma of the critical distance of multi-level single linkage, values above 2 keep the expected number of local
+# searches finite as the number of samples grows
+CLUSTERING_SIGMA = 4.0
+
+
+def critical_distance(number_of_parameters: int, number_of_samples: int) -> float:
+    """
+    The critical distance of multi-level single linkage for number_of_samples samples in the unit hypercube. A sample
+    within this distance of a better sample is taken to be in the same basin.
+    """
+    number_of_samples = max(2, number_of_samples)
+    return (math.gamma(1.0 + number_of_parameters / 2.0) * CLUSTERING_SIGMA * math.log(number_of_samples) /
+            number_of_samples) ** (1.0 / number_of_parameters) / math.sqrt(math.pi)
+
 
 class EvaluationType(Enum):
     OBJECTIVE_FUNC_EXCLUDE_INEQ = 1  # Exclude any guesses that violate the objective function and the evaluate with objective function
@@ -31,7 +50,25 @@ class ProblemModel:
                  debug: bool = False,
                  number_of_processes: Optional[int] = 5,
                  start_guess_sampling: Union[None, List[Distribution], DefaultSampling] = None,
-                 evaluation_type: Union[EvaluationType, int] = EvaluationType.OBJECTIVE_FUNC_EXCLUDE_INEQ):
+                 evaluation_type: Union[EvaluationType, int] = EvaluationType.OBJECTIVE_FUNC_EXCLUDE_INEQ,
+                 evaluation_chunk_size: Optional[int] = None,
+                 sample_in_workers: bool = False,
+                 obj_func_batch: Optional[Callable] = None,
+                 eq_func_batch: Optional[Callable] = None,
+                 ineq_func_batch: Optional[Callable] = None,
+                 early_restart_fraction: Optional[float] = None,
+                 time_budget: Optional[float] = None,
+                 target_obj_value: Optional[float] = None,
+                 min_feasible_solutions: int = 1,
+                 checkpoint_dir: Union[None, str, os.PathLike] = None,
+                 resume: bool = False,
+                 memmap_dir: Union[None, str, os.PathLike] = None,
+                 warm_start_dir: Union[None, str, os.PathLike] = None,
+                 warm_start_tag: Optional[str] = None,
+                 previous_results: Optional["Results"] = None,
+                 restart_clustering: bool = False,
+                 mlsl_rounds: Optional[int] = None,
+                 racing_survivors: Optional[int] = None):
         self.__obj_func = obj_func
         self.__par_lower_limit = par_lower_limit
         self.__par_upper_limit = par_upper_limit
@@ -51,6 +88,24 @@ class ProblemModel:
         self.__number_of_processes = number_of_processes
         self.__start_guess_sampling = start_guess_sampling
         self.__evaluation_type = EvaluationType(evaluation_type)
+        self.__evaluation_chunk_size = evaluation_chunk_size
+        self.__sample_in_workers = sample_in_workers
+        self.__obj_func_batch = obj_func_batch
+        self.__eq_func_batch = eq_func_batch
+        self.__ineq_func_batch = ineq_func_batch
+        self.__early_restart_fraction = early_restart_fraction
+        self.__time_budget = time_budget
+        self.__target_obj_value = target_obj_value
+        self.__min_feasible_solutions = min_feasible_solutions
+        self.__checkpoint_dir = checkpoint_dir
+        self.__resume = resume
+        self.__memmap_dir = memmap_dir
+        self.__warm_start_dir = warm_start_dir
+        self.__warm_start_tag = warm_start_tag
+        self.__previous_results = previous_results
+        self.__restart_clustering = restart_clustering
+        self.__mlsl_rounds = mlsl_rounds
+        self.__racing_survivors = racing_survivors
 
     @property
     def obj_func(self):
@@ -124,6 +179,120 @@ class ProblemModel:
     def evaluation_type(self) -> EvaluationType:
         return self.__evaluation_type
 
+    @property
+    def evaluation_chunk_size(self) -> Optional[int]:
+        return self.__evaluation_chunk_size
+
+    @property
+    def sample_in_workers(self) -> bool:
+        return self.__sample_in_workers
+
+    @property
+    def obj_func_batch(self) -> Optional[Callable]:
+        return self.__obj_func_batch
+
+    @property
+    def eq_func_batch(self) -> Optional[Callable]:
+        return self.__eq_func_batch
+
+    @property
+    def ineq_func_batch(self) -> Optional[Callable]:
+        return self.__ineq_func_batch
+
+    @property
+    def early_restart_fraction(self) -> Optional[float]:
+        return self.__early_restart_fraction
+
+    @property
+    def early_restart_index(self) -> Optional[int]:
+        # The number of evaluations after which the restarts start, None if they wait for all evaluations
+        if self.__early_restart_fraction is None:
+            return None
+        return max(1, math.ceil(self.__early_restart_fraction * self.number_of_evaluations))
+
+    @property
+    def time_budget(self) -> Optional[float]:
+        return self.__time_budget
+
+    @property
+    def target_obj_value(self) -> Optional[float]:
+        return self.__target_obj_value
+
+    @property
+    def min_feasible_solutions(self) -> int:
+        return self.__min_feasible_solutions
+
+    @property
+    def checkpoint_dir(self) -> Union[None, str, os.PathLike]:
+        return self.__checkpoint_dir
+
+    @property
+    def resume(self) -> bool:
+        return self.__resume
+
+    @property
+    def memmap_dir(self) -> Union[None, str, os.PathLike]:
+        return self.__memmap_dir
+
+    @property
+    def warm_start_dir(self) -> Union[None, str, os.PathLike]:
+        return self.__warm_start_dir
+
+    @property
+    def warm_start_tag(self) -> Optional[str]:
+        return self.__warm_start_tag
+
+    @property
+    def previous_results(self) -> Optional["Results"]:
+        return self.__previous_results
+
+    @property
+    def restart_clustering(self) -> bool:
+        return self.__restart_clustering
+
+    @property
+    def critical_distance(self) -> Optional[float]:
+        """
+        The distance within which a guess is in the basin of a better guess, None without restart_clustering. This is the
+        critical distance of multi-level single linkage for number_of_evaluations samples in the unit hypercube, the
+        parameter bounds are scaled to it.
+        """
+        if not self.__restart_clustering:
+            return None
+        return critical_distance(number_of_parameters=self.number_of_parameters,
+                                 number_of_samples=self.number_of_evaluations)
+
+    @property
+    def mlsl_rounds(self) -> Optional[int]:
+        return self.__mlsl_rounds
+
+    @property
+    def mlsl_round_size(self) -> Optional[int]:
+        # The number of samples evaluated in each round of an MLSL solve, None without mlsl_rounds
+        if self.__mlsl_rounds is None:
+            return None
+        return math.ceil(self.number_of_evaluations / self.__mlsl_rounds)
+
+    @property
+    def racing_survivors(self) -> Optional[int]:
+        return self.__racing_survivors
+
+    @property
+    def racing_rounds(self) -> Optional[int]:
+        # The number of rounds that halve the number_of_restarts raced restarts down to racing_survivors, None without
+        # racing_survivors
+        if self.__racing_survivors is None:
+            return None
+        if self.__racing_survivors >= self.__number_of_restarts:
+            return 1
+        return 1 + math.ceil(math.log2(self.__number_of_restarts / self.__racing_survivors))
+
+    @property
+    def has_batch_functions(self) -> bool:
+        return self.__obj_func_batch is not None or \
+               self.__eq_func_batch is not None or \
+               self.__ineq_func_batch is not None
+
     @property
     def number_of_parameters(self) -> int:
         return len(self.__par_lower_limit)
@@ -196,6 +365,16 @@ class ProblemModel:
             raise ValueError(
                 "For inequality constrained problems, please make sure that ineq_lower_bound is of the same length as ineq_upper_bound")
 
+        batch_data = [(self.__obj_func_batch, self.__obj_func, "obj_func"),
+                      (self.__eq_func_batch, self.__eq_func, "eq_func"),
+                      (self.__ineq_func_batch, self.__ineq_func, "ineq_func")]
+        for batch_func, func, name in batch_data:
+            if batch_func is not None and not callable(batch_func):
+                raise ValueError(f"{name}_batch must be callable")
+            if batch_func is not None and func is None:
+                raise ValueError(
+                    f"{name}_batch is only used to evaluate the starting guesses, please also provide {name} for the pysolnp restarts")
+
         if self.__number_of_simulations < 1:
             raise ValueError("number_of_simulations needs to be a positive integer value")
 
@@ -206,6 +385,77 @@ class ProblemModel:
             raise ValueError(
                 "number_of_processes needs to be a positive integer value and is recommended to be greater than or equal to 2")
 
+        if self.__evaluation_chunk_size is not None and (
+                type(self.__evaluation_chunk_size) is not int or self.__evaluation_chunk_size < 1):
+            raise ValueError("evaluation_chunk_size needs to be None or a positive integer value")
+
+        if type(self.__sample_in_workers) is not bool:
+            raise ValueError("sample_in_workers needs to be a boolean value")
+
+        if self.__early_restart_fraction is not None and (
+                type(self.__early_restart_fraction) not in [float, int] or type(self.__early_restart_fraction) is bool
+                or not 0.0 < self.__early_restart_fraction <= 1.0):
+            raise ValueError("early_restart_fraction needs to be None or a value greater than 0.0 and at most 1.0")
+
+        if self.__time_budget is not None and (
+                type(self.__time_budget) not in [float, int] or type(self.__time_budget) is bool
+                or not self.__time_budget > 0.0):
+            raise ValueError("time_budget needs to be None or a positive number of seconds")
+
+        if self.__target_obj_value is not None and type(self.__target_obj_value) not in [float, int]:
+            raise ValueError("target_obj_value needs to be None or a float value")
+
+        if type(self.__min_feasible_solutions) is not int or self.__min_feasible_solutions < 1:
+            raise ValueError("min_feasible_solutions needs to be a positive integer value")
+
+        if self.__checkpoint_dir is not None and not isinstance(self.__checkpoint_dir, (str, os.PathLike)):
+            raise ValueError("checkpoint_dir needs to be None or a directory path")
+
+        if type(self.__resume) is not bool:
+            raise ValueError("resume needs to be a bool value")
+
+        if self.__resume is True and self.__checkpoint_dir is None:
+            raise ValueError("resume needs a checkpoint_dir to resume from")
+
+        if self.__memmap_dir is not None and not isinstance(self.__memmap_dir, (str, os.PathLike)):
+            raise ValueError("memmap_dir needs to be None or a directory path")
+
+        if self.__warm_start_dir is not None and not isinstance(self.__warm_start_dir, (str, os.PathLike)):
+            raise ValueError("warm_start_dir needs to be None or a directory path")
+
+        if self.__warm_start_tag is not None and type(self.__warm_start_tag) is not str:
+            raise ValueError("warm_start_tag needs to be None or a str value")
+
+        if self.__warm_start_dir is not None and self.__warm_start_tag is None and \
+                "<lambda>" in getattr(self.__obj_func, "__qualname__", ""):
+            # The optima are stored by the name of obj_func, which is the same for all lambdas
+            raise ValueError("warm_start_tag is required for a lambda obj_func, as all lambdas have the same name")
+
+        if type(self.__restart_clustering) is not bool:
+            raise ValueError("restart_clustering needs to be a bool value")
+
+        if self.__mlsl_rounds is not None:
+            if type(self.__mlsl_rounds) is not int or self.__mlsl_rounds < 1:
+                raise ValueError("mlsl_rounds needs to be None or a positive integer value")
+            # The rounds decide how the guesses are evaluated and which of them are restarted
+            incompatible_options = [("evaluation_chunk_size", self.__evaluation_chunk_size is not None),
+                                    ("early_restart_fraction", self.__early_restart_fraction is not None),
+                                    ("checkpoint_dir", self.__checkpoint_dir is not None),
+                                    ("previous_results", self.__previous_results is not None),
+                                    ("restart_clustering", self.__restart_clustering)]
+            for name, is_set in incompatible_options:
+                if is_set:
+                    raise ValueError(f"mlsl_rounds can not be combined with {name}")
+
+        if self.__racing_survivors is not None:
+            if type(self.__racing_survivors) is not int or self.__racing_survivors < 1:
+                raise ValueError("racing_survivors needs to be None or a positive integer value")
+            # Raced restarts only finish in the last round, MLSL and checkpoints need them to finish in one go
+            if self.__mlsl_rounds is not None:
+                raise ValueError("racing_survivors can not be combined with mlsl_rounds")
+            if self.__checkpoint_dir is not None:
+                raise ValueError("racing_survivors can not be combined with checkpoint_dir")
+
         if type(self.__rho) is not float:
             raise ValueError("pysolnp_rho needs to be a float value")
 
@@ -231,23 +481,46 @@ class ProblemModel:
             raise ValueError("debug needs to be a boolean value")
 
     def check_solution_feasibility(self, par_found_solution):
-        if any(value < self.__par_lower_limit[index] - self.__tolerance or self.__par_upper_limit[
-            index] + self.__tolerance < value for index, value in
-               enumerate(par_found_solution)):
+        return is_feasible_solution(parameters=par_found_solution,
+                                    par_lower_limit=self.__par_lower_limit,
+                                    par_upper_limit=self.__par_upper_limit,
+                                    tolerance=self.__tolerance,
+                                    eq_func_values=self.__eq_func(
+                                        par_found_solution) if self.__eq_func is not None else None,
+                                    eq_values=self.__eq_values,
+                                    ineq_func_values=self.__ineq_func(
+                                        par_found_solution) if self.__ineq_func is not None else None,
+                                    ineq_lower_bounds=self.__ineq_lower_bounds,
+                                    ineq_upper_bounds=self.__ineq_upper_bounds)
+
+
+def is_feasible_solution(parameters,
+                         par_lower_limit,
+                         par_upper_limit,
+                         tolerance: float,
+                         eq_func_values=None,
+                         eq_values=None,
+                         ineq_func_values=None,
+                         ineq_lower_bounds=None,
+                         ineq_upper_bounds=None) -> bool:
+    """
+    True if the parameters and the already evaluated constraint function values are within their bounds, give or take
+    the tolerance.
+    :param eq_func_values: [Optional, default None] The equality function values of the parameters, None without equality constraints
+    :param ineq_func_values: [Optional, default None] The inequality function values of the parameters, None without inequality constraints
+    """
+    if any(value < par_lower_limit[index] - tolerance or par_upper_limit[index] + tolerance < value for index, value in
+           enumerate(parameters)):
+        return False
+
+    if eq_func_values is not None:
+        if any(value < eq_values[index] - tolerance or eq_values[index] + tolerance < value for index, value in
+               enumerate(eq_func_values)):
+            return False
+
+    if ineq_func_values is not None:
+        if any(value < ineq_lower_bounds[index] - tolerance or ineq_upper_bounds[index] + tolerance < value for
+               index, value in enumerate(ineq_func_values)):
             return False
 
-        if self.__eq_func is not None:
-            equality_function_values = self.__eq_func(par_found_solution)
-            if any(value < self.__eq_values[index] - self.__tolerance or self.__eq_values[
-                index] + self.__tolerance < value for index, value in
-                   enumerate(equality_function_values)):
-                return False
-
-        if self.__ineq_func is not None:
-            inequality_function_values = self.__ineq_func(par_found_solution)
-            if any(value < self.__ineq_lower_bounds[index] - self.__tolerance or self.__ineq_upper_bounds[
-                index] + self.__tolerance < value for
-                   index, value in enumerate(inequality_function_values)):
-                return False
-
-        return True
+    return True
@@ -1,58 +1,2351 @@
+import asyncio
+import math
+import pickle
+import os
+import sys
+import time
+import uuid
+import weakref
 from collections import namedtuple
-from ctypes import c_int, c_double, c_bool
-from functools import reduce
-from heapq import nsmallest
-from multiprocessing import Array, Value, Pool
-from typing import Callable, Optional, Union, List
+from concurrent.futures import Executor
+from functools import partial
+from queue import Empty
+from typing import Callable, Optional, Union, List, Tuple, Iterable, Iterator, AsyncIterator
+try:
+    from queue import SimpleQueue
+except ImportError:
+    # SimpleQueue is only available from Python 3.7
+    from queue import Queue as SimpleQueue
 
-from pygosolnp.evaluation_functions import evaluate_starting_guess, pysolnp_solve, initialize_worker_process_resources
-from pygosolnp.model import ProblemModel, EvaluationType
-from pygosolnp.sampling import Distribution, Sampling, DefaultSampling
+import numpy
 
-Result = namedtuple(typename="Result", field_names=("parameters", "obj_value", "converged"))
+from pygosolnp.backends import Backend, SerialBackend, ProcessBackend, ExecutorBackend
+from pygosolnp.checkpoint import Checkpoint, problem_fingerprint
+from pygosolnp.distributed import function_reference, run_remote_task
+from pygosolnp.evaluation_functions import pysolnp_solve, initialize_worker_process_resources, \
+    generate_and_evaluate_starting_guesses, evaluate_starting_guesses, evaluate_starting_guess_range, run_session_task, \
+    task_buffer_rows, RESTART_INFO_COLUMNS
+from pygosolnp.model import ProblemModel, EvaluationType, critical_distance
+from pygosolnp.sampling import Distribution, Sampling, DefaultSampling, WarmStartSampling
+from pygosolnp.shared_array import SharedArray, MemmapArray
+from pygosolnp.warm_start import WarmStartStore, jittered_points, warm_start_key
+
+# Number of samples generated from one independent stream when sampling in the worker processes
+WORKER_SAMPLING_CHUNK_SIZE = 1024
+# Maximum number of starting guesses passed to the batch callbacks at a time
+BATCH_EVALUATION_CHUNK_SIZE = 1024
+# Number of starting guesses per process evaluated first to measure the cost of an evaluation
+EVALUATION_PROBE_SIZE = 16
+# Target duration in seconds of one evaluation task when evaluating in multiple processes
+EVALUATION_TASK_SECONDS = 0.05
+# Minimum number of evaluation tasks per process, so that the work stays balanced between the processes
+EVALUATION_TASKS_PER_PROCESS = 4
+# The .npy files in memmap_dir that hold the starting guesses, the evaluation results and the restart results
+MEMMAP_FILE_NAMES = ["parameter_guesses", "eval_results", "restart_results"]
+
+# Fraction of the best guesses of each MLSL round that are kept in the reduced sample that the restarts start from
+MLSL_REDUCED_SAMPLE_FRACTION = 0.1
+# Distance in the unit hypercube of the parameter bounds within which two optima are counted as the same minimum, no
+# restarts start from guesses within this distance of a found minimum
+MLSL_MINIMUM_DISTANCE = 1e-3
+# MLSL stops once the estimated number of minima is less than this many above the number of minima found
+MLSL_STOP_MARGIN = 0.5
+
+# Fraction of the raced restarts that continue to the next round
+RACING_KEEP_FRACTION = 0.5
+
+# The starting guesses of an earlier solve that a solve reuses, see __previous_evaluations
+_PreviousEvaluations = namedtuple(typename="_PreviousEvaluations",
+                                  field_names=("guesses", "scores", "rescored_guesses", "covered_lower",
+                                               "covered_upper"))
+
+# The asyncio.Lock of each event loop that its runs with in-process backends take turns with
+_IN_PROCESS_RUN_LOCKS = weakref.WeakKeyDictionary()
+
+# converged is True if the solution is feasible, pysolnp_converged is the convergence reported by pysolnp. The constraint
+# function values are None for problems without those constraints.
+Result = namedtuple(typename="Result",
+                    field_names=("parameters", "obj_value", "converged", "pysolnp_converged", "eq_func_values",
+                                 "ineq_func_values"),
+                    defaults=(None, None, None))
+
+# The settings that the scores of the starting guesses of a solve depend on, used to reuse the scores in a later solve.
+# The bounds and constraint values are float arrays, the constraint values are None for problems without them.
+EvaluationSettings = namedtuple(typename="EvaluationSettings",
+                                field_names=("par_lower_limit", "par_upper_limit", "eq_values", "ineq_lower_bounds",
+                                             "ineq_upper_bounds", "evaluation_type"))
 
 
 class Results:
-    def __init__(self, results: List[Result], starting_guesses: List[float]):
-        self.__results = results
-        self.__starting_guesses = starting_guesses
+    """
+    The results of a solve, stored as arrays with one row per restart and one row per reported starting guess.
+    The Result of each restart is only created when it is requested.
+    """
+
+    def __init__(self,
+                 parameters: numpy.ndarray,
+                 obj_values: numpy.ndarray,
+                 converged: numpy.ndarray,
+                 starting_guess_array: numpy.ndarray,
+                 starting_guess_scores: numpy.ndarray,
+                 pysolnp_converged: Optional[numpy.ndarray] = None,
+                 eq_func_values: Optional[numpy.ndarray] = None,
+                 ineq_func_values: Optional[numpy.ndarray] = None,
+                 is_partial: bool = False,
+                 evaluation_settings: Optional[EvaluationSettings] = None,
+                 has_all_guesses: bool = True):
+        """
+        :param parameters: A (number_of_results, number_of_parameters) array of the optimums of the restarts
+        :param obj_values: A (number_of_results,) array of the objective values of the optimums
+        :param converged: A (number_of_results,) boolean array which is True for the feasible optimums
+        :param starting_guess_array: A (number_of_guesses, number_of_parameters) array of the starting guesses
+        :param starting_guess_scores: A (number_of_guesses,) array of the evaluation function values of the starting guesses
+        :param pysolnp_converged: [Optional, default None] A (number_of_results,) boolean array of the convergence reported by pysolnp
+        :param eq_func_values: [Optional, default None] A (number_of_results, number_of_eq_constraints) array, None without equality constraints
+        :param ineq_func_values: [Optional, default None] A (number_of_results, number_of_ineq_constraints) array, None without inequality constraints
+        :param is_partial: [Optional, default False] True if the time budget ran out before all the evaluations and restarts were done
+        :param evaluation_settings: [Optional, default None] The settings that the starting guess scores depend on
+        :param has_all_guesses: [Optional, default True] False if only some of the evaluated guesses are in starting_guess_array
+        """
+        self.__parameters = parameters
+        self.__obj_values = obj_values
+        self.__converged = converged
+        self.__starting_guess_array = starting_guess_array
+        self.__starting_guess_scores = starting_guess_scores
+        self.__pysolnp_converged = pysolnp_converged
+        self.__eq_func_values = eq_func_values
+        self.__ineq_func_values = ineq_func_values
+        self.__is_partial = is_partial
+        self.__evaluation_settings = evaluation_settings
+        self.__has_all_guesses = has_all_guesses
+        self.__results = None
+        self.__best_solution = None
+        self.__has_best_solution = False
 
     def __str__(self):
-        return f"Results(all_results={self.all_results}, best_solution={self.best_solution}, starting_guesses={self.starting_guesses})"
+        return f"Results(all_results={self.all_results}, best_solution={self.best_solution}, starting_guesses={self.starting_guesses}, is_partial={self.is_partial})"
+
+    def __len__(self) -> int:
+        return len(self.__obj_values)
+
+    def __getitem__(self, index: int) -> Result:
+        if self.__results is not None:
+            return self.__results[index]
+        return Result(parameters=self.__parameters[index].tolist(),
+                      obj_value=float(self.__obj_values[index]),
+                      converged=bool(self.__converged[index]),
+                      pysolnp_converged=bool(
+                          self.__pysolnp_converged[index]) if self.__pysolnp_converged is not None else None,
+                      eq_func_values=self.__eq_func_values[index].tolist() if self.__eq_func_values is not None else None,
+                      ineq_func_values=self.__ineq_func_values[
+                          index].tolist() if self.__ineq_func_values is not None else None)
 
     @property
     def all_results(self) -> List[Result]:
+        if self.__results is None:
+            self.__results = [self[index] for index in range(len(self))]
         return self.__results
 
     @property
     def best_solution(self) -> Optional[Result]:
-        viable_solutions = [solution for solution in self.__results if solution.converged]
-        if len(viable_solutions) == 0:
-            return None
-        return reduce(lambda first, second: first if first.obj_value < second.obj_value else second, viable_solutions)
+        if not self.__has_best_solution:
+            converged_indices = numpy.flatnonzero(self.__converged)
+            if len(converged_indices) > 0:
+                # The last of equal objective values is the best, as when comparing the results in order
+                values = self.__obj_values[converged_indices][::-1]
+                self.__best_solution = self[int(converged_indices[len(values) - 1 - int(numpy.argmin(values))])]
+            self.__has_best_solution = True
+        return self.__best_solution
 
     @property
     def starting_guesses(self) -> List[float]:
-        return self.__starting_guesses
+        # All the starting guesses one after the other, created when requested
+        return self.__starting_guess_array.reshape(-1).tolist()
 
+    @property
+    def starting_guess_array(self) -> numpy.ndarray:
+        return self.__starting_guess_array
 
-def __get_best_solutions(results: Union[List, Array], number_of_results: int):
-    results = nsmallest(n=number_of_results,
-                        iterable=enumerate(results),
-                        key=lambda value: value[1])
+    @property
+    def starting_guess_scores(self) -> numpy.ndarray:
+        return self.__starting_guess_scores
 
-    if all(result[1] == float("inf") for result in results):
-        raise ValueError("Evaluation functions could not locate any successful starting guesses.")
+    @property
+    def parameters(self) -> numpy.ndarray:
+        return self.__parameters
+
+    @property
+    def obj_values(self) -> numpy.ndarray:
+        return self.__obj_values
+
+    @property
+    def converged(self) -> numpy.ndarray:
+        return self.__converged
+
+    @property
+    def pysolnp_converged(self) -> Optional[numpy.ndarray]:
+        return self.__pysolnp_converged
+
+    @property
+    def eq_func_values(self) -> Optional[numpy.ndarray]:
+        return self.__eq_func_values
+
+    @property
+    def ineq_func_values(self) -> Optional[numpy.ndarray]:
+        return self.__ineq_func_values
+
+    @property
+    def is_partial(self) -> bool:
+        # True if the time budget ran out before all the evaluations and restarts were done
+        return self.__is_partial
+
+    @property
+    def evaluation_settings(self) -> Optional[EvaluationSettings]:
+        return self.__evaluation_settings
+
+    @property
+    def has_all_guesses(self) -> bool:
+        # False if only the best guesses were kept, as when streaming the evaluations in chunks
+        return self.__has_all_guesses
+
+
+def __deadline(model: ProblemModel) -> Optional[float]:
+    # The time.monotonic() time at which the time budget of the solve runs out
+    if model.time_budget is None:
+        return None
+    return time.monotonic() + model.time_budget
+
+
+def __is_expired(deadline: Optional[float]) -> bool:
+    return deadline is not None and time.monotonic() >= deadline
+
+
+def __count_target_solutions(model: ProblemModel, results: Results) -> int:
+    # The number of converged results that reach the target objective value
+    if model.target_obj_value is None:
+        return 0
+    return int(numpy.count_nonzero(results.converged & (results.obj_values <= model.target_obj_value)))
+
+
+def __is_target_reached(model: ProblemModel, number_of_target_solutions: int) -> bool:
+    return model.target_obj_value is not None and number_of_target_solutions >= model.min_feasible_solutions
+
+
+def __is_evaluation_stopped(start_row: int,
+                            end_row: int,
+                            model: ProblemModel,
+                            deadline: Optional[float],
+                            parameter_guesses: numpy.ndarray,
+                            eval_results: numpy.ndarray,
+                            target_solutions: List[int]) -> bool:
+    """
+    Checks the newly evaluated rows start_row to end_row - 1 and returns True if the evaluations should stop, because
+    the deadline passed or min_feasible_solutions feasible guesses reach the target objective value.
+    :param target_solutions: The sample rows of the feasible guesses that reach the target objective value so far,
+    updated in place
+    """
+    if model.target_obj_value is not None:
+        # Guesses within the inequality bounds evaluate to at least their objective value with both evaluation types,
+        # so only the guesses that evaluate to at most the target objective value are checked
+        for row in (numpy.flatnonzero(eval_results[start_row:end_row] <= model.target_obj_value) + start_row).tolist():
+            guess = parameter_guesses[row].tolist()
+            obj_value = model.obj_func(guess)
+            if obj_value <= model.target_obj_value and model.check_solution_feasibility(guess):
+                target_solutions.append(row)
+        if __is_target_reached(model=model, number_of_target_solutions=len(target_solutions)):
+            return True
+    return __is_expired(deadline)
 
-    return results
 
+def __generate_samples(sampling: Sampling, number_of_samples: int, sample_size: int) -> numpy.ndarray:
+    # Samplings return either a (number_of_samples, sample_size) array or a flat list, store them as one 2d block
+    samples = sampling.generate_all_samples(number_of_samples=number_of_samples, sample_size=sample_size)
+    return numpy.array(samples, dtype=numpy.float64).reshape(number_of_samples, sample_size)
 
-def __debug_message_eval_functions(model: ProblemModel, eval_results: Union[Array, List]):
-    number_of_failed_evaluations = sum((1 if value == float("inf") else 0) for value in eval_results)
+
+def __distinct_basin_indices(values: numpy.ndarray,
+                             guesses: numpy.ndarray,
+                             number_of_results: int,
+                             critical_distance: float,
+                             parameter_ranges: numpy.ndarray) -> numpy.ndarray:
+    """
+    Selects up to number_of_results guesses in order of their values, skipping the guesses that are within the critical
+    distance of a better selected guess, like the single linkage clustering of MLSL. The distances are measured with the
+    parameters scaled to the unit hypercube of the parameter bounds.
+    :return: The indices of the selected guesses, best first
+    """
+    scaled_guesses = guesses / numpy.where(parameter_ranges > 0.0, parameter_ranges, 1.0)
+    selected_indices = []
+    for index in numpy.argsort(values, kind="stable").tolist():
+        if len(selected_indices) == number_of_results:
+            break
+        if len(selected_indices) > 0:
+            squared_distances = ((scaled_guesses[selected_indices] - scaled_guesses[index]) ** 2).sum(axis=1)
+            if (squared_distances <= critical_distance ** 2).any():
+                continue
+        selected_indices.append(index)
+    return numpy.array(selected_indices, dtype=numpy.int64)
+
+
+def __merge_best_evaluations(best_values: numpy.ndarray,
+                             best_guesses: numpy.ndarray,
+                             best_sample_indices: numpy.ndarray,
+                             values: numpy.ndarray,
+                             guesses: numpy.ndarray,
+                             sample_indices: numpy.ndarray,
+                             number_of_results: int,
+                             critical_distance: Optional[float] = None,
+                             parameter_ranges: Optional[numpy.ndarray] = None) \
+        -> Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+    # Keep the number_of_results lowest values, the sort is stable so ties are resolved by the order of evaluation.
+    # With a critical distance, the guesses close to a better kept guess are skipped, see __distinct_basin_indices.
+    all_values = numpy.concatenate((best_values, values))
+    if critical_distance is None:
+        best_indices = numpy.argsort(all_values, kind="stable")[:number_of_results]
+    else:
+        best_indices = __distinct_basin_indices(values=all_values,
+                                                guesses=numpy.concatenate((best_guesses, guesses)),
+                                                number_of_results=number_of_results,
+                                                critical_distance=critical_distance,
+                                                parameter_ranges=parameter_ranges)
+    number_of_previous_best = len(best_values)
+    is_previous_best = best_indices < number_of_previous_best
+    merged_guesses = numpy.empty(shape=(len(best_indices), guesses.shape[1]), dtype=numpy.float64)
+    merged_guesses[is_previous_best] = best_guesses[best_indices[is_previous_best]]
+    merged_guesses[~is_previous_best] = guesses[best_indices[~is_previous_best] - number_of_previous_best]
+    merged_sample_indices = numpy.concatenate((best_sample_indices, sample_indices))[best_indices]
+    return all_values[best_indices], merged_guesses, merged_sample_indices
+
+
+def __is_inside_bounds(guesses: numpy.ndarray, lower_bounds: numpy.ndarray, upper_bounds: numpy.ndarray) -> numpy.ndarray:
+    # A boolean array which is True for the guesses within the bounds
+    return ((guesses >= lower_bounds) & (guesses <= upper_bounds)).all(axis=1)
+
+
+def __is_score_changed(previous_settings: EvaluationSettings,
+                       settings: EvaluationSettings,
+                       scores: numpy.ndarray) -> numpy.ndarray:
+    # A boolean array which is True for the scores that the changed constraints might change
+    def is_equal(previous_values: Optional[numpy.ndarray], values: Optional[numpy.ndarray]) -> bool:
+        if previous_values is None or values is None:
+            return previous_values is None and values is None
+        return numpy.array_equal(previous_values, values)
+
+    is_ineq_equal = is_equal(previous_settings.ineq_lower_bounds, settings.ineq_lower_bounds) and \
+                    is_equal(previous_settings.ineq_upper_bounds, settings.ineq_upper_bounds)
+    if previous_settings.evaluation_type != settings.evaluation_type:
+        return numpy.ones(shape=len(scores), dtype=bool)
+    if settings.evaluation_type == EvaluationType.PENALTY_BARRIER_FUNCTION:
+        # The penalties depend on the equality and inequality constraints
+        is_changed = not is_ineq_equal or not is_equal(previous_settings.eq_values, settings.eq_values)
+        return numpy.full(shape=len(scores), fill_value=is_changed, dtype=bool)
+    # The guesses outside the inequality bounds score infinity, the equality constraints are not used
+    if is_ineq_equal:
+        return numpy.zeros(shape=len(scores), dtype=bool)
+    if previous_settings.ineq_lower_bounds is not None and settings.ineq_lower_bounds is not None and \
+            (settings.ineq_lower_bounds <= previous_settings.ineq_lower_bounds).all() and \
+            (settings.ineq_upper_bounds >= previous_settings.ineq_upper_bounds).all():
+        # Wider bounds keep the guesses inside, only the guesses outside might now be inside
+        return scores == float("inf")
+    return numpy.ones(shape=len(scores), dtype=bool)
+
+
+def __previous_evaluations(model: ProblemModel) -> Optional[_PreviousEvaluations]:
+    """
+    The starting guesses of model.previous_results that are within the parameter bounds, split into the guesses whose
+    scores are reused and the guesses to evaluate again because the constraints that their scores depend on changed.
+    The parameter bounds of the earlier solve are covered by its guesses, unless its evaluations were not completed or
+    not all of its evaluated guesses were kept.
+    """
+    previous_results = model.previous_results
+    if previous_results is None:
+        return None
+    if not isinstance(previous_results, Results) or previous_results.evaluation_settings is None:
+        raise ValueError("previous_results needs to be the Results of an earlier solve")
+    previous_settings = previous_results.evaluation_settings
+    if len(previous_settings.par_lower_limit) != model.number_of_parameters:
+        raise ValueError("previous_results needs to be the Results of a problem with the same number of parameters")
+
+    settings = __evaluation_settings(model=model)
+    is_inside = __is_inside_bounds(previous_results.starting_guess_array, settings.par_lower_limit,
+                                   settings.par_upper_limit)
+    guesses = previous_results.starting_guess_array[is_inside]
+    scores = previous_results.starting_guess_scores[is_inside]
+    is_rescored = __is_score_changed(previous_settings=previous_settings, settings=settings, scores=scores)
+    is_covered = not previous_results.is_partial and previous_results.has_all_guesses
+    return _PreviousEvaluations(guesses=guesses[~is_rescored],
+                                scores=scores[~is_rescored],
+                                rescored_guesses=guesses[is_rescored],
+                                covered_lower=previous_settings.par_lower_limit if is_covered else None,
+                                covered_upper=previous_settings.par_upper_limit if is_covered else None)
+
+
+def __debug_message_eval_functions(model: ProblemModel, number_of_failed_evaluations: int):
     print(
         f"Out of {model.number_of_evaluations} evaluations {number_of_failed_evaluations} failed or returned infinity for evaluation function {model.evaluation_type.name}. Check for issues with your problem definition or try changing the evaluation function.")
 
 
+def __evaluation_tasks(start_index: int, end_index: int, chunk_size: int) -> List[Tuple[int, int]]:
+    # Contiguous (buffer_index, number_of_samples) ranges covering start_index to end_index - 1
+    return [(buffer_index, min(chunk_size, end_index - buffer_index)) for buffer_index in
+            range(start_index, end_index, chunk_size)]
+
+
+def __adaptive_task_size(seconds_per_evaluation: float,
+                          number_of_samples: int,
+                          number_of_workers: int,
+                          max_chunk_size: int) -> int:
+    # Large enough for a task to take about EVALUATION_TASK_SECONDS, small enough to keep the processes balanced
+    balanced_chunk_size = math.ceil(number_of_samples / (number_of_workers * EVALUATION_TASKS_PER_PROCESS))
+    if seconds_per_evaluation > 0.0:
+        chunk_size = min(int(EVALUATION_TASK_SECONDS / seconds_per_evaluation), balanced_chunk_size)
+    else:
+        chunk_size = balanced_chunk_size
+    return max(1, min(chunk_size, max_chunk_size))
+
+
+def __task_rows(tasks: List[tuple]) -> Tuple[int, int]:
+    # The rows evaluated by contiguous evaluation tasks, their last two arguments are the buffer index and sample count
+    buffer_index, number_of_samples = tasks[-1][-2:]
+    return tasks[0][-2], buffer_index + number_of_samples
+
+
+def __run_tasks_until(is_stopped: Optional[Callable[[int, int], bool]],
+                      run_tasks: Callable[[Callable, Iterable[tuple]], list],
+                      function: Callable,
+                      tasks: List[tuple],
+                      number_of_workers: int) -> Tuple[list, int]:
+    """
+    Runs the evaluation tasks. With is_stopped, the tasks run in rounds of one task per worker and is_stopped is called
+    with the rows evaluated by each round, the remaining tasks are not run once it returns True.
+    :return: The return values of the tasks that ran and the row after the last row they evaluated
+    """
+    if len(tasks) == 0:
+        return [], 0
+    if is_stopped is None:
+        return run_tasks(function, tasks), __task_rows(tasks)[1]
+
+    results = []
+    evaluated_row = tasks[0][-2]
+    if is_stopped(evaluated_row, evaluated_row):
+        return results, evaluated_row
+    for task_index in range(0, len(tasks), number_of_workers):
+        round_tasks = tasks[task_index:task_index + number_of_workers]
+        results += run_tasks(function, round_tasks)
+        start_row, evaluated_row = __task_rows(round_tasks)
+        if is_stopped(start_row, evaluated_row):
+            break
+    return results, evaluated_row
+
+
+def __run_evaluation_tasks(model: ProblemModel,
+                           chunk_start: int,
+                           start_row: int,
+                           end_row: int,
+                           run_tasks: Callable[[Callable, Iterable[tuple]], list],
+                           number_of_workers: int,
+                           evaluation_cost: dict,
+                           is_stopped: Optional[Callable[[int, int], bool]] = None) -> int:
+    """
+    Evaluates the rows start_row to end_row - 1 of the guess buffer, which holds the samples from chunk_start onwards.
+    Each evaluation task covers a contiguous range of guesses. With multiple workers or is_stopped, the first tasks
+    measure the cost of an evaluation and the remaining guesses are split into ranges sized from this cost.
+    :param evaluation_cost: The total "seconds" spent on and the number of "evaluations" timed so far, updated in place
+    :param is_stopped: [Optional, default None] Called with the rows evaluated so far, no more tasks are started once it
+    returns True, see __run_tasks_until
+    :return: The row after the last evaluated row, less than end_row if the evaluations were stopped
+    """
+    if start_row >= end_row:
+        return end_row
+
+    if model.sample_in_workers:
+        # Each task generates its own samples from a stream keyed by the sample index
+        _, evaluated_row = __run_tasks_until(
+            is_stopped=is_stopped,
+            run_tasks=run_tasks,
+            function=generate_and_evaluate_starting_guesses,
+            tasks=[(chunk_start + offset, offset, min(WORKER_SAMPLING_CHUNK_SIZE, end_row - offset))
+                   for offset in range(start_row, end_row, WORKER_SAMPLING_CHUNK_SIZE)],
+            number_of_workers=number_of_workers)
+        return evaluated_row
+
+    if model.has_batch_functions:
+        evaluation_function = evaluate_starting_guesses
+        max_chunk_size = BATCH_EVALUATION_CHUNK_SIZE
+    else:
+        evaluation_function = evaluate_starting_guess_range
+        max_chunk_size = max(1, end_row - start_row)
+
+    if number_of_workers == 1 and is_stopped is None:
+        run_tasks(evaluation_function, __evaluation_tasks(start_index=start_row,
+                                                          end_index=end_row,
+                                                          chunk_size=max_chunk_size))
+        return end_row
+
+    if evaluation_cost["evaluations"] == 0:
+        probe_end_row = min(end_row, start_row + number_of_workers * EVALUATION_PROBE_SIZE)
+        results, evaluated_row = __run_tasks_until(is_stopped=is_stopped,
+                                                   run_tasks=run_tasks,
+                                                   function=evaluation_function,
+                                                   tasks=__evaluation_tasks(start_index=start_row,
+                                                                            end_index=probe_end_row,
+                                                                            chunk_size=min(EVALUATION_PROBE_SIZE,
+                                                                                           max_chunk_size)),
+                                                   number_of_workers=number_of_workers)
+        evaluation_cost["seconds"] += sum(results)
+        evaluation_cost["evaluations"] += evaluated_row - start_row
+        if evaluated_row < probe_end_row:
+            return evaluated_row
+        start_row = probe_end_row
+
+    if start_row < end_row:
+        task_size = __adaptive_task_size(
+            seconds_per_evaluation=evaluation_cost["seconds"] / evaluation_cost["evaluations"],
+            number_of_samples=end_row - start_row,
+            number_of_workers=number_of_workers,
+            max_chunk_size=max_chunk_size)
+        results, evaluated_row = __run_tasks_until(is_stopped=is_stopped,
+                                                   run_tasks=run_tasks,
+                                                   function=evaluation_function,
+                                                   tasks=__evaluation_tasks(start_index=start_row,
+                                                                            end_index=end_row,
+                                                                            chunk_size=task_size),
+                                                   number_of_workers=number_of_workers)
+        evaluation_cost["seconds"] += sum(results)
+        evaluation_cost["evaluations"] += evaluated_row - start_row
+        return evaluated_row
+
+    return end_row
+
+
+def __evaluate_starting_guesses(model: ProblemModel,
+                                sampling: Sampling,
+                                parameter_guesses: numpy.ndarray,
+                                eval_results: numpy.ndarray,
+                                run_tasks: Callable[[Callable, Iterable[tuple]], list],
+                                number_of_workers: int = 1,
+                                start_early_restarts: Optional[Callable] = None,
+                                deadline: Optional[float] = None,
+                                checkpoint: Optional[Checkpoint] = None,
+                                previous_evaluations: Optional[_PreviousEvaluations] = None) \
+        -> Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray, bool]:
+    """
+    Generates and evaluates the starting guesses in chunks of len(eval_results) samples, keeping only the best
+    number_of_restarts guesses in between chunks.
+    :param parameter_guesses: A (number_of_guesses, number_of_parameters) array shared with the evaluation functions
+    :param eval_results: A (number_of_guesses,) array shared with the evaluation functions for the results
+    :param run_tasks: A callable with the signature of Pool.starmap that runs the evaluation functions
+    :param number_of_workers: The number of workers run_tasks distributes the tasks to
+    :param start_early_restarts: [Optional, default None] Called with the best values, guesses and sample indices so far
+    once model.early_restart_index evaluations are done, unless that is all of them
+    :param deadline: [Optional, default None] The time.monotonic() time at which the evaluations stop
+    :param checkpoint: [Optional, default None] Stores the best guesses after each chunk. The chunks that the checkpoint
+    already holds are not evaluated again, their samples are only generated to keep the sampling in step.
+    :param previous_evaluations: [Optional, default None] The guesses of an earlier solve that are reused with their
+    scores. The samples generated in this process that fall in the parameter bounds of the earlier solve are not
+    evaluated, except for the points of a WarmStartSampling.
+    :return: The best values, guesses and sample indices, the starting guesses to report in the Results with their
+    values and whether the evaluations were done before the deadline. The evaluations are done early when
+    min_feasible_solutions feasible guesses reach the target objective value.
+    """
+    sample_size = model.sample_size
+    chunk_size = len(eval_results)
+    early_restart_index = model.early_restart_index if start_early_restarts is not None else None
+
+    best_values = numpy.empty(shape=0, dtype=numpy.float64)
+    best_guesses = numpy.empty(shape=(0, sample_size), dtype=numpy.float64)
+    best_sample_indices = numpy.empty(shape=0, dtype=numpy.int64)
+    number_of_failed_evaluations = 0
+    samples = best_guesses
+    values = best_values
+    # Total time spent and number of evaluations, used to estimate the cost of an evaluation
+    evaluation_cost = {"seconds": 0.0, "evaluations": 0}
+    is_complete = True
+    target_solutions = []
+    is_stopped = None
+    if deadline is not None or model.target_obj_value is not None:
+        is_stopped = partial(__is_evaluation_stopped,
+                             model=model,
+                             deadline=deadline,
+                             parameter_guesses=parameter_guesses,
+                             eval_results=eval_results,
+                             target_solutions=target_solutions)
+    merge_best_evaluations = partial(__merge_best_evaluations,
+                                     number_of_results=model.number_of_restarts,
+                                     critical_distance=model.critical_distance,
+                                     parameter_ranges=numpy.subtract(model.par_upper_limit, model.par_lower_limit,
+                                                                     dtype=numpy.float64))
+    covered_bounds = None
+    if previous_evaluations is not None:
+        # The reused guesses have sample indices after the generated samples
+        best_values, best_guesses, best_sample_indices = merge_best_evaluations(
+            best_values=best_values,
+            best_guesses=best_guesses,
+            best_sample_indices=best_sample_indices,
+            values=previous_evaluations.scores,
+            guesses=previous_evaluations.guesses,
+            sample_indices=numpy.arange(model.number_of_evaluations,
+                                        model.number_of_evaluations + len(previous_evaluations.scores)))
+        if previous_evaluations.covered_lower is not None and not model.sample_in_workers:
+            covered_bounds = (previous_evaluations.covered_lower, previous_evaluations.covered_upper)
+    number_of_points = len(sampling.points) if isinstance(sampling, WarmStartSampling) else 0
+    number_of_checkpoint_samples = checkpoint.number_of_evaluated_samples if checkpoint is not None else 0
+    for chunk_start in range(0, model.number_of_evaluations, chunk_size):
+        number_of_samples = min(chunk_size, model.number_of_evaluations - chunk_start)
+        chunk_end = chunk_start + number_of_samples
+
+        if not model.sample_in_workers:
+            parameter_guesses[:number_of_samples] = __generate_samples(sampling=sampling,
+                                                                       number_of_samples=number_of_samples,
+                                                                       sample_size=sample_size)
+
+        if chunk_end <= number_of_checkpoint_samples:
+            if chunk_end == number_of_checkpoint_samples:
+                evaluations = checkpoint.evaluations
+                best_values = evaluations["best_values"]
+                best_guesses = evaluations["best_guesses"]
+                best_sample_indices = evaluations["best_sample_indices"]
+                number_of_failed_evaluations = int(evaluations["number_of_failed_evaluations"])
+                samples = evaluations["samples"]
+                values = evaluations["values"]
+            # The early restarts of these chunks were started again from the checkpoint
+            if early_restart_index is not None and early_restart_index <= chunk_end:
+                early_restart_index = None
+            continue
+
+        chunk_sample_indices = numpy.arange(chunk_start, chunk_end)
+        if covered_bounds is not None:
+            # The samples in the bounds of the earlier solve are covered by its guesses, the others are moved to the front
+            is_evaluated = (chunk_sample_indices < number_of_points) | ~__is_inside_bounds(
+                parameter_guesses[:number_of_samples], *covered_bounds)
+            chunk_sample_indices = chunk_sample_indices[is_evaluated]
+            parameter_guesses[:len(chunk_sample_indices)] = parameter_guesses[:number_of_samples][is_evaluated]
+            number_of_samples = len(chunk_sample_indices)
+
+        # The evaluations are split where the early restarts start
+        split_row = number_of_samples
+        if early_restart_index is not None and chunk_start < early_restart_index < chunk_end:
+            split_row = int(numpy.searchsorted(chunk_sample_indices, early_restart_index))
+            if model.sample_in_workers:
+                # Keep the tasks aligned with the sampling streams
+                split_row = min(number_of_samples,
+                                math.ceil(split_row / WORKER_SAMPLING_CHUNK_SIZE) * WORKER_SAMPLING_CHUNK_SIZE)
+
+        evaluated_row = __run_evaluation_tasks(model=model, chunk_start=chunk_start, start_row=0, end_row=split_row,
+                                               run_tasks=run_tasks, number_of_workers=number_of_workers,
+                                               evaluation_cost=evaluation_cost, is_stopped=is_stopped)
+        if evaluated_row == split_row < number_of_samples and not __is_target_reached(
+                model=model, number_of_target_solutions=len(target_solutions)):
+            start_early_restarts(*merge_best_evaluations(best_values=best_values,
+                                                         best_guesses=best_guesses,
+                                                         best_sample_indices=best_sample_indices,
+                                                         values=eval_results[:split_row],
+                                                         guesses=parameter_guesses[:split_row],
+                                                         sample_indices=chunk_sample_indices[:split_row]))
+            early_restart_index = None
+            evaluated_row = __run_evaluation_tasks(model=model, chunk_start=chunk_start, start_row=split_row,
+                                                   end_row=number_of_samples, run_tasks=run_tasks,
+                                                   number_of_workers=number_of_workers,
+                                                   evaluation_cost=evaluation_cost, is_stopped=is_stopped)
+
+        is_done = __is_target_reached(model=model, number_of_target_solutions=len(target_solutions))
+        if evaluated_row < number_of_samples:
+            # The evaluations were stopped, only the evaluated guesses are kept
+            is_complete = is_done
+            number_of_samples = evaluated_row
+
+        samples = parameter_guesses[:number_of_samples]
+        if model.debug is True:
+            if numpy.isnan(samples).any():
+                print(f"Some of the random samples provided failed to generate, is your Sampling class setup correctly?")
+
+        values = eval_results[:number_of_samples]
+        number_of_failed_evaluations += int(numpy.count_nonzero(values == float("inf")))
+        best_values, best_guesses, best_sample_indices = merge_best_evaluations(
+            best_values=best_values,
+            best_guesses=best_guesses,
+            best_sample_indices=best_sample_indices,
+            values=values,
+            guesses=samples,
+            sample_indices=chunk_sample_indices[:number_of_samples])
+
+        if is_done or not is_complete:
+            break
+
+        if early_restart_index is not None and early_restart_index <= chunk_end < model.number_of_evaluations:
+            start_early_restarts(best_values, best_guesses, best_sample_indices)
+            early_restart_index = None
+
+        if checkpoint is not None:
+            # Without chunks the evaluated guesses are reported in the Results, so they are stored as well
+            is_single_chunk = chunk_size >= model.number_of_evaluations
+            checkpoint.save_evaluations(number_of_evaluated_samples=chunk_end,
+                                        best_values=best_values,
+                                        best_guesses=best_guesses,
+                                        best_sample_indices=best_sample_indices,
+                                        number_of_failed_evaluations=numpy.array(number_of_failed_evaluations),
+                                        samples=samples if is_single_chunk else samples[:0],
+                                        values=values if is_single_chunk else values[:0])
+
+    if model.debug is True:
+        __debug_message_eval_functions(model=model, number_of_failed_evaluations=number_of_failed_evaluations)
+
+    if is_complete and all(value == float("inf") for value in best_values):
+        raise ValueError("Evaluation functions could not locate any successful starting guesses.")
+
+    if chunk_size < model.number_of_evaluations:
+        # When streaming, only the guesses that are used for the restarts are kept
+        starting_guesses, starting_guess_scores = best_guesses, best_values
+    elif isinstance(samples, numpy.memmap):
+        # The files of the buffers are kept after the run, so the guesses are read from them as needed
+        starting_guesses, starting_guess_scores = numpy.asarray(samples), numpy.asarray(values)
+    else:
+        # Copied out of the buffers, which are reused or released after the run
+        starting_guesses, starting_guess_scores = samples.copy(), values.copy()
+    if previous_evaluations is not None and chunk_size >= model.number_of_evaluations:
+        starting_guesses = numpy.concatenate((previous_evaluations.guesses, starting_guesses))
+        starting_guess_scores = numpy.concatenate((previous_evaluations.scores, starting_guess_scores))
+
+    return best_values, best_guesses, best_sample_indices, starting_guesses, starting_guess_scores, is_complete
+
+
+def __nearest_better_distances(values: numpy.ndarray,
+                               scaled_guesses: numpy.ndarray,
+                               nearest_distances: numpy.ndarray) -> numpy.ndarray:
+    """
+    The distance from each guess of the reduced sample to the nearest better guess, infinite for the best guesses.
+    Only the distances to the guesses added since the last call are computed.
+    :param nearest_distances: The distances of the first len(nearest_distances) guesses from the last call
+    """
+    number_of_previous_guesses = len(nearest_distances)
+    nearest_distances = numpy.concatenate((nearest_distances,
+                                           numpy.full(shape=len(values) - number_of_previous_guesses,
+                                                      fill_value=numpy.inf)))
+    for index in range(number_of_previous_guesses, len(values)):
+        distances = numpy.sqrt(((scaled_guesses - scaled_guesses[index]) ** 2).sum(axis=1))
+        is_worse = values > values[index]
+        nearest_distances[is_worse] = numpy.minimum(nearest_distances[is_worse], distances[is_worse])
+        is_better = values < values[index]
+        if is_better.any():
+            nearest_distances[index] = distances[is_better].min()
+    return nearest_distances
+
+
+def __mlsl_start_indices(values: numpy.ndarray,
+                         scaled_guesses: numpy.ndarray,
+                         nearest_distances: numpy.ndarray,
+                         is_started: numpy.ndarray,
+                         radius: float,
+                         scaled_minima: numpy.ndarray) -> numpy.ndarray:
+    """
+    The guesses of the reduced sample that multi-level single linkage starts restarts from: the guesses that were not
+    started yet, have no better guess within the radius and no found minimum within MLSL_MINIMUM_DISTANCE. The guesses
+    and minima are scaled to the unit hypercube of the parameter bounds.
+    :param nearest_distances: The distance from each guess to the nearest better guess, see __nearest_better_distances
+    :return: The indices of the guesses, best first
+    """
+    start_indices = numpy.flatnonzero(~is_started & numpy.isfinite(values) & (nearest_distances > radius))
+    if len(scaled_minima) > 0:
+        squared_distances = ((scaled_guesses[start_indices, None, :] - scaled_minima[None, :, :]) ** 2).sum(axis=2)
+        start_indices = start_indices[(squared_distances > MLSL_MINIMUM_DISTANCE ** 2).all(axis=1)]
+    return start_indices[numpy.argsort(values[start_indices], kind="stable")]
+
+
+def __mlsl_estimated_minima(number_of_minima: int, number_of_restarts: int) -> float:
+    # The Bayesian estimate of Boender and Rinnooy Kan of the total number of minima, which needs more than
+    # number_of_minima + 2 restarts
+    if number_of_restarts <= number_of_minima + 2:
+        return math.inf
+    return number_of_minima * (number_of_restarts - 1) / (number_of_restarts - number_of_minima - 2)
+
+
+def __evaluate_mlsl_rounds(model: ProblemModel,
+                           sampling: Sampling,
+                           parameter_guesses: numpy.ndarray,
+                           eval_results: numpy.ndarray,
+                           restart_results: numpy.ndarray,
+                           run_tasks: Callable[[Callable, Iterable[tuple]], list],
+                           start_restarts: Callable,
+                           restart_sample_indices: List[int],
+                           completed: SimpleQueue,
+                           number_of_workers: int = 1,
+                           deadline: Optional[float] = None) \
+        -> Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray, bool]:
+    """
+    Evaluates the starting guesses in rounds of len(eval_results) samples like multi-level single linkage. The best
+    MLSL_REDUCED_SAMPLE_FRACTION of the guesses of each round are added to the reduced sample, and after each round the
+    restarts start from the guesses of the reduced sample picked by __mlsl_start_indices, with the critical distance of
+    all the samples so far as the radius. The restarts of a round finish before the next round starts.
+    The rounds stop once the Bayesian estimate of the number of minima is less than MLSL_STOP_MARGIN above the number
+    of distinct feasible minima found, or number_of_restarts restarts were started.
+    The finished restarts are put in completed again, so that they are collected like the restarts of other solves.
+    :param start_restarts: Starts restarts for guesses and sample indices, see __start_restarts
+    :param restart_sample_indices: The sample index of the guess of each restart so far, appended to by start_restarts
+    :param completed: The queue that the restart tasks put their results in
+    :return: The same as __evaluate_starting_guesses, the best guesses are the restarted guesses in order and the
+    starting guesses to report are the reduced sample
+    """
+    number_of_parameters = model.number_of_parameters
+    round_size = len(eval_results)
+    parameter_ranges = numpy.subtract(model.par_upper_limit, model.par_lower_limit, dtype=numpy.float64)
+    parameter_scales = numpy.where(parameter_ranges > 0.0, parameter_ranges, 1.0)
+
+    reduced_values = numpy.empty(shape=0, dtype=numpy.float64)
+    reduced_guesses = numpy.empty(shape=(0, number_of_parameters), dtype=numpy.float64)
+    reduced_sample_indices = numpy.empty(shape=0, dtype=numpy.int64)
+    nearest_distances = numpy.empty(shape=0, dtype=numpy.float64)
+    scaled_minima = numpy.empty(shape=(0, number_of_parameters), dtype=numpy.float64)
+    finished_solve_indices = []
+    number_of_failed_evaluations = 0
+    number_of_target_solutions = 0
+    evaluation_cost = {"seconds": 0.0, "evaluations": 0}
+    is_complete = True
+    target_solutions = []
+    is_stopped = None
+    if deadline is not None or model.target_obj_value is not None:
+        is_stopped = partial(__is_evaluation_stopped,
+                             model=model,
+                             deadline=deadline,
+                             parameter_guesses=parameter_guesses,
+                             eval_results=eval_results,
+                             target_solutions=target_solutions)
+    try:
+        for round_index, chunk_start in enumerate(range(0, model.number_of_evaluations, round_size)):
+            number_of_samples = min(round_size, model.number_of_evaluations - chunk_start)
+            if not model.sample_in_workers:
+                parameter_guesses[:number_of_samples] = __generate_samples(sampling=sampling,
+                                                                           number_of_samples=number_of_samples,
+                                                                           sample_size=model.sample_size)
+            evaluated_row = __run_evaluation_tasks(model=model, chunk_start=chunk_start, start_row=0,
+                                                   end_row=number_of_samples, run_tasks=run_tasks,
+                                                   number_of_workers=number_of_workers,
+                                                   evaluation_cost=evaluation_cost, is_stopped=is_stopped)
+            is_done = __is_target_reached(model=model, number_of_target_solutions=len(target_solutions))
+            if evaluated_row < number_of_samples:
+                # The evaluations were stopped, the restarts only start from the evaluated guesses
+                is_complete = is_done
+                number_of_samples = evaluated_row
+            if not is_complete:
+                break
+
+            values = eval_results[:number_of_samples]
+            number_of_failed_evaluations += int(numpy.count_nonzero(values == float("inf")))
+            round_indices = numpy.argsort(values, kind="stable")[
+                            :math.ceil(MLSL_REDUCED_SAMPLE_FRACTION * number_of_samples)]
+            round_indices = round_indices[numpy.isfinite(values[round_indices])]
+            reduced_values = numpy.concatenate((reduced_values, values[round_indices]))
+            reduced_guesses = numpy.concatenate((reduced_guesses, parameter_guesses[round_indices]))
+            reduced_sample_indices = numpy.concatenate((reduced_sample_indices, chunk_start + round_indices))
+
+            scaled_guesses = reduced_guesses / parameter_scales
+            nearest_distances = __nearest_better_distances(values=reduced_values,
+                                                           scaled_guesses=scaled_guesses,
+                                                           nearest_distances=nearest_distances)
+            start_indices = __mlsl_start_indices(
+                values=reduced_values,
+                scaled_guesses=scaled_guesses,
+                nearest_distances=nearest_distances,
+                is_started=numpy.isin(reduced_sample_indices, restart_sample_indices),
+                radius=critical_distance(number_of_parameters=number_of_parameters,
+                                         number_of_samples=chunk_start + number_of_samples),
+                scaled_minima=scaled_minima)[:model.number_of_restarts - len(restart_sample_indices)]
+            number_of_started_restarts = len(restart_sample_indices)
+            start_restarts(guesses=reduced_guesses[start_indices], sample_indices=reduced_sample_indices[start_indices])
+            for _ in range(len(restart_sample_indices) - number_of_started_restarts):
+                solve_index = __take_completed(completed, deadline=deadline)
+                if solve_index is None:
+                    # The time budget ran out
+                    return __mlsl_evaluations(reduced_values=reduced_values,
+                                              reduced_guesses=reduced_guesses,
+                                              reduced_sample_indices=reduced_sample_indices,
+                                              restart_sample_indices=restart_sample_indices,
+                                              is_complete=False)
+                finished_solve_indices.append(solve_index)
+                restart_row = restart_results[solve_index]
+                if restart_row[number_of_parameters + 1] != 0.0:
+                    scaled_optimum = restart_row[:number_of_parameters] / parameter_scales
+                    if not (((scaled_minima - scaled_optimum) ** 2).sum(axis=1) <= MLSL_MINIMUM_DISTANCE ** 2).any():
+                        scaled_minima = numpy.concatenate((scaled_minima, scaled_optimum.reshape(1, -1)))
+                    if model.target_obj_value is not None and restart_row[number_of_parameters] <= model.target_obj_value:
+                        number_of_target_solutions += 1
+
+            number_of_minima = len(scaled_minima)
+            estimated_minima = __mlsl_estimated_minima(number_of_minima=number_of_minima,
+                                                       number_of_restarts=len(finished_solve_indices))
+            if model.debug is True:
+                print(f"MLSL round {round_index + 1}: {len(finished_solve_indices)} restarts found {number_of_minima} minima, the estimated number of minima is {estimated_minima}.")
+            if is_done or __is_target_reached(model=model, number_of_target_solutions=number_of_target_solutions) or \
+                    len(restart_sample_indices) >= model.number_of_restarts or \
+                    (number_of_minima > 0 and estimated_minima < number_of_minima + MLSL_STOP_MARGIN):
+                break
+    finally:
+        for solve_index in finished_solve_indices:
+            completed.put(solve_index)
+
+    if model.debug is True:
+        __debug_message_eval_functions(model=model, number_of_failed_evaluations=number_of_failed_evaluations)
+
+    if len(reduced_values) == 0:
+        raise ValueError("Evaluation functions could not locate any successful starting guesses.")
+
+    return __mlsl_evaluations(reduced_values=reduced_values,
+                              reduced_guesses=reduced_guesses,
+                              reduced_sample_indices=reduced_sample_indices,
+                              restart_sample_indices=restart_sample_indices,
+                              is_complete=is_complete)
+
+
+def __mlsl_evaluations(reduced_values: numpy.ndarray,
+                       reduced_guesses: numpy.ndarray,
+                       reduced_sample_indices: numpy.ndarray,
+                       restart_sample_indices: List[int],
+                       is_complete: bool) \
+        -> Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray, bool]:
+    # The restarted guesses in the order of the restarts, followed by the reduced sample as the starting guesses
+    rows = numpy.flatnonzero(numpy.isin(reduced_sample_indices, restart_sample_indices))
+    rows = rows[numpy.argsort([restart_sample_indices.index(sample_index) for sample_index in
+                               reduced_sample_indices[rows].tolist()], kind="stable")]
+    return reduced_values[rows], reduced_guesses[rows], reduced_sample_indices[rows], reduced_guesses, \
+           reduced_values, is_complete
+
+
+def __create_sampling(model: ProblemModel, seed: Union[None, int]) -> Sampling:
+    start_guess_sampling = model.start_guess_sampling
+    if start_guess_sampling is None or type(start_guess_sampling) is list:
+        # Generate samples using the DefaultSampling object
+        sampling = DefaultSampling(parameter_lower_bounds=model.par_lower_limit,
+                                   parameter_upper_bounds=model.par_upper_limit,
+                                   sample_properties=start_guess_sampling,
+                                   seed=seed)
+    elif isinstance(start_guess_sampling, Sampling):
+        if seed is not None and model.debug is True:
+            print(f"Warning: Seed value {seed} ignored due to user sampling override")
+        # User provided Sampling instance
+        sampling = start_guess_sampling
+    else:
+        raise ValueError(
+            f"Provided parameter start_guess_sampling was not of expected type. Expected None, List[Distribution] or Sampling.")
+
+    if model.sample_in_workers and not sampling.supports_indexed_samples:
+        raise ValueError(
+            f"Provided sampling {type(sampling).__name__} does not implement generate_indexed_samples, which is required for sample_in_workers.")
+
+    # The optima of earlier solves and the reused guesses to evaluate again are evaluated before the samples
+    points = [numpy.empty(shape=(0, model.number_of_parameters), dtype=numpy.float64)]
+    warm_start_store = __create_warm_start_store(model=model)
+    if warm_start_store is not None:
+        optima, _ = warm_start_store.load()
+        if len(optima) > 0:
+            # A stream of its own, the indexed samples of DefaultSampling use spawn keys of length one
+            generator = numpy.random.default_rng(numpy.random.SeedSequence(entropy=seed, spawn_key=(0, 0)))
+            points.append(jittered_points(optima=optima,
+                                          par_lower_limit=numpy.array(model.par_lower_limit, dtype=numpy.float64),
+                                          par_upper_limit=numpy.array(model.par_upper_limit, dtype=numpy.float64),
+                                          generator=generator))
+    previous_evaluations = __previous_evaluations(model=model)
+    if previous_evaluations is not None:
+        points.append(previous_evaluations.rescored_guesses)
+    points = numpy.concatenate(points)
+    if len(points) > 0:
+        sampling = WarmStartSampling(sampling=sampling, points=points[:model.number_of_evaluations])
+
+    return sampling
+
+
+def __create_warm_start_store(model: ProblemModel) -> Optional[WarmStartStore]:
+    if model.warm_start_dir is None:
+        return None
+    return WarmStartStore(directory=model.warm_start_dir,
+                          key=warm_start_key(obj_func=model.obj_func,
+                                             number_of_parameters=model.number_of_parameters,
+                                             tag=model.warm_start_tag))
+
+
+def __record_warm_start(model: ProblemModel, warm_start_store: WarmStartStore, restart_rows: List[numpy.ndarray]):
+    # Only the feasible optima are used to start later solves
+    results = __create_results(model=model, restart_rows=numpy.stack(restart_rows))
+    warm_start_store.record(parameters=results.parameters[results.converged],
+                            obj_values=results.obj_values[results.converged])
+
+
+def __run_session_tasks(backend: Backend,
+                        run_id: str,
+                        run_data: bytes,
+                        function: Callable,
+                        iterable: Iterable[tuple]) -> list:
+    # Backend.run_tasks counterpart that passes the data of the run along with each task
+    return backend.run_tasks(run_session_task, [(run_id, run_data, function, arguments) for arguments in iterable])
+
+
+def __submit_session_tasks(backend: Backend,
+                           run_id: str,
+                           run_data: bytes,
+                           completed: SimpleQueue,
+                           function: Callable,
+                           iterable: Iterable[tuple]) -> list:
+    # Backend.submit_tasks counterpart that passes the data of the run along with each task
+    return backend.submit_tasks(completed, run_session_task,
+                                [(run_id, run_data, function, arguments) for arguments in iterable])
+
+
+def __remote_tasks(run_id: str,
+                   run_data: bytes,
+                   buffers: dict,
+                   function: Callable,
+                   iterable: Iterable[tuple]) -> List[tuple]:
+    # The arguments of run_remote_task for each task, with the rows of the buffers that the task reads
+    tasks = []
+    for arguments in iterable:
+        read_rows, _ = task_buffer_rows(function=function, arguments=arguments)
+        inputs = [(name, start_row, buffers[name][start_row:end_row]) for name, start_row, end_row in read_rows]
+        tasks.append((run_id, run_data, function, arguments, inputs))
+    return tasks
+
+
+def _store_remote_outputs(buffers: dict, result: tuple):
+    # Writes the rows returned by run_remote_task to the buffers of this process and returns the task's return value
+    return_value, outputs = result
+    for name, start_row, rows in outputs:
+        buffers[name][start_row:start_row + len(rows)] = rows
+    return return_value
+
+
+class _RemoteCompletedQueue:
+    """
+    Passed as the completed queue of Backend.submit_tasks for remote tasks, stores the rows that each task returns in the
+    buffers of this process before passing on the return value of the task.
+    """
+
+    def __init__(self, buffers: dict, completed: SimpleQueue):
+        self.__buffers = buffers
+        self.__completed = completed
+
+    def put(self, result):
+        if not isinstance(result, BaseException):
+            result = _store_remote_outputs(buffers=self.__buffers, result=result)
+        self.__completed.put(result)
+
+
+def __run_remote_tasks(backend: Backend,
+                       run_id: str,
+                       run_data: bytes,
+                       buffers: dict,
+                       function: Callable,
+                       iterable: Iterable[tuple]) -> list:
+    # Backend.run_tasks counterpart for tasks that run where the buffers of this process are not shared
+    results = backend.run_tasks(run_remote_task, __remote_tasks(run_id, run_data, buffers, function, iterable))
+    return [_store_remote_outputs(buffers=buffers, result=result) for result in results]
+
+
+def __submit_remote_tasks(backend: Backend,
+                          run_id: str,
+                          run_data: bytes,
+                          buffers: dict,
+                          completed: SimpleQueue,
+                          function: Callable,
+                          iterable: Iterable[tuple]) -> list:
+    # Backend.submit_tasks counterpart for tasks that run where the buffers of this process are not shared
+    return backend.submit_tasks(_RemoteCompletedQueue(buffers=buffers, completed=completed),
+                                run_remote_task,
+                                __remote_tasks(run_id, run_data, buffers, function, iterable))
+
+
+def __task_runners(backend: Backend,
+                   run_id: str,
+                   run_data: Optional[bytes],
+                   remote_run_data: Optional[bytes],
+                   buffers: dict) -> Tuple[Callable, Callable]:
+    # The run_tasks and submit_tasks callables for the backend, tasks in other processes receive the data of the run
+    if backend.is_in_process:
+        return backend.run_tasks, backend.submit_tasks
+    if backend.is_remote:
+        return partial(__run_remote_tasks, backend, run_id, remote_run_data, buffers), \
+               partial(__submit_remote_tasks, backend, run_id, remote_run_data, buffers)
+    return partial(__run_session_tasks, backend, run_id, run_data), partial(__submit_session_tasks, backend, run_id,
+                                                                            run_data)
+
+
+def __take_completed(completed: SimpleQueue, deadline: Optional[float] = None):
+    # Returns None if the deadline passes before a result is available
+    try:
+        if deadline is None:
+            result = completed.get()
+        else:
+            result = completed.get(timeout=max(0.0, deadline - time.monotonic()))
+    except Empty:
+        return None
+    if isinstance(result, partial):
+        # Tasks that run when taken are not started after the deadline
+        if __is_expired(deadline):
+            return None
+        result = result()
+    if isinstance(result, BaseException):
+        raise result
+    return result
+
+
+def __start_restarts(guesses: numpy.ndarray,
+                     sample_indices: numpy.ndarray,
+                     parameter_guesses: numpy.ndarray,
+                     first_restart_row: int,
+                     restart_sample_indices: List[int],
+                     submitted_tasks: list,
+                     submit_tasks: Callable[[Callable, Iterable[tuple]], list],
+                     restart_results: numpy.ndarray,
+                     completed: SimpleQueue,
+                     checkpoint: Optional[Checkpoint] = None,
+                     restart_budget: tuple = ()):
+    """
+    Submits pysolnp restarts for the guesses that have not been restarted yet.
+    Restart i starts from row first_restart_row + i of parameter_guesses, these rows are not used by the evaluations.
+    :param restart_sample_indices: The sample index of the guess of each restart so far, the new restarts are appended
+    :param submitted_tasks: The submitted tasks to cancel at the deadline, the new tasks are appended
+    :param checkpoint: [Optional, default None] Stores the started restarts, restarts that it holds the result of are
+    not run again and their solve index is put in completed right away
+    :param restart_budget: [Optional, default ()] The max_major_iter argument of pysolnp_solve, see __racing_budget
+    """
+    tasks = []
+    for guess, sample_index in zip(guesses, sample_indices.tolist()):
+        if sample_index in restart_sample_indices:
+            continue
+        solve_index = len(restart_sample_indices)
+        restart_sample_indices.append(sample_index)
+        finished_restart = checkpoint.finished_restart(sample_index) if checkpoint is not None else None
+        if finished_restart is not None:
+            restart_results[solve_index] = finished_restart
+            completed.put(solve_index)
+            continue
+        parameter_guesses[first_restart_row + solve_index] = guess
+        tasks.append((solve_index, first_restart_row + solve_index) + restart_budget)
+
+    if checkpoint is not None:
+        checkpoint.add_started_restarts(sample_indices=sample_indices, guesses=guesses)
+    submitted_tasks.extend(submit_tasks(pysolnp_solve, tasks))
+
+
+def __racing_budget(model: ProblemModel, round_index: int) -> Tuple[int]:
+    # The max_major_iter of a racing round, each round doubles it until the last round runs with pysolnp_max_major_iter.
+    # All rounds run with pysolnp_tolerance, looser tolerances in the first rounds rank the restarts worse.
+    return max(1, model.max_major_iter // 2 ** (model.racing_rounds - 1 - round_index)),
+
+
+def __finished_restarts(completed: SimpleQueue,
+                        restart_results: numpy.ndarray,
+                        number_of_restarts: int,
+                        deadline: Optional[float] = None) -> Iterator[Tuple[int, numpy.ndarray]]:
+    # (restart index, restart_results row) of each restart as it finishes, until the deadline passes
+    for _ in range(number_of_restarts):
+        solve_index = __take_completed(completed, deadline=deadline)
+        if solve_index is None:
+            # The time budget ran out
+            return
+        # Copied out of the buffer, which is reused or released after the run
+        yield solve_index, restart_results[solve_index].copy()
+
+
+def __race_restarts(model: ProblemModel,
+                    completed: SimpleQueue,
+                    restart_results: numpy.ndarray,
+                    parameter_guesses: numpy.ndarray,
+                    first_restart_row: int,
+                    number_of_restarts: int,
+                    submit_restarts: Callable[[Iterable[tuple]], None],
+                    deadline: Optional[float] = None) -> Iterator[Tuple[int, numpy.ndarray]]:
+    """
+    Races the restarts in model.racing_rounds rounds of successive halving. The restarts start with the budget of the
+    first round, see __racing_budget. Once all the restarts of a round finish they are ranked, feasible optimums first
+    and then by objective value. The best RACING_KEEP_FRACTION of them, and at least racing_survivors, continue from
+    their optimums with the budget of the next round, the others are finished.
+    When the deadline passes, the unfinished restarts that finished a round are finished with their last optimum.
+    :param first_restart_row: The row of parameter_guesses that restart 0 starts from, see __start_restarts
+    :param submit_restarts: Submits pysolnp_solve tasks for the arguments
+    :return: (restart index, restart_results row) of each restart as it is finished
+    """
+    number_of_parameters = model.number_of_parameters
+    restart_indices = list(range(number_of_restarts))
+    last_rows = {}
+    for round_index in range(model.racing_rounds):
+        is_last_round = round_index == model.racing_rounds - 1
+        finished_indices = set()
+        for _ in range(len(restart_indices)):
+            solve_index = __take_completed(completed, deadline=deadline)
+            if solve_index is None:
+                # The time budget ran out, the restarts that finished the last round were already reported
+                yield from ((restart_index, last_rows[restart_index]) for restart_index in restart_indices if
+                            restart_index in last_rows and not (is_last_round and restart_index in finished_indices))
+                return
+            # Copied out of the buffer, which the next round of the restart writes to
+            last_rows[solve_index] = restart_results[solve_index].copy()
+            finished_indices.add(solve_index)
+            if is_last_round:
+                yield solve_index, last_rows[solve_index]
+        if is_last_round:
+            return
+
+        ranked_indices = sorted(restart_indices, key=lambda restart_index: (
+            last_rows[restart_index][number_of_parameters + 1] == 0.0,
+            numpy.nan_to_num(last_rows[restart_index][number_of_parameters], nan=numpy.inf)))
+        number_of_survivors = max(model.racing_survivors, math.ceil(RACING_KEEP_FRACTION * len(restart_indices)))
+        restart_indices = ranked_indices[:number_of_survivors]
+        for restart_index in ranked_indices[number_of_survivors:]:
+            yield restart_index, last_rows[restart_index]
+
+        tasks = []
+        for restart_index in restart_indices:
+            parameter_guesses[first_restart_row + restart_index] = last_rows[restart_index][:number_of_parameters]
+            tasks.append((restart_index, first_restart_row + restart_index) +
+                         __racing_budget(model=model, round_index=round_index + 1))
+        submit_restarts(tasks)
+
+
+def __start_early_restarts(values: numpy.ndarray,
+                           guesses: numpy.ndarray,
+                           sample_indices: numpy.ndarray,
+                           start_restarts: Callable):
+    # Failed evaluations are not worth a restart before all the guesses are evaluated
+    is_finite = numpy.isfinite(values)
+    start_restarts(guesses=guesses[is_finite], sample_indices=sample_indices[is_finite])
+
+
+def __restart_result_size(model: ProblemModel) -> int:
+    # Each restart stores its optimum, the information of RESTART_INFO_COLUMNS and its constraint function values
+    restart_result_size = model.number_of_parameters + RESTART_INFO_COLUMNS
+    if model.has_eq_bounds:
+        restart_result_size += len(model.eq_values)
+    if model.has_ineq_bounds:
+        restart_result_size += len(model.ineq_lower_bounds)
+    return restart_result_size
+
+
+def __create_results(model: ProblemModel,
+                     restart_rows: numpy.ndarray,
+                     starting_guesses: Optional[numpy.ndarray] = None,
+                     starting_guess_scores: Optional[numpy.ndarray] = None,
+                     is_partial: bool = False,
+                     has_all_guesses: bool = True) -> Results:
+    """
+    :param restart_rows: A (number_of_results, restart result size) array of restart_results rows, see pysolnp_solve for
+    the layout of a row
+    """
+    number_of_parameters = model.number_of_parameters
+    info_end = number_of_parameters + RESTART_INFO_COLUMNS
+    eq_end = info_end + (len(model.eq_values) if model.has_eq_bounds else 0)
+    # Only the Results with starting guesses can be reused by a later solve
+    evaluation_settings = None
+    if starting_guesses is None:
+        starting_guesses = numpy.empty(shape=(0, number_of_parameters), dtype=numpy.float64)
+        starting_guess_scores = numpy.empty(shape=0, dtype=numpy.float64)
+    else:
+        evaluation_settings = __evaluation_settings(model=model)
+    return Results(parameters=restart_rows[:, :number_of_parameters],
+                   obj_values=restart_rows[:, number_of_parameters],
+                   converged=restart_rows[:, number_of_parameters + 1] != 0.0,
+                   starting_guess_array=starting_guesses,
+                   starting_guess_scores=starting_guess_scores,
+                   pysolnp_converged=restart_rows[:, number_of_parameters + 2] != 0.0,
+                   eq_func_values=restart_rows[:, info_end:eq_end] if model.has_eq_bounds else None,
+                   ineq_func_values=restart_rows[:, eq_end:] if model.has_ineq_bounds else None,
+                   is_partial=is_partial,
+                   evaluation_settings=evaluation_settings,
+                   has_all_guesses=has_all_guesses)
+
+
+def __evaluation_settings(model: ProblemModel) -> EvaluationSettings:
+    return EvaluationSettings(
+        par_lower_limit=numpy.array(model.par_lower_limit, dtype=numpy.float64),
+        par_upper_limit=numpy.array(model.par_upper_limit, dtype=numpy.float64),
+        eq_values=numpy.array(model.eq_values, dtype=numpy.float64) if model.has_eq_bounds else None,
+        ineq_lower_bounds=numpy.array(model.ineq_lower_bounds, dtype=numpy.float64) if model.has_ineq_bounds else None,
+        ineq_upper_bounds=numpy.array(model.ineq_upper_bounds, dtype=numpy.float64) if model.has_ineq_bounds else None,
+        evaluation_type=model.evaluation_type)
+
+
+def __restart_result(model: ProblemModel, restart_row: numpy.ndarray) -> Result:
+    # Each Result represents a solution to the restart (might have not converged)
+    return __create_results(model=model, restart_rows=restart_row.reshape(1, -1))[0]
+
+
+def __iterate_with_buffers(model: ProblemModel,
+                           sampling: Sampling,
+                           parameter_guesses: numpy.ndarray,
+                           eval_results: numpy.ndarray,
+                           restart_results: numpy.ndarray,
+                           run_tasks: Callable[[Callable, Iterable[tuple]], list],
+                           submit_tasks: Callable[[SimpleQueue, Callable, Iterable[tuple]], list],
+                           cancel_tasks: Callable[[list], None],
+                           number_of_workers: int,
+                           completed: SimpleQueue,
+                           deadline: Optional[float] = None,
+                           checkpoint: Optional[Checkpoint] = None,
+                           warm_start_store: Optional[WarmStartStore] = None) -> Iterator[tuple]:
+    """
+    Evaluates the starting guesses and starts the restarts. Then yields the starting guesses to report in the Results
+    and their values, the restart indices for the best guesses in order, the number of restarts and whether all the evaluations were
+    done, followed by (restart index, restart_results row) for each restart as it finishes.
+    When the deadline passes, the remaining evaluations and restarts are cancelled and the iteration ends early. The same
+    happens once min_feasible_solutions restarts converge to at most the target objective value.
+    :param completed: The queue that the restart tasks put their results in, see Backend.submit_tasks
+    :param cancel_tasks: Cancels the submitted restart tasks, see Backend.cancel_tasks
+    :param deadline: [Optional, default None] The time.monotonic() time at which the solve stops
+    :param checkpoint: [Optional, default None] Stores the progress of the solve, and holds the progress of an earlier
+    solve of the same problem when resuming
+    :param warm_start_store: [Optional, default None] Records the feasible optima of the finished restarts
+    """
+    # The last rows of parameter_guesses hold the starting points of the restarts
+    first_restart_row = len(parameter_guesses) - len(restart_results)
+    restart_sample_indices = []
+    submitted_tasks = []
+    start_restarts = partial(__start_restarts,
+                             parameter_guesses=parameter_guesses,
+                             first_restart_row=first_restart_row,
+                             restart_sample_indices=restart_sample_indices,
+                             submitted_tasks=submitted_tasks,
+                             submit_tasks=partial(submit_tasks, completed),
+                             restart_results=restart_results,
+                             completed=completed,
+                             checkpoint=checkpoint,
+                             restart_budget=() if model.racing_survivors is None else __racing_budget(model=model,
+                                                                                                     round_index=0))
+
+    start_early_restarts = None
+    if model.early_restart_index is not None:
+        start_early_restarts = partial(__start_early_restarts, start_restarts=start_restarts)
+
+    number_of_results = 0
+    number_of_target_solutions = 0
+    finished_restart_rows = []
+    try:
+        if checkpoint is not None:
+            # The restarts that an earlier solve started are started again in the same order, so that they get the same
+            # restart indices. The finished ones are taken from the checkpoint.
+            started_sample_indices, started_guesses = checkpoint.started_restarts
+            start_restarts(guesses=started_guesses, sample_indices=started_sample_indices)
+
+        if model.mlsl_rounds is not None:
+            best_values, best_guesses, best_sample_indices, starting_guesses, starting_guess_scores, is_complete = \
+                __evaluate_mlsl_rounds(
+                    model=model,
+                    sampling=sampling,
+                    parameter_guesses=parameter_guesses[:len(eval_results)],
+                    eval_results=eval_results,
+                    restart_results=restart_results,
+                    run_tasks=run_tasks,
+                    start_restarts=start_restarts,
+                    restart_sample_indices=restart_sample_indices,
+                    completed=completed,
+                    number_of_workers=number_of_workers,
+                    deadline=deadline)
+        else:
+            best_values, best_guesses, best_sample_indices, starting_guesses, starting_guess_scores, is_complete = \
+                __evaluate_starting_guesses(
+                    model=model,
+                    sampling=sampling,
+                    parameter_guesses=parameter_guesses[:len(eval_results)],
+                    eval_results=eval_results,
+                    run_tasks=run_tasks,
+                    number_of_workers=number_of_workers,
+                    start_early_restarts=start_early_restarts,
+                    deadline=deadline,
+                    checkpoint=checkpoint,
+                    previous_evaluations=__previous_evaluations(model=model))
+
+        # Restarts for the best guesses that were not restarted early, the optimums are stored in restart_results
+        if is_complete and not __is_expired(deadline):
+            start_restarts(guesses=best_guesses, sample_indices=best_sample_indices)
+        yield starting_guesses, starting_guess_scores, [restart_sample_indices.index(sample_index) for sample_index in
+                                 best_sample_indices.tolist() if sample_index in restart_sample_indices], \
+              len(restart_sample_indices), is_complete
+
+        if model.racing_survivors is None:
+            finished_restarts = __finished_restarts(completed=completed,
+                                                    restart_results=restart_results,
+                                                    number_of_restarts=len(restart_sample_indices),
+                                                    deadline=deadline)
+        else:
+            finished_restarts = __race_restarts(model=model,
+                                                completed=completed,
+                                                restart_results=restart_results,
+                                                parameter_guesses=parameter_guesses,
+                                                first_restart_row=first_restart_row,
+                                                number_of_restarts=len(restart_sample_indices),
+                                                submit_restarts=lambda tasks: submitted_tasks.extend(
+                                                    submit_tasks(completed, pysolnp_solve, tasks)),
+                                                deadline=deadline)
+        for solve_index, restart_row in finished_restarts:
+            if checkpoint is not None and checkpoint.finished_restart(restart_sample_indices[solve_index]) is None:
+                checkpoint.add_finished_restart(sample_index=restart_sample_indices[solve_index], restart_row=restart_row)
+            number_of_results += 1
+            finished_restart_rows.append(restart_row)
+            number_of_target_solutions += __count_target_solutions(
+                model=model, results=__create_results(model=model, restart_rows=restart_row.reshape(1, -1)))
+            yield solve_index, restart_row
+            if __is_target_reached(model=model, number_of_target_solutions=number_of_target_solutions):
+                return
+    finally:
+        if number_of_results < len(restart_sample_indices) or model.racing_survivors is not None:
+            # Stopped by the deadline, the target objective value, an error or by closing the iteration, the remaining
+            # restarts are not needed. Raced restarts that were finished with their last optimum might still run.
+            cancel_tasks(submitted_tasks)
+        if warm_start_store is not None and len(finished_restart_rows) > 0:
+            __record_warm_start(model=model, warm_start_store=warm_start_store, restart_rows=finished_restart_rows)
+
+
+def __create_checkpoint(model: ProblemModel, sampling: Sampling) -> Optional[Checkpoint]:
+    # Created before the sampling generates any samples, its state is part of the fingerprint
+    if model.checkpoint_dir is None:
+        return None
+    return Checkpoint(directory=model.checkpoint_dir,
+                      fingerprint=problem_fingerprint(model=model,
+                                                      sampling=sampling,
+                                                      restart_result_size=__restart_result_size(model=model)),
+                      resume=model.resume,
+                      number_of_parameters=model.number_of_parameters)
+
+
+def __iterate_solve(model: ProblemModel,
+                    sampling: Sampling,
+                    backend: Backend,
+                    restart_backend: Backend,
+                    completed: SimpleQueue,
+                    deadline: Optional[float] = None) -> Iterator[tuple]:
+    checkpoint = __create_checkpoint(model=model, sampling=sampling)
+
+    # Early restarts can be replaced by the final best guesses, so up to twice as many restarts are run
+    number_of_restart_rows = model.number_of_restarts
+    if model.early_restart_index is not None and model.early_restart_index < model.number_of_evaluations:
+        number_of_restart_rows = 2 * model.number_of_restarts
+
+    # Without a chunk size all guesses are generated and evaluated at once, MLSL evaluates them in rounds
+    if model.mlsl_rounds is not None:
+        block_size = model.mlsl_round_size
+    elif model.evaluation_chunk_size is None:
+        block_size = model.number_of_evaluations
+    else:
+        block_size = min(model.evaluation_chunk_size, model.number_of_evaluations)
+
+    # The rows after the evaluated guesses hold the starting points of the restarts
+    buffer_shapes = [(block_size + number_of_restart_rows, model.number_of_parameters),  # Starting guesses
+                     (block_size,),  # Results from the eval function
+                     (number_of_restart_rows, __restart_result_size(model=model))]  # Results from pysolnp restarts
+
+    # The resources that differ between runs, see initialize_worker_process_resources
+    run_resources = {
+        "par_lower_limit": model.par_lower_limit,
+        "par_upper_limit": model.par_upper_limit,
+        "eq_values": model.eq_values if model.has_eq_bounds else None,
+        "ineq_lower_bounds": model.ineq_lower_bounds if model.has_ineq_bounds else None,
+        "ineq_upper_bounds": model.ineq_upper_bounds if model.has_ineq_bounds else None,
+        "pysolnp_delta": model.delta,
+        "pysolnp_rho": model.rho,
+        "pysolnp_max_major_iter": model.max_major_iter,
+        "pysolnp_max_minor_iter": model.max_minor_iter,
+        "pysolnp_tolerance": model.tolerance,
+        "pysolnp_debug": model.debug,
+        "evaluation_type": model.evaluation_type.value,
+        "number_of_parameters": model.number_of_parameters,
+        "sampling": sampling if model.sample_in_workers else None
+    }
+
+    problem_functions = {
+        "obj_func": model.obj_func,
+        "eq_func": model.eq_func if model.has_eq_bounds else None,
+        "ineq_func": model.ineq_func if model.has_ineq_bounds else None,
+        "obj_func_batch": model.obj_func_batch,
+        "eq_func_batch": model.eq_func_batch if model.has_eq_bounds else None,
+        "ineq_func_batch": model.ineq_func_batch if model.has_ineq_bounds else None
+    }
+
+    backends = [backend, restart_backend]
+    shared_arrays = []
+    if model.memmap_dir is not None:
+        # The guesses and results are kept in files that every process maps, the files are kept after the run
+        os.makedirs(model.memmap_dir, exist_ok=True)
+        shared_arrays = [MemmapArray(path=os.path.join(model.memmap_dir, f"{name}.npy"), shape=shape) for name, shape in
+                         zip(MEMMAP_FILE_NAMES, buffer_shapes)]
+        buffers = [shared_array.array for shared_array in shared_arrays]
+    elif all(task_backend.is_in_process or task_backend.is_remote for task_backend in backends):
+        buffers = [numpy.zeros(shape=shape, dtype=numpy.float64) for shape in buffer_shapes]
+    else:
+        # The guesses and results are kept in shared memory, each task reads and writes a separate range of rows
+        shared_arrays = [SharedArray(shape=shape) for shape in buffer_shapes]
+        buffers = [shared_array.array for shared_array in shared_arrays]
+    parameter_guesses, eval_results, restart_results = buffers
+    buffers_by_name = {"parameter_guesses": parameter_guesses,
+                       "eval_results": eval_results,
+                       "restart_results": restart_results}
+
+    try:
+        run_id = uuid.uuid4().hex
+        run_data = None
+        if len(shared_arrays) > 0:
+            run_data_resources = dict(run_resources,
+                                      parameter_guesses=shared_arrays[0],
+                                      eval_results=shared_arrays[1],
+                                      restart_results=shared_arrays[2])
+            if not all(task_backend.registers_problem_functions for task_backend in backends if
+                       not task_backend.is_in_process and not task_backend.is_remote):
+                run_data_resources["session_functions"] = problem_functions
+            run_data = pickle.dumps(run_data_resources)
+
+        remote_run_data = None
+        if any(not task_backend.is_in_process and task_backend.is_remote for task_backend in backends):
+            # Remote workers allocate their own buffers and import the problem functions by name
+            remote_run_data = pickle.dumps(dict(
+                run_resources,
+                buffer_shapes={name: buffer.shape for name, buffer in buffers_by_name.items()},
+                session_functions={name: function_reference(function) for name, function in
+                                   problem_functions.items()}))
+
+        if any(task_backend.is_in_process for task_backend in backends):
+            initialize_worker_process_resources(parameter_guesses=parameter_guesses,
+                                                eval_results=eval_results,
+                                                restart_results=restart_results,
+                                                **problem_functions,
+                                                **run_resources)
+
+        run_tasks, _ = __task_runners(backend=backend,
+                                      run_id=run_id,
+                                      run_data=run_data,
+                                      remote_run_data=remote_run_data,
+                                      buffers=buffers_by_name)
+        _, submit_tasks = __task_runners(backend=restart_backend,
+                                         run_id=run_id,
+                                         run_data=run_data,
+                                         remote_run_data=remote_run_data,
+                                         buffers=buffers_by_name)
+        yield from __iterate_with_buffers(model=model,
+                                          sampling=sampling,
+                                          parameter_guesses=parameter_guesses,
+                                          eval_results=eval_results,
+                                          restart_results=restart_results,
+                                          run_tasks=run_tasks,
+                                          submit_tasks=submit_tasks,
+                                          cancel_tasks=restart_backend.cancel_tasks,
+                                          number_of_workers=backend.number_of_workers,
+                                          completed=completed,
+                                          deadline=deadline,
+                                          checkpoint=checkpoint,
+                                          warm_start_store=__create_warm_start_store(model=model))
+    finally:
+        for shared_array in shared_arrays:
+            shared_array.release()
+
+
+class _AsyncCompletedQueue:
+    """
+    The completed queue of an asyncio solve, which lets the event loop wait for the next restart result without
+    blocking a thread.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.__queue = SimpleQueue()
+        self.__loop = loop
+        self.__available = asyncio.Semaphore(0)
+
+    def put(self, result):
+        self.__queue.put(result)
+        try:
+            self.__loop.call_soon_threadsafe(self.__available.release)
+        except RuntimeError:
+            # The event loop was closed, nobody is waiting for the result anymore
+            pass
+
+    def get(self, block: bool = True, timeout: Optional[float] = None):
+        return self.__queue.get(block, timeout)
+
+    async def wait(self):
+        await self.__available.acquire()
+
+
+def __iterate_results(model: ProblemModel, iterator: Iterator[tuple]) -> Iterator[Result]:
+    try:
+        next(iterator)
+        for _, restart_row in iterator:
+            yield __restart_result(model=model, restart_row=restart_row)
+    finally:
+        iterator.close()
+
+
+def __ordered_results(model: ProblemModel, summary: tuple, restart_rows_by_index: dict) -> Results:
+    starting_guesses, starting_guess_scores, best_restart_indices, number_of_restarts, is_complete = summary
+    # The restarts of the best guesses come first, followed by early restarts of guesses that were replaced later
+    restart_order = best_restart_indices + [restart_index for restart_index in sorted(restart_rows_by_index) if
+                                            restart_index not in best_restart_indices]
+    # Restarts that were cancelled have no result
+    restart_rows = numpy.empty(shape=(0, __restart_result_size(model=model)), dtype=numpy.float64)
+    if len(restart_rows_by_index) > 0:
+        restart_rows = numpy.stack([restart_rows_by_index[restart_index] for restart_index in restart_order if
+                                    restart_index in restart_rows_by_index])
+    restarts = __create_results(model=model, restart_rows=restart_rows)
+    # Runs that stop early at the target objective value are not partial
+    is_partial = (not is_complete or len(restarts) < number_of_restarts) and \
+                 not __is_target_reached(model=model,
+                                         number_of_target_solutions=__count_target_solutions(model=model,
+                                                                                             results=restarts))
+
+    # pysolnp might have not converged for some solution, if no converging solutions exist, print an warning message.
+    if not restarts.converged.any():
+        if is_partial:
+            print(f"Not able to find any feasible solution in the {len(restarts)} restarts finished within the time budget of {model.time_budget} seconds.")
+        else:
+            print(f"Not able to find any feasible solution in {len(restarts)} restarts.")
+
+    return __create_results(model=model,
+                            restart_rows=restart_rows,
+                            starting_guesses=starting_guesses,
+                            starting_guess_scores=starting_guess_scores,
+                            is_partial=is_partial,
+                            has_all_guesses=__has_all_guesses(model=model))
+
+
+def __has_all_guesses(model: ProblemModel) -> bool:
+    # Streamed evaluations only keep the best guesses, and MLSL solves only report their reduced sample
+    is_streamed = model.evaluation_chunk_size is not None and \
+                  model.evaluation_chunk_size < model.number_of_evaluations
+    return not is_streamed and model.mlsl_rounds is None
+
+
+def _solve_model(model: ProblemModel,
+                 seed: Union[None, int],
+                 backend: Optional[Backend] = None,
+                 restart_backend: Optional[Backend] = None) -> Results:
+    """
+    Solves the problem of a validated ProblemModel.
+    :param backend: [Optional, default None] A started Backend for the evaluations, if None they run in this process
+    :param restart_backend: [Optional, default None] A started Backend for the restarts, if None the same as backend
+    """
+    deadline = __deadline(model=model)
+    backend = backend or SerialBackend()
+    iterator = __iterate_solve(model=model,
+                               sampling=__create_sampling(model=model, seed=seed),
+                               backend=backend,
+                               restart_backend=restart_backend or backend,
+                               completed=SimpleQueue(),
+                               deadline=deadline)
+    try:
+        summary = next(iterator)
+        restart_rows_by_index = dict(iterator)
+    finally:
+        iterator.close()
+
+    return __ordered_results(model=model, summary=summary, restart_rows_by_index=restart_rows_by_index)
+
+
+def _solve_model_iter(model: ProblemModel,
+                      seed: Union[None, int],
+                      backend: Optional[Backend] = None,
+                      restart_backend: Optional[Backend] = None) -> Iterator[Result]:
+    """
+    Same as _solve_model, but returns an iterator over the Result of each restart in the order the restarts finish.
+    The starting guesses are evaluated when the first Result is requested, the time budget counts from this call.
+    """
+    deadline = __deadline(model=model)
+    backend = backend or SerialBackend()
+    return __iterate_results(model=model,
+                             iterator=__iterate_solve(model=model,
+                                                      sampling=__create_sampling(model=model, seed=seed),
+                                                      backend=backend,
+                                                      restart_backend=restart_backend or backend,
+                                                      completed=SimpleQueue(),
+                                                      deadline=deadline))
+
+
+async def __iterate_async(model: ProblemModel,
+                          sampling: Sampling,
+                          backend: Backend,
+                          restart_backend: Backend,
+                          executor: Optional[Executor],
+                          on_close: Optional[Callable[[], None]]) -> AsyncIterator[tuple]:
+    """
+    Runs the steps of __iterate_solve in the executor and yields the same values. The event loop waits for each restart
+    result without holding a thread, and the next step only runs when the next value is requested.
+    If the iteration is cancelled while a step runs, the step is finished before the run is cleaned up.
+    :param on_close: [Optional, default None] Called after the run is cleaned up
+    """
+    # Called in a coroutine, where get_event_loop returns the running loop before Python 3.7 added get_running_loop
+    loop = asyncio.get_running_loop() if sys.version_info >= (3, 7) else asyncio.get_event_loop()
+    completed = _AsyncCompletedQueue(loop=loop)
+    deadline = __deadline(model=model)
+    iterator = __iterate_solve(model=model,
+                               sampling=sampling,
+                               backend=backend,
+                               restart_backend=restart_backend,
+                               completed=completed,
+                               deadline=deadline)
+    # Backends in this process read the resources of the run from module globals, so only one of these runs at a time
+    lock = None
+    if backend.is_in_process or restart_backend.is_in_process:
+        lock = _IN_PROCESS_RUN_LOCKS.setdefault(loop, asyncio.Lock())
+    is_locked = False
+
+    def close():
+        iterator.close()
+        if on_close is not None:
+            on_close()
+
+    def release(_=None):
+        if is_locked:
+            lock.release()
+
+    step = None
+    try:
+        if lock is not None:
+            await lock.acquire()
+            is_locked = True
+        step = loop.run_in_executor(executor, next, iterator)
+        summary = await asyncio.shield(step)
+        yield summary
+        for _ in range(summary[3]):
+            try:
+                await asyncio.wait_for(completed.wait(),
+                                       timeout=None if deadline is None else max(0.0, deadline - time.monotonic()))
+            except asyncio.TimeoutError:
+                # The next step finds that the deadline passed and ends the iteration
+                pass
+            step = loop.run_in_executor(executor, next, iterator, None)
+            item = await asyncio.shield(step)
+            if item is None:
+                break
+            yield item
+    finally:
+        if step is not None and not step.done():
+            # The generator is still running in the executor, so it can only be closed once the step is done
+            step.add_done_callback(lambda _: loop.run_in_executor(executor, close).add_done_callback(release))
+        else:
+            try:
+                close()
+            finally:
+                release()
+
+
+async def _solve_model_async(model: ProblemModel,
+                             seed: Union[None, int],
+                             backend: Optional[Backend] = None,
+                             restart_backend: Optional[Backend] = None,
+                             executor: Optional[Executor] = None,
+                             on_close: Optional[Callable[[], None]] = None) -> Results:
+    """
+    Same as _solve_model, but runs the evaluations and the restarts from the executor without blocking the event loop.
+    :param executor: [Optional, default None] The executor to run the steps of the solve in, None uses the default
+    executor of the event loop
+    :param on_close: [Optional, default None] Called when the solve is done or cancelled, after the run is cleaned up
+    """
+    backend = backend or SerialBackend()
+    iterator = __iterate_async(model=model,
+                               sampling=__create_sampling(model=model, seed=seed),
+                               backend=backend,
+                               restart_backend=restart_backend or backend,
+                               executor=executor,
+                               on_close=on_close)
+    try:
+        summary = await iterator.__anext__()
+        restart_rows_by_index = dict([item async for item in iterator])
+    finally:
+        await iterator.aclose()
+
+    return __ordered_results(model=model, summary=summary, restart_rows_by_index=restart_rows_by_index)
+
+
+async def _solve_model_async_iter(model: ProblemModel,
+                                  seed: Union[None, int],
+                                  backend: Optional[Backend] = None,
+                                  restart_backend: Optional[Backend] = None,
+                                  executor: Optional[Executor] = None,
+                                  on_close: Optional[Callable[[], None]] = None) -> AsyncIterator[Result]:
+    """
+    Same as _solve_model_async, but yields the Result of each restart in the order the restarts finish.
+    """
+    backend = backend or SerialBackend()
+    iterator = __iterate_async(model=model,
+                               sampling=__create_sampling(model=model, seed=seed),
+                               backend=backend,
+                               restart_backend=restart_backend or backend,
+                               executor=executor,
+                               on_close=on_close)
+    try:
+        await iterator.__anext__()
+        async for _, restart_row in iterator:
+            yield __restart_result(model=model, restart_row=restart_row)
+    finally:
+        await iterator.aclose()
+
+
+def _create_backend(backend: Union[None, Backend, Executor], number_of_processes: Optional[int]) -> Backend:
+    if backend is None:
+        if number_of_processes:
+            return ProcessBackend(number_of_processes=number_of_processes)
+        return SerialBackend()
+    if number_of_processes:
+        raise ValueError("Provide either number_of_processes or backend, not both.")
+    if isinstance(backend, Backend):
+        return backend
+    if isinstance(backend, Executor):
+        return ExecutorBackend(executor=backend)
+    raise ValueError(
+        f"Provided parameter backend was not of expected type. Expected None, Backend or concurrent.futures.Executor.")
+
+
+def _create_model(obj_func: Callable,
+                  par_lower_limit: List[float],
+                  par_upper_limit: List[float],
+                  eq_func: Optional[Callable] = None,
+                  eq_values: Optional[List[float]] = None,
+                  ineq_func: Optional[Callable] = None,
+                  ineq_lower_bounds: Optional[List[float]] = None,
+                  ineq_upper_bounds: Optional[List[float]] = None,
+                  number_of_restarts: int = 1,
+                  number_of_simulations: int = 20000,
+                  number_of_processes: Optional[int] = None,
+                  start_guess_sampling: Union[None, List[Distribution], Sampling] = None,
+                  evaluation_type: Union[EvaluationType, int] = EvaluationType.OBJECTIVE_FUNC_EXCLUDE_INEQ,
+                  pysolnp_rho: float = 1.0,
+                  pysolnp_max_major_iter: int = 10,
+                  pysolnp_max_minor_iter: int = 10,
+                  pysolnp_delta: float = 1e-05,
+                  pysolnp_tolerance: float = 0.0001,
+                  debug: bool = False,
+                  evaluation_chunk_size: Optional[int] = None,
+                  sample_in_workers: bool = False,
+                  obj_func_batch: Optional[Callable] = None,
+                  eq_func_batch: Optional[Callable] = None,
+                  ineq_func_batch: Optional[Callable] = None,
+                  early_restart_fraction: Optional[float] = None,
+                  time_budget: Optional[float] = None,
+                  target_obj_value: Optional[float] = None,
+                  min_feasible_solutions: int = 1,
+                  checkpoint_dir: Union[None, str, os.PathLike] = None,
+                  resume: bool = False,
+                  memmap_dir: Union[None, str, os.PathLike] = None,
+                  warm_start_dir: Union[None, str, os.PathLike] = None,
+                  warm_start_tag: Optional[str] = None,
+                  previous_results: Optional[Results] = None,
+                  restart_clustering: bool = False,
+                  mlsl_rounds: Optional[int] = None,
+                  racing_survivors: Optional[int] = None) -> ProblemModel:
+    """
+    Creates and validates the ProblemModel of a solve, the pysolnp settings are renamed to the names of ProblemModel.
+    """
+    model = ProblemModel(obj_func=obj_func,
+                         par_lower_limit=par_lower_limit,
+                         par_upper_limit=par_upper_limit,
+                         eq_func=eq_func,
+                         eq_values=eq_values,
+                         ineq_func=ineq_func,
+                         ineq_lower_bounds=ineq_lower_bounds,
+                         ineq_upper_bounds=ineq_upper_bounds,
+                         number_of_restarts=number_of_restarts,
+                         number_of_simulations=number_of_simulations,
+                         number_of_processes=number_of_processes,
+                         start_guess_sampling=start_guess_sampling,
+                         evaluation_type=evaluation_type,
+                         rho=pysolnp_rho,
+                         max_major_iter=pysolnp_max_major_iter,
+                         max_minor_iter=pysolnp_max_minor_iter,
+                         delta=pysolnp_delta,
+                         tolerance=pysolnp_tolerance,
+                         debug=debug,
+                         evaluation_chunk_size=evaluation_chunk_size,
+                         sample_in_workers=sample_in_workers,
+                         obj_func_batch=obj_func_batch,
+                         eq_func_batch=eq_func_batch,
+                         ineq_func_batch=ineq_func_batch,
+                         early_restart_fraction=early_restart_fraction,
+                         time_budget=time_budget,
+                         target_obj_value=target_obj_value,
+                         min_feasible_solutions=min_feasible_solutions,
+                         checkpoint_dir=checkpoint_dir,
+                         resume=resume,
+                         memmap_dir=memmap_dir,
+                         warm_start_dir=warm_start_dir,
+                         warm_start_tag=warm_start_tag,
+                         previous_results=previous_results,
+                         restart_clustering=restart_clustering,
+                         mlsl_rounds=mlsl_rounds,
+                         racing_survivors=racing_survivors)
+
+    # Validate the inputs for the problem model
+    model.validate()
+
+    return model
+
+
+class Solver:
+    """
+    A session for solving the same problem repeatedly, for example with different bounds, seeds or settings.
+    The problem functions are registered once, and the backends, for example a pool of processes, are started once and
+    kept until close is called. Each solve then only sends the data for that run to the workers.
+    Use it as a context manager or call close when done.
+    """
+
+    def __init__(self,
+                 obj_func: Callable,
+                 eq_func: Optional[Callable] = None,
+                 ineq_func: Optional[Callable] = None,
+                 number_of_processes: Optional[int] = None,
+                 obj_func_batch: Optional[Callable] = None,
+                 eq_func_batch: Optional[Callable] = None,
+                 ineq_func_batch: Optional[Callable] = None,
+                 backend: Union[None, Backend, Executor] = None,
+                 restart_backend: Union[None, Backend, Executor] = None):
+        """
+        :param obj_func: The objective function, see solve
+        :param eq_func: [Optional, default None] The equality constraint function, see solve
+        :param ineq_func: [Optional, default None] The inequality constraint function, see solve
+        :param number_of_processes: [Optional, default None] The number of processes to keep, None runs in this process
+        :param obj_func_batch: [Optional, default None] Vectorized objective function, see solve
+        :param eq_func_batch: [Optional, default None] Vectorized equality constraint function, see solve
+        :param ineq_func_batch: [Optional, default None] Vectorized inequality constraint function, see solve
+        :param backend: [Optional, default None] The Backend or Executor to run the tasks with, instead of
+        number_of_processes. Backends are closed along with the Solver, Executors are not shut down.
+        :param restart_backend: [Optional, default None] The Backend or Executor to run the pysolnp restarts with, if
+        None the restarts run with the same backend as the evaluations of the starting guesses
+        """
+        if number_of_processes is not None and (type(number_of_processes) is not int or number_of_processes < 1):
+            raise ValueError(
+                "number_of_processes needs to be a positive integer value and is recommended to be greater than or equal to 2")
+
+        self.__obj_func = obj_func
+        self.__eq_func = eq_func
+        self.__ineq_func = ineq_func
+        self.__number_of_processes = number_of_processes
+        self.__obj_func_batch = obj_func_batch
+        self.__eq_func_batch = eq_func_batch
+        self.__ineq_func_batch = ineq_func_batch
+        self.__is_closed = False
+
+        self.__backend = _create_backend(backend=backend, number_of_processes=number_of_processes)
+        self.__restart_backend = self.__backend
+        if restart_backend is not None:
+            self.__restart_backend = _create_backend(backend=restart_backend, number_of_processes=None)
+
+        problem_functions = (obj_func, eq_func, ineq_func, obj_func_batch, eq_func_batch, ineq_func_batch)
+        try:
+            self.__backend.start(problem_functions)
+            if self.__restart_backend is not self.__backend:
+                self.__restart_backend.start(problem_functions)
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def number_of_processes(self) -> Optional[int]:
+        return self.__number_of_processes
+
+    @property
+    def backend(self) -> Backend:
+        return self.__backend
+
+    @property
+    def restart_backend(self) -> Backend:
+        return self.__restart_backend
+
+    @property
+    def is_closed(self) -> bool:
+        return self.__is_closed
+
+    def close(self):
+        if not self.__is_closed:
+            self.__backend.close()
+            if self.__restart_backend is not self.__backend:
+                self.__restart_backend.close()
+        self.__is_closed = True
+
+    def solve(self,
+              par_lower_limit: List[float],
+              par_upper_limit: List[float],
+              eq_values: Optional[List[float]] = None,
+              ineq_lower_bounds: Optional[List[float]] = None,
+              ineq_upper_bounds: Optional[List[float]] = None,
+              number_of_restarts: int = 1,
+              number_of_simulations: int = 20000,
+              start_guess_sampling: Union[None, List[Distribution], Sampling] = None,
+              seed: Union[None, int] = None,
+              evaluation_type: Union[EvaluationType, int] = EvaluationType.OBJECTIVE_FUNC_EXCLUDE_INEQ,
+              pysolnp_rho: float = 1.0,
+              pysolnp_max_major_iter: int = 10,
+              pysolnp_max_minor_iter: int = 10,
+              pysolnp_delta: float = 1e-05,
+              pysolnp_tolerance: float = 0.0001,
+              debug: bool = False,
+              evaluation_chunk_size: Optional[int] = None,
+              sample_in_workers: bool = False,
+              early_restart_fraction: Optional[float] = None,
+              time_budget: Optional[float] = None,
+              target_obj_value: Optional[float] = None,
+              min_feasible_solutions: int = 1,
+              checkpoint_dir: Union[None, str, os.PathLike] = None,
+              resume: bool = False,
+              memmap_dir: Union[None, str, os.PathLike] = None,
+              warm_start_dir: Union[None, str, os.PathLike] = None,
+              warm_start_tag: Optional[str] = None,
+              previous_results: Optional[Results] = None,
+              restart_clustering: bool = False,
+              mlsl_rounds: Optional[int] = None,
+              racing_survivors: Optional[int] = None) -> Results:
+        """
+        Solves the problem with the registered functions, the parameters are the same as for solve.
+        """
+        model = self.__create_model(par_lower_limit=par_lower_limit,
+                                    par_upper_limit=par_upper_limit,
+                                    eq_values=eq_values,
+                                    ineq_lower_bounds=ineq_lower_bounds,
+                                    ineq_upper_bounds=ineq_upper_bounds,
+                                    number_of_restarts=number_of_restarts,
+                                    number_of_simulations=number_of_simulations,
+                                    start_guess_sampling=start_guess_sampling,
+                                    evaluation_type=evaluation_type,
+                                    pysolnp_rho=pysolnp_rho,
+                                    pysolnp_max_major_iter=pysolnp_max_major_iter,
+                                    pysolnp_max_minor_iter=pysolnp_max_minor_iter,
+                                    pysolnp_delta=pysolnp_delta,
+                                    pysolnp_tolerance=pysolnp_tolerance,
+                                    debug=debug,
+                                    evaluation_chunk_size=evaluation_chunk_size,
+                                    sample_in_workers=sample_in_workers,
+                                    early_restart_fraction=early_restart_fraction,
+                                    time_budget=time_budget,
+                                    target_obj_value=target_obj_value,
+                                    min_feasible_solutions=min_feasible_solutions,
+                                    checkpoint_dir=checkpoint_dir,
+                                    resume=resume,
+                                    memmap_dir=memmap_dir,
+                                    warm_start_dir=warm_start_dir,
+                                    warm_start_tag=warm_start_tag,
+                                    previous_results=previous_results,
+                                    restart_clustering=restart_clustering,
+                                    mlsl_rounds=mlsl_rounds,
+                                    racing_survivors=racing_survivors)
+
+        return _solve_model(model=model,
+                            seed=seed,
+                            backend=self.__backend,
+                            restart_backend=self.__restart_backend)
+
+    def solve_iter(self,
+                   par_lower_limit: List[float],
+                   par_upper_limit: List[float],
+                   eq_values: Optional[List[float]] = None,
+                   ineq_lower_bounds: Optional[List[float]] = None,
+                   ineq_upper_bounds: Optional[List[float]] = None,
+                   number_of_restarts: int = 1,
+                   number_of_simulations: int = 20000,
+                   start_guess_sampling: Union[None, List[Distribution], Sampling] = None,
+                   seed: Union[None, int] = None,
+                   evaluation_type: Union[EvaluationType, int] = EvaluationType.OBJECTIVE_FUNC_EXCLUDE_INEQ,
+                   pysolnp_rho: float = 1.0,
+                   pysolnp_max_major_iter: int = 10,
+                   pysolnp_max_minor_iter: int = 10,
+                   pysolnp_delta: float = 1e-05,
+                   pysolnp_tolerance: float = 0.0001,
+                   debug: bool = False,
+                   evaluation_chunk_size: Optional[int] = None,
+                   sample_in_workers: bool = False,
+                   early_restart_fraction: Optional[float] = None,
+                   time_budget: Optional[float] = None,
+                   target_obj_value: Optional[float] = None,
+                   min_feasible_solutions: int = 1,
+                   checkpoint_dir: Union[None, str, os.PathLike] = None,
+                   resume: bool = False,
+                   memmap_dir: Union[None, str, os.PathLike] = None,
+                   warm_start_dir: Union[None, str, os.PathLike] = None,
+                   warm_start_tag: Optional[str] = None,
+                   previous_results: Optional[Results] = None,
+                   restart_clustering: bool = False,
+                   mlsl_rounds: Optional[int] = None,
+                   racing_survivors: Optional[int] = None) -> Iterator[Result]:
+        """
+        Same as solve, but returns an iterator over the Result of each restart in the order the restarts finish, see
+        solve_iter. The Solver must stay open until the iteration is done.
+        """
+        model = self.__create_model(par_lower_limit=par_lower_limit,
+                                    par_upper_limit=par_upper_limit,
+                                    eq_values=eq_values,
+                                    ineq_lower_bounds=ineq_lower_bounds,
+                                    ineq_upper_bounds=ineq_upper_bounds,
+                                    number_of_restarts=number_of_restarts,
+                                    number_of_simulations=number_of_simulations,
+                                    start_guess_sampling=start_guess_sampling,
+                                    evaluation_type=evaluation_type,
+                                    pysolnp_rho=pysolnp_rho,
+                                    pysolnp_max_major_iter=pysolnp_max_major_iter,
+                                    pysolnp_max_minor_iter=pysolnp_max_minor_iter,
+                                    pysolnp_delta=pysolnp_delta,
+                                    pysolnp_tolerance=pysolnp_tolerance,
+                                    debug=debug,
+                                    evaluation_chunk_size=evaluation_chunk_size,
+                                    sample_in_workers=sample_in_workers,
+                                    early_restart_fraction=early_restart_fraction,
+                                    time_budget=time_budget,
+                                    target_obj_value=target_obj_value,
+                                    min_feasible_solutions=min_feasible_solutions,
+                                    checkpoint_dir=checkpoint_dir,
+                                    resume=resume,
+                                    memmap_dir=memmap_dir,
+                                    warm_start_dir=warm_start_dir,
+                                    warm_start_tag=warm_start_tag,
+                                    previous_results=previous_results,
+                                    restart_clustering=restart_clustering,
+                                    mlsl_rounds=mlsl_rounds,
+                                    racing_survivors=racing_survivors)
+
+        return _solve_model_iter(model=model,
+                                 seed=seed,
+                                 backend=self.__backend,
+                                 restart_backend=self.__restart_backend)
+
+    async def solve_async(self,
+                          par_lower_limit: List[float],
+                          par_upper_limit: List[float],
+                          eq_values: Optional[List[float]] = None,
+                          ineq_lower_bounds: Optional[List[float]] = None,
+                          ineq_upper_bounds: Optional[List[float]] = None,
+                          number_of_restarts: int = 1,
+                          number_of_simulations: int = 20000,
+                          start_guess_sampling: Union[None, List[Distribution], Sampling] = None,
+                          seed: Union[None, int] = None,
+                          evaluation_type: Union[EvaluationType, int] = EvaluationType.OBJECTIVE_FUNC_EXCLUDE_INEQ,
+                          pysolnp_rho: float = 1.0,
+                          pysolnp_max_major_iter: int = 10,
+                          pysolnp_max_minor_iter: int = 10,
+                          pysolnp_delta: float = 1e-05,
+                          pysolnp_tolerance: float = 0.0001,
+                          debug: bool = False,
+                          evaluation_chunk_size: Optional[int] = None,
+                          sample_in_workers: bool = False,
+                          early_restart_fraction: Optional[float] = None,
+                          time_budget: Optional[float] = None,
+                          target_obj_value: Optional[float] = None,
+                          min_feasible_solutions: int = 1,
+                          checkpoint_dir: Union[None, str, os.PathLike] = None,
+                          resume: bool = False,
+                          memmap_dir: Union[None, str, os.PathLike] = None,
+                          warm_start_dir: Union[None, str, os.PathLike] = None,
+                          warm_start_tag: Optional[str] = None,
+                          previous_results: Optional[Results] = None,
+                          restart_clustering: bool = False,
+                          mlsl_rounds: Optional[int] = None,
+                          racing_survivors: Optional[int] = None,
+                          executor: Optional[Executor] = None) -> Results:
+        """
+        Same as solve, but runs the solve from the executor without blocking the event loop, see solve_async.
+        """
+        model = self.__create_model(par_lower_limit=par_lower_limit,
+                                    par_upper_limit=par_upper_limit,
+                                    eq_values=eq_values,
+                                    ineq_lower_bounds=ineq_lower_bounds,
+                                    ineq_upper_bounds=ineq_upper_bounds,
+                                    number_of_restarts=number_of_restarts,
+                                    number_of_simulations=number_of_simulations,
+                                    start_guess_sampling=start_guess_sampling,
+                                    evaluation_type=evaluation_type,
+                                    pysolnp_rho=pysolnp_rho,
+                                    pysolnp_max_major_iter=pysolnp_max_major_iter,
+                                    pysolnp_max_minor_iter=pysolnp_max_minor_iter,
+                                    pysolnp_delta=pysolnp_delta,
+                                    pysolnp_tolerance=pysolnp_tolerance,
+                                    debug=debug,
+                                    evaluation_chunk_size=evaluation_chunk_size,
+                                    sample_in_workers=sample_in_workers,
+                                    early_restart_fraction=early_restart_fraction,
+                                    time_budget=time_budget,
+                                    target_obj_value=target_obj_value,
+                                    min_feasible_solutions=min_feasible_solutions,
+                                    checkpoint_dir=checkpoint_dir,
+                                    resume=resume,
+                                    memmap_dir=memmap_dir,
+                                    warm_start_dir=warm_start_dir,
+                                    warm_start_tag=warm_start_tag,
+                                    previous_results=previous_results,
+                                    restart_clustering=restart_clustering,
+                                    mlsl_rounds=mlsl_rounds,
+                                    racing_survivors=racing_survivors)
+
+        return await _solve_model_async(model=model,
+                                        seed=seed,
+                                        backend=self.__backend,
+                                        restart_backend=self.__restart_backend,
+                                        executor=executor)
+
+    def solve_async_iter(self,
+                         par_lower_limit: List[float],
+                         par_upper_limit: List[float],
+                         eq_values: Optional[List[float]] = None,
+                         ineq_lower_bounds: Optional[List[float]] = None,
+                         ineq_upper_bounds: Optional[List[float]] = None,
+                         number_of_restarts: int = 1,
+                         number_of_simulations: int = 20000,
+                         start_guess_sampling: Union[None, List[Distribution], Sampling] = None,
+                         seed: Union[None, int] = None,
+                         evaluation_type: Union[EvaluationType, int] = EvaluationType.OBJECTIVE_FUNC_EXCLUDE_INEQ,
+                         pysolnp_rho: float = 1.0,
+                         pysolnp_max_major_iter: int = 10,
+                         pysolnp_max_minor_iter: int = 10,
+                         pysolnp_delta: float = 1e-05,
+                         pysolnp_tolerance: float = 0.0001,
+                         debug: bool = False,
+                         evaluation_chunk_size: Optional[int] = None,
+                         sample_in_workers: bool = False,
+                         early_restart_fraction: Optional[float] = None,
+                         time_budget: Optional[float] = None,
+                         target_obj_value: Optional[float] = None,
+                         min_feasible_solutions: int = 1,
+                         checkpoint_dir: Union[None, str, os.PathLike] = None,
+                         resume: bool = False,
+                         memmap_dir: Union[None, str, os.PathLike] = None,
+                         warm_start_dir: Union[None, str, os.PathLike] = None,
+                         warm_start_tag: Optional[str] = None,
+                         previous_results: Optional[Results] = None,
+                         restart_clustering: bool = False,
+                         mlsl_rounds: Optional[int] = None,
+                         racing_survivors: Optional[int] = None,
+                         executor: Optional[Executor] = None) -> AsyncIterator[Result]:
+        """
+        Same as solve_iter, but returns an async iterator, see solve_async_iter. The Solver must stay open until the
+        iteration is done.
+        """
+        model = self.__create_model(par_lower_limit=par_lower_limit,
+                                    par_upper_limit=par_upper_limit,
+                                    eq_values=eq_values,
+                                    ineq_lower_bounds=ineq_lower_bounds,
+                                    ineq_upper_bounds=ineq_upper_bounds,
+                                    number_of_restarts=number_of_restarts,
+                                    number_of_simulations=number_of_simulations,
+                                    start_guess_sampling=start_guess_sampling,
+                                    evaluation_type=evaluation_type,
+                                    pysolnp_rho=pysolnp_rho,
+                                    pysolnp_max_major_iter=pysolnp_max_major_iter,
+                                    pysolnp_max_minor_iter=pysolnp_max_minor_iter,
+                                    pysolnp_delta=pysolnp_delta,
+                                    pysolnp_tolerance=pysolnp_tolerance,
+                                    debug=debug,
+                                    evaluation_chunk_size=evaluation_chunk_size,
+                                    sample_in_workers=sample_in_workers,
+                                    early_restart_fraction=early_restart_fraction,
+                                    time_budget=time_budget,
+                                    target_obj_value=target_obj_value,
+                                    min_feasible_solutions=min_feasible_solutions,
+                                    checkpoint_dir=checkpoint_dir,
+                                    resume=resume,
+                                    memmap_dir=memmap_dir,
+                                    warm_start_dir=warm_start_dir,
+                                    warm_start_tag=warm_start_tag,
+                                    previous_results=previous_results,
+                                    restart_clustering=restart_clustering,
+                                    mlsl_rounds=mlsl_rounds,
+                                    racing_survivors=racing_survivors)
+
+        return _solve_model_async_iter(model=model,
+                                       seed=seed,
+                                       backend=self.__backend,
+                                       restart_backend=self.__restart_backend,
+                                       executor=executor)
+
+    def __create_model(self,
+                       par_lower_limit: List[float],
+                       par_upper_limit: List[float],
+                       eq_values: Optional[List[float]] = None,
+                       ineq_lower_bounds: Optional[List[float]] = None,
+                       ineq_upper_bounds: Optional[List[float]] = None,
+                       number_of_restarts: int = 1,
+                       number_of_simulations: int = 20000,
+                       start_guess_sampling: Union[None, List[Distribution], Sampling] = None,
+                       evaluation_type: Union[EvaluationType, int] = EvaluationType.OBJECTIVE_FUNC_EXCLUDE_INEQ,
+                       pysolnp_rho: float = 1.0,
+                       pysolnp_max_major_iter: int = 10,
+                       pysolnp_max_minor_iter: int = 10,
+                       pysolnp_delta: float = 1e-05,
+                       pysolnp_tolerance: float = 0.0001,
+                       debug: bool = False,
+                       evaluation_chunk_size: Optional[int] = None,
+                       sample_in_workers: bool = False,
+                       early_restart_fraction: Optional[float] = None,
+                       time_budget: Optional[float] = None,
+                       target_obj_value: Optional[float] = None,
+                       min_feasible_solutions: int = 1,
+                       checkpoint_dir: Union[None, str, os.PathLike] = None,
+                       resume: bool = False,
+                       memmap_dir: Union[None, str, os.PathLike] = None,
+                       warm_start_dir: Union[None, str, os.PathLike] = None,
+                       warm_start_tag: Optional[str] = None,
+                       previous_results: Optional[Results] = None,
+                       restart_clustering: bool = False,
+                       mlsl_rounds: Optional[int] = None,
+                       racing_survivors: Optional[int] = None) -> ProblemModel:
+        if self.__is_closed:
+            raise ValueError("The Solver has been closed.")
+
+        # The registered constraint functions apply to the runs that supply their bounds
+        has_eq_values = eq_values is not None
+        has_ineq_bounds = ineq_lower_bounds is not None or ineq_upper_bounds is not None
+        return _create_model(obj_func=self.__obj_func,
+                             par_lower_limit=par_lower_limit,
+                             par_upper_limit=par_upper_limit,
+                             eq_func=self.__eq_func if has_eq_values else None,
+                             eq_values=eq_values,
+                             ineq_func=self.__ineq_func if has_ineq_bounds else None,
+                             ineq_lower_bounds=ineq_lower_bounds,
+                             ineq_upper_bounds=ineq_upper_bounds,
+                             number_of_restarts=number_of_restarts,
+                             number_of_simulations=number_of_simulations,
+                             number_of_processes=self.__number_of_processes,
+                             start_guess_sampling=start_guess_sampling,
+                             evaluation_type=evaluation_type,
+                             pysolnp_rho=pysolnp_rho,
+                             pysolnp_max_major_iter=pysolnp_max_major_iter,
+                             pysolnp_max_minor_iter=pysolnp_max_minor_iter,
+                             pysolnp_delta=pysolnp_delta,
+                             pysolnp_tolerance=pysolnp_tolerance,
+                             debug=debug,
+                             evaluation_chunk_size=evaluation_chunk_size,
+                             sample_in_workers=sample_in_workers,
+                             obj_func_batch=self.__obj_func_batch,
+                             eq_func_batch=self.__eq_func_batch if has_eq_values else None,
+                             ineq_func_batch=self.__ineq_func_batch if has_ineq_bounds else None,
+                             early_restart_fraction=early_restart_fraction,
+                             time_budget=time_budget,
+                             target_obj_value=target_obj_value,
+                             min_feasible_solutions=min_feasible_solutions,
+                             checkpoint_dir=checkpoint_dir,
+                             resume=resume,
+                             memmap_dir=memmap_dir,
+                             warm_start_dir=warm_start_dir,
+                             warm_start_tag=warm_start_tag,
+                             previous_results=previous_results,
+                             restart_clustering=restart_clustering,
+                             mlsl_rounds=mlsl_rounds,
+                             racing_survivors=racing_survivors)
+
+
+def __iterate_in_session(solver_arguments: dict, model: ProblemModel, seed: Union[None, int]) -> Iterator[Result]:
+    # A session with a single run, the backends are closed when the iteration is done or the iterator is closed
+    with Solver(**solver_arguments) as solver:
+        yield from _solve_model_iter(model=model,
+                                     seed=seed,
+                                     backend=solver.backend,
+                                     restart_backend=solver.restart_backend)
+
+
+async def __iterate_async_in_session(solver_arguments: dict,
+                                     model: ProblemModel,
+                                     seed: Union[None, int],
+                                     executor: Optional[Executor]) -> AsyncIterator[Result]:
+    # A session with a single run, the backends are closed when the iteration is done or cancelled
+    solver = Solver(**solver_arguments)
+    async for result in _solve_model_async_iter(model=model,
+                                                seed=seed,
+                                                backend=solver.backend,
+                                                restart_backend=solver.restart_backend,
+                                                executor=executor,
+                                                on_close=solver.close):
+        yield result
+
+
 def solve(obj_func: Callable,
           par_lower_limit: List[float],
           par_upper_limit: List[float],
@@ -72,158 +2365,384 @@ def solve(obj_func: Callable,
           pysolnp_max_minor_iter: int = 10,
           pysolnp_delta: float = 1e-05,
           pysolnp_tolerance: float = 0.0001,
-          debug: bool = False) -> Results:
-    # Represent the problem with the below object
-    model = ProblemModel(obj_func=obj_func,
-                         par_lower_limit=par_lower_limit,
-                         par_upper_limit=par_upper_limit,
-                         number_of_restarts=number_of_restarts,
-                         number_of_simulations=number_of_simulations,
-                         eq_func=eq_func,
-                         eq_values=eq_values,
-                         ineq_func=ineq_func,
-                         ineq_lower_bounds=ineq_lower_bounds,
-                         ineq_upper_bounds=ineq_upper_bounds,
-                         rho=pysolnp_rho,
-                         max_major_iter=pysolnp_max_major_iter,
-                         max_minor_iter=pysolnp_max_minor_iter,
-                         delta=pysolnp_delta,
-                         tolerance=pysolnp_tolerance,
-                         debug=debug,
-                         number_of_processes=number_of_processes,
-                         start_guess_sampling=start_guess_sampling,
-                         evaluation_type=evaluation_type)
+          debug: bool = False,
+          evaluation_chunk_size: Optional[int] = None,
+          sample_in_workers: bool = False,
+          obj_func_batch: Optional[Callable] = None,
+          eq_func_batch: Optional[Callable] = None,
+          ineq_func_batch: Optional[Callable] = None,
+          early_restart_fraction: Optional[float] = None,
+          backend: Union[None, Backend, Executor] = None,
+          restart_backend: Union[None, Backend, Executor] = None,
+          time_budget: Optional[float] = None,
+          target_obj_value: Optional[float] = None,
+          min_feasible_solutions: int = 1,
+          checkpoint_dir: Union[None, str, os.PathLike] = None,
+          resume: bool = False,
+          memmap_dir: Union[None, str, os.PathLike] = None,
+          warm_start_dir: Union[None, str, os.PathLike] = None,
+          warm_start_tag: Optional[str] = None,
+          previous_results: Optional[Results] = None,
+          restart_clustering: bool = False,
+          mlsl_rounds: Optional[int] = None,
+          racing_survivors: Optional[int] = None) -> Results:
+    model = _create_model(obj_func=obj_func,
+                          par_lower_limit=par_lower_limit,
+                          par_upper_limit=par_upper_limit,
+                          eq_func=eq_func,
+                          eq_values=eq_values,
+                          ineq_func=ineq_func,
+                          ineq_lower_bounds=ineq_lower_bounds,
+                          ineq_upper_bounds=ineq_upper_bounds,
+                          number_of_restarts=number_of_restarts,
+                          number_of_simulations=number_of_simulations,
+                          number_of_processes=number_of_processes,
+                          start_guess_sampling=start_guess_sampling,
+                          evaluation_type=evaluation_type,
+                          pysolnp_rho=pysolnp_rho,
+                          pysolnp_max_major_iter=pysolnp_max_major_iter,
+                          pysolnp_max_minor_iter=pysolnp_max_minor_iter,
+                          pysolnp_delta=pysolnp_delta,
+                          pysolnp_tolerance=pysolnp_tolerance,
+                          debug=debug,
+                          evaluation_chunk_size=evaluation_chunk_size,
+                          sample_in_workers=sample_in_workers,
+                          obj_func_batch=obj_func_batch,
+                          eq_func_batch=eq_func_batch,
+                          ineq_func_batch=ineq_func_batch,
+                          early_restart_fraction=early_restart_fraction,
+                          time_budget=time_budget,
+                          target_obj_value=target_obj_value,
+                          min_feasible_solutions=min_feasible_solutions,
+                          checkpoint_dir=checkpoint_dir,
+                          resume=resume,
+                          memmap_dir=memmap_dir,
+                          warm_start_dir=warm_start_dir,
+                          warm_start_tag=warm_start_tag,
+                          previous_results=previous_results,
+                          restart_clustering=restart_clustering,
+                          mlsl_rounds=mlsl_rounds,
+                          racing_survivors=racing_survivors)
 
-    # Validate the inputs for the problem model
-    model.validate()
+    if not number_of_processes and backend is None and restart_backend is None:
+        return _solve_model(model=model, seed=seed)
 
-    if start_guess_sampling is None or type(start_guess_sampling) is list:
-        # Generate samples using the DefaultSampling object
-        sampling = DefaultSampling(parameter_lower_bounds=par_lower_limit,
-                                   parameter_upper_bounds=par_upper_limit,
-                                   sample_properties=start_guess_sampling,
-                                   seed=seed)
-    elif isinstance(start_guess_sampling, Sampling):
-        if seed is not None and debug is True:
-            print(f"Warning: Seed value {seed} ignored due to user sampling override")
-        # User provided Sampling instance
-        sampling = start_guess_sampling
-    else:
-        raise ValueError(
-            f"Provided parameter start_guess_sampling was not of expected type. Expected None, List[Distribution] or Sampling.")
+    # A session with a single run, the backends are closed when done
+    with Solver(obj_func=obj_func,
+                eq_func=eq_func,
+                ineq_func=ineq_func,
+                number_of_processes=number_of_processes,
+                obj_func_batch=obj_func_batch,
+                eq_func_batch=eq_func_batch,
+                ineq_func_batch=ineq_func_batch,
+                backend=backend,
+                restart_backend=restart_backend) as solver:
+        return _solve_model(model=model,
+                            seed=seed,
+                            backend=solver.backend,
+                            restart_backend=solver.restart_backend)
 
-    parameter_guesses = sampling.generate_all_samples(
-        number_of_samples=model.number_of_evaluations,
-        sample_size=model.sample_size)
 
-    if debug is True:
-        if any(guess is None for guess in parameter_guesses):
-            print(f"Some of the random samples provided failed to generate, is your Sampling class setup correctly?")
+def solve_iter(obj_func: Callable,
+               par_lower_limit: List[float],
+               par_upper_limit: List[float],
+               eq_func: Optional[Callable] = None,
+               eq_values: Optional[List[float]] = None,
+               ineq_func: Optional[Callable] = None,
+               ineq_lower_bounds: Optional[List[float]] = None,
+               ineq_upper_bounds: Optional[List[float]] = None,
+               number_of_restarts: int = 1,
+               number_of_simulations: int = 20000,
+               number_of_processes: Optional[int] = None,
+               start_guess_sampling: Union[None, List[Distribution], Sampling] = None,
+               seed: Union[None, int] = None,
+               evaluation_type: Union[EvaluationType, int] = EvaluationType.OBJECTIVE_FUNC_EXCLUDE_INEQ,
+               pysolnp_rho: float = 1.0,
+               pysolnp_max_major_iter: int = 10,
+               pysolnp_max_minor_iter: int = 10,
+               pysolnp_delta: float = 1e-05,
+               pysolnp_tolerance: float = 0.0001,
+               debug: bool = False,
+               evaluation_chunk_size: Optional[int] = None,
+               sample_in_workers: bool = False,
+               obj_func_batch: Optional[Callable] = None,
+               eq_func_batch: Optional[Callable] = None,
+               ineq_func_batch: Optional[Callable] = None,
+               early_restart_fraction: Optional[float] = None,
+               backend: Union[None, Backend, Executor] = None,
+               restart_backend: Union[None, Backend, Executor] = None,
+               time_budget: Optional[float] = None,
+               target_obj_value: Optional[float] = None,
+               min_feasible_solutions: int = 1,
+               checkpoint_dir: Union[None, str, os.PathLike] = None,
+               resume: bool = False,
+               memmap_dir: Union[None, str, os.PathLike] = None,
+               warm_start_dir: Union[None, str, os.PathLike] = None,
+               warm_start_tag: Optional[str] = None,
+               previous_results: Optional[Results] = None,
+               restart_clustering: bool = False,
+               mlsl_rounds: Optional[int] = None,
+               racing_survivors: Optional[int] = None) -> Iterator[Result]:
+    """
+    Same as solve, but returns an iterator that yields the Result of each restart as soon as the restart finishes.
+    The restarts are handed to the processes one at a time, so a process takes the next restart when it is free.
+    """
+    model = _create_model(obj_func=obj_func,
+                          par_lower_limit=par_lower_limit,
+                          par_upper_limit=par_upper_limit,
+                          eq_func=eq_func,
+                          eq_values=eq_values,
+                          ineq_func=ineq_func,
+                          ineq_lower_bounds=ineq_lower_bounds,
+                          ineq_upper_bounds=ineq_upper_bounds,
+                          number_of_restarts=number_of_restarts,
+                          number_of_simulations=number_of_simulations,
+                          number_of_processes=number_of_processes,
+                          start_guess_sampling=start_guess_sampling,
+                          evaluation_type=evaluation_type,
+                          pysolnp_rho=pysolnp_rho,
+                          pysolnp_max_major_iter=pysolnp_max_major_iter,
+                          pysolnp_max_minor_iter=pysolnp_max_minor_iter,
+                          pysolnp_delta=pysolnp_delta,
+                          pysolnp_tolerance=pysolnp_tolerance,
+                          debug=debug,
+                          evaluation_chunk_size=evaluation_chunk_size,
+                          sample_in_workers=sample_in_workers,
+                          obj_func_batch=obj_func_batch,
+                          eq_func_batch=eq_func_batch,
+                          ineq_func_batch=ineq_func_batch,
+                          early_restart_fraction=early_restart_fraction,
+                          time_budget=time_budget,
+                          target_obj_value=target_obj_value,
+                          min_feasible_solutions=min_feasible_solutions,
+                          checkpoint_dir=checkpoint_dir,
+                          resume=resume,
+                          memmap_dir=memmap_dir,
+                          warm_start_dir=warm_start_dir,
+                          warm_start_tag=warm_start_tag,
+                          previous_results=previous_results,
+                          restart_clustering=restart_clustering,
+                          mlsl_rounds=mlsl_rounds,
+                          racing_survivors=racing_survivors)
 
-    if number_of_processes:
-        par_lower_limit = Array(c_double, model.par_lower_limit, lock=False)
-        par_upper_limit = Array(c_double, model.par_upper_limit, lock=False)
-        eq_values = Array(c_double, model.eq_values, lock=False) if model.has_eq_bounds else None
-        ineq_lower_bounds = Array(c_double, model.ineq_lower_bounds, lock=False) if model.has_ineq_bounds else None
-        ineq_upper_bounds = Array(c_double, model.ineq_upper_bounds, lock=False) if model.has_ineq_bounds else None
-        pysolnp_delta = Value(c_double, model.delta, lock=False)
-        pysolnp_rho = Value(c_double, model.rho, lock=False)
-        pysolnp_max_major_iter = Value(c_int, model.max_major_iter, lock=False)
-        pysolnp_max_minor_iter = Value(c_int, model.max_minor_iter, lock=False)
-        pysolnp_tolerance = Value(c_double, model.tolerance, lock=False)
-        pysolnp_debug = Value(c_bool, model.debug, lock=False)
-        evaluation_type = Value(c_int, model.evaluation_type.value, lock=False)
-        number_of_parameters = Value(c_int, model.number_of_parameters, lock=False)
-
-        parameter_guesses = Array(c_double, parameter_guesses, lock=False)
-        eval_results = Array(c_double, model.number_of_evaluations)  # Results from the eval function
-        restart_results = Array(c_double,
-                                model.number_of_restarts * model.number_of_parameters)  # Results from pysolnp restarts
-
-        initargs = (
-            obj_func,
-            par_lower_limit,
-            par_upper_limit,
-            eq_func,
-            eq_values,
-            ineq_func,
-            ineq_lower_bounds,
-            ineq_upper_bounds,
-            parameter_guesses,
-            pysolnp_delta,
-            pysolnp_rho,
-            pysolnp_max_major_iter,
-            pysolnp_max_minor_iter,
-            pysolnp_tolerance,
-            pysolnp_debug,
-            evaluation_type,
-            number_of_parameters,
-            eval_results,
-            restart_results
-        )
-        with Pool(processes=number_of_processes,
-                  initializer=initialize_worker_process_resources,
-                  initargs=initargs) as pool:
-
-            pool.map(evaluate_starting_guess, range(model.number_of_evaluations))
-
-            if debug is True:
-                __debug_message_eval_functions(model=model, eval_results=eval_results)
-
-            best_evaluations = __get_best_solutions(results=eval_results, number_of_results=model.number_of_restarts)
-            solve_guess_indices = [index for index, value in best_evaluations]
-            # The found optimums are stored in parameter_guesses
-            pool.starmap(pysolnp_solve, enumerate(solve_guess_indices))
+    if not number_of_processes and backend is None and restart_backend is None:
+        return _solve_model_iter(model=model, seed=seed)
 
-    else:
-        eval_results = [None] * model.number_of_evaluations
-        restart_results = [None] * model.number_of_restarts * model.number_of_parameters
-
-        initialize_worker_process_resources(
-            obj_func=obj_func,
-            par_lower_limit=model.par_lower_limit,
-            par_upper_limit=model.par_upper_limit,
-            eq_func=eq_func if model.has_eq_bounds else None,
-            eq_values=model.eq_values if model.has_eq_bounds else None,
-            ineq_func=ineq_func if model.has_ineq_bounds else None,
-            ineq_lower_bounds=model.ineq_lower_bounds if model.has_ineq_bounds else None,
-            ineq_upper_bounds=model.ineq_upper_bounds if model.has_ineq_bounds else None,
-            parameter_guesses=parameter_guesses,
-            pysolnp_delta=model.delta,
-            pysolnp_rho=model.rho,
-            pysolnp_max_major_iter=model.max_major_iter,
-            pysolnp_max_minor_iter=model.max_minor_iter,
-            pysolnp_tolerance=model.tolerance,
-            pysolnp_debug=model.debug,
-            evaluation_type=model.evaluation_type.value,
-            number_of_parameters=model.number_of_parameters,
-            eval_results=eval_results,
-            restart_results=restart_results
-        )
-
-        for index in range(model.number_of_evaluations):
-            evaluate_starting_guess(simulation_index=index)
-
-        if debug is True:
-            __debug_message_eval_functions(model=model, eval_results=eval_results)
-
-        best_evaluations = __get_best_solutions(results=eval_results, number_of_results=model.number_of_restarts)
-        solve_guess_indices = [index for index, value in best_evaluations]
-        # The found optimums are stored in parameter_guesses
-        for solve_index, guess_index in enumerate(solve_guess_indices):
-            pysolnp_solve(solve_index=solve_index, guess_index=guess_index)
-
-    # For each restart, get the resulting parameters
-    solutions = [restart_results[index * model.number_of_parameters: (index + 1) * model.number_of_parameters] for
-                 index in range(model.number_of_restarts)]
+    return __iterate_in_session(
+        solver_arguments={"obj_func": obj_func,
+                          "eq_func": eq_func,
+                          "ineq_func": ineq_func,
+                          "number_of_processes": number_of_processes,
+                          "obj_func_batch": obj_func_batch,
+                          "eq_func_batch": eq_func_batch,
+                          "ineq_func_batch": ineq_func_batch,
+                          "backend": backend,
+                          "restart_backend": restart_backend},
+        model=model,
+        seed=seed)
 
-    # Each Result represents a solution to the restart (might have not converged)
-    all_results = [
-        Result(parameters=solution, obj_value=obj_func(solution), converged=model.check_solution_feasibility(solution))
-        for solution in solutions]
 
-    # pysolnp might have not converged for some solution, if no converging solutions exist, print an warning message.
-    if len([solution for solution in all_results if solution.converged]) == 0:
-        print(f"Not able to find any feasible solution in {number_of_restarts} restarts.")
+async def solve_async(obj_func: Callable,
+                      par_lower_limit: List[float],
+                      par_upper_limit: List[float],
+                      eq_func: Optional[Callable] = None,
+                      eq_values: Optional[List[float]] = None,
+                      ineq_func: Optional[Callable] = None,
+                      ineq_lower_bounds: Optional[List[float]] = None,
+                      ineq_upper_bounds: Optional[List[float]] = None,
+                      number_of_restarts: int = 1,
+                      number_of_simulations: int = 20000,
+                      number_of_processes: Optional[int] = None,
+                      start_guess_sampling: Union[None, List[Distribution], Sampling] = None,
+                      seed: Union[None, int] = None,
+                      evaluation_type: Union[EvaluationType, int] = EvaluationType.OBJECTIVE_FUNC_EXCLUDE_INEQ,
+                      pysolnp_rho: float = 1.0,
+                      pysolnp_max_major_iter: int = 10,
+                      pysolnp_max_minor_iter: int = 10,
+                      pysolnp_delta: float = 1e-05,
+                      pysolnp_tolerance: float = 0.0001,
+                      debug: bool = False,
+                      evaluation_chunk_size: Optional[int] = None,
+                      sample_in_workers: bool = False,
+                      obj_func_batch: Optional[Callable] = None,
+                      eq_func_batch: Optional[Callable] = None,
+                      ineq_func_batch: Optional[Callable] = None,
+                      early_restart_fraction: Optional[float] = None,
+                      backend: Union[None, Backend, Executor] = None,
+                      restart_backend: Union[None, Backend, Executor] = None,
+                      time_budget: Optional[float] = None,
+                      target_obj_value: Optional[float] = None,
+                      min_feasible_solutions: int = 1,
+                      checkpoint_dir: Union[None, str, os.PathLike] = None,
+                      resume: bool = False,
+                      memmap_dir: Union[None, str, os.PathLike] = None,
+                      warm_start_dir: Union[None, str, os.PathLike] = None,
+                      warm_start_tag: Optional[str] = None,
+                      previous_results: Optional[Results] = None,
+                      restart_clustering: bool = False,
+                      mlsl_rounds: Optional[int] = None,
+                      racing_survivors: Optional[int] = None,
+                      executor: Optional[Executor] = None) -> Results:
+    """
+    Same as solve, but can be awaited without blocking the event loop. The evaluations and restarts are run from
+    executor, or the default executor of the event loop if None, and no thread is held while waiting for the restarts.
+    When the task is cancelled, the step of the solve that is running is finished before the run is cleaned up.
+    """
+    model = _create_model(obj_func=obj_func,
+                          par_lower_limit=par_lower_limit,
+                          par_upper_limit=par_upper_limit,
+                          eq_func=eq_func,
+                          eq_values=eq_values,
+                          ineq_func=ineq_func,
+                          ineq_lower_bounds=ineq_lower_bounds,
+                          ineq_upper_bounds=ineq_upper_bounds,
+                          number_of_restarts=number_of_restarts,
+                          number_of_simulations=number_of_simulations,
+                          number_of_processes=number_of_processes,
+                          start_guess_sampling=start_guess_sampling,
+                          evaluation_type=evaluation_type,
+                          pysolnp_rho=pysolnp_rho,
+                          pysolnp_max_major_iter=pysolnp_max_major_iter,
+                          pysolnp_max_minor_iter=pysolnp_max_minor_iter,
+                          pysolnp_delta=pysolnp_delta,
+                          pysolnp_tolerance=pysolnp_tolerance,
+                          debug=debug,
+                          evaluation_chunk_size=evaluation_chunk_size,
+                          sample_in_workers=sample_in_workers,
+                          obj_func_batch=obj_func_batch,
+                          eq_func_batch=eq_func_batch,
+                          ineq_func_batch=ineq_func_batch,
+                          early_restart_fraction=early_restart_fraction,
+                          time_budget=time_budget,
+                          target_obj_value=target_obj_value,
+                          min_feasible_solutions=min_feasible_solutions,
+                          checkpoint_dir=checkpoint_dir,
+                          resume=resume,
+                          memmap_dir=memmap_dir,
+                          warm_start_dir=warm_start_dir,
+                          warm_start_tag=warm_start_tag,
+                          previous_results=previous_results,
+                          restart_clustering=restart_clustering,
+                          mlsl_rounds=mlsl_rounds,
+                          racing_survivors=racing_survivors)
+
+    if not number_of_processes and backend is None and restart_backend is None:
+        return await _solve_model_async(model=model, seed=seed, executor=executor)
+
+    # A session with a single run, the backends are closed when the solve is done or cancelled
+    solver = Solver(obj_func=obj_func,
+                    eq_func=eq_func,
+                    ineq_func=ineq_func,
+                    number_of_processes=number_of_processes,
+                    obj_func_batch=obj_func_batch,
+                    eq_func_batch=eq_func_batch,
+                    ineq_func_batch=ineq_func_batch,
+                    backend=backend,
+                    restart_backend=restart_backend)
+    return await _solve_model_async(model=model,
+                                    seed=seed,
+                                    backend=solver.backend,
+                                    restart_backend=solver.restart_backend,
+                                    executor=executor,
+                                    on_close=solver.close)
+
+
+def solve_async_iter(obj_func: Callable,
+                     par_lower_limit: List[float],
+                     par_upper_limit: List[float],
+                     eq_func: Optional[Callable] = None,
+                     eq_values: Optional[List[float]] = None,
+                     ineq_func: Optional[Callable] = None,
+                     ineq_lower_bounds: Optional[List[float]] = None,
+                     ineq_upper_bounds: Optional[List[float]] = None,
+                     number_of_restarts: int = 1,
+                     number_of_simulations: int = 20000,
+                     number_of_processes: Optional[int] = None,
+                     start_guess_sampling: Union[None, List[Distribution], Sampling] = None,
+                     seed: Union[None, int] = None,
+                     evaluation_type: Union[EvaluationType, int] = EvaluationType.OBJECTIVE_FUNC_EXCLUDE_INEQ,
+                     pysolnp_rho: float = 1.0,
+                     pysolnp_max_major_iter: int = 10,
+                     pysolnp_max_minor_iter: int = 10,
+                     pysolnp_delta: float = 1e-05,
+                     pysolnp_tolerance: float = 0.0001,
+                     debug: bool = False,
+                     evaluation_chunk_size: Optional[int] = None,
+                     sample_in_workers: bool = False,
+                     obj_func_batch: Optional[Callable] = None,
+                     eq_func_batch: Optional[Callable] = None,
+                     ineq_func_batch: Optional[Callable] = None,
+                     early_restart_fraction: Optional[float] = None,
+                     backend: Union[None, Backend, Executor] = None,
+                     restart_backend: Union[None, Backend, Executor] = None,
+                     time_budget: Optional[float] = None,
+                     target_obj_value: Optional[float] = None,
+                     min_feasible_solutions: int = 1,
+                     checkpoint_dir: Union[None, str, os.PathLike] = None,
+                     resume: bool = False,
+                     memmap_dir: Union[None, str, os.PathLike] = None,
+                     warm_start_dir: Union[None, str, os.PathLike] = None,
+                     warm_start_tag: Optional[str] = None,
+                     previous_results: Optional[Results] = None,
+                     restart_clustering: bool = False,
+                     mlsl_rounds: Optional[int] = None,
+                     racing_survivors: Optional[int] = None,
+                     executor: Optional[Executor] = None) -> AsyncIterator[Result]:
+    """
+    Same as solve_iter, but returns an async iterator that yields the Result of each restart as soon as the restart
+    finishes, see solve_async. The next step of the solve only runs when the next Result is requested.
+    """
+    model = _create_model(obj_func=obj_func,
+                          par_lower_limit=par_lower_limit,
+                          par_upper_limit=par_upper_limit,
+                          eq_func=eq_func,
+                          eq_values=eq_values,
+                          ineq_func=ineq_func,
+                          ineq_lower_bounds=ineq_lower_bounds,
+                          ineq_upper_bounds=ineq_upper_bounds,
+                          number_of_restarts=number_of_restarts,
+                          number_of_simulations=number_of_simulations,
+                          number_of_processes=number_of_processes,
+                          start_guess_sampling=start_guess_sampling,
+                          evaluation_type=evaluation_type,
+                          pysolnp_rho=pysolnp_rho,
+                          pysolnp_max_major_iter=pysolnp_max_major_iter,
+                          pysolnp_max_minor_iter=pysolnp_max_minor_iter,
+                          pysolnp_delta=pysolnp_delta,
+                          pysolnp_tolerance=pysolnp_tolerance,
+                          debug=debug,
+                          evaluation_chunk_size=evaluation_chunk_size,
+                          sample_in_workers=sample_in_workers,
+                          obj_func_batch=obj_func_batch,
+                          eq_func_batch=eq_func_batch,
+                          ineq_func_batch=ineq_func_batch,
+                          early_restart_fraction=early_restart_fraction,
+                          time_budget=time_budget,
+                          target_obj_value=target_obj_value,
+                          min_feasible_solutions=min_feasible_solutions,
+                          checkpoint_dir=checkpoint_dir,
+                          resume=resume,
+                          memmap_dir=memmap_dir,
+                          warm_start_dir=warm_start_dir,
+                          warm_start_tag=warm_start_tag,
+                          previous_results=previous_results,
+                          restart_clustering=restart_clustering,
+                          mlsl_rounds=mlsl_rounds,
+                          racing_survivors=racing_survivors)
+
+    if not number_of_processes and backend is None and restart_backend is None:
+        return _solve_model_async_iter(model=model, seed=seed, executor=executor)
 
-    return Results(results=all_results, starting_guesses=parameter_guesses)
+    return __iterate_async_in_session(
+        solver_arguments={"obj_func": obj_func,
+                          "eq_func": eq_func,
+                          "ineq_func": ineq_func,
+                          "number_of_processes": number_of_processes,
+                          "obj_func_batch": obj_func_batch,
+                          "eq_func_batch": eq_func_batch,
+                          "ineq_func_batch": ineq_func_batch,
+                          "backend": backend,
+                          "restart_backend": restart_backend},
+        model=model,
+        seed=seed,
+        executor=executor)
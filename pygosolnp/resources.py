@@ -11,10 +11,14 @@ pysolnp_property_values = None
 pygosolnp_property_keys = None
 pygosolnp_property_values = None
 parameter_guesses = None
+sampling = None
 
 obj_func = None
 eq_func = None
 ineq_func = None
+obj_func_batch = None
+eq_func_batch = None
+ineq_func_batch = None
 
 pysolnp_delta = None
 pysolnp_rho = None
@@ -26,3 +30,7 @@ evaluation_type = None
 number_of_parameters = None
 eval_results = None
 restart_results = None
+
+session_functions = None
+session_run_id = None
+session_run_resources = None
@@ -2,6 +2,8 @@ import abc
 import random
 from typing import Optional, List, Union, Iterable
 
+import numpy
+
 
 class Distribution(abc.ABC):
 
@@ -9,6 +11,17 @@ class Distribution(abc.ABC):
     def generate(self, generator: random.Random) -> float:
         pass
 
+    def generate_batch(self, generator: numpy.random.Generator, number_of_samples: int) -> numpy.ndarray:
+        """
+        Generate number_of_samples values at once as a float64 array.
+        The default implementation falls back on calling generate once per value with a random.Random seeded from
+        the provided generator, override it with a vectorized implementation where possible.
+        """
+        scalar_generator = random.Random(int(generator.integers(low=0, high=2 ** 63)))
+        return numpy.fromiter((self.generate(generator=scalar_generator) for _ in range(number_of_samples)),
+                              dtype=numpy.float64,
+                              count=number_of_samples)
+
 
 class UniformDistribution(Distribution):
     """
@@ -22,6 +35,9 @@ class UniformDistribution(Distribution):
     def generate(self, generator: random.Random) -> float:
         return generator.uniform(self.__lower, self.__upper)
 
+    def generate_batch(self, generator: numpy.random.Generator, number_of_samples: int) -> numpy.ndarray:
+        return generator.uniform(low=self.__lower, high=self.__upper, size=number_of_samples)
+
 
 class NormalDistribution(Distribution):
     """
@@ -35,6 +51,9 @@ class NormalDistribution(Distribution):
     def generate(self, generator: random.Random) -> float:
         return generator.gauss(self.__mean, self.__standard_deviation)
 
+    def generate_batch(self, generator: numpy.random.Generator, number_of_samples: int) -> numpy.ndarray:
+        return generator.normal(loc=self.__mean, scale=self.__standard_deviation, size=number_of_samples)
+
 
 class TriangleDistribution(Distribution):
     """
@@ -49,6 +68,12 @@ class TriangleDistribution(Distribution):
     def generate(self, generator: random.Random) -> float:
         return generator.triangular(self.__low, self.__high, self.__mode)
 
+    def generate_batch(self, generator: numpy.random.Generator, number_of_samples: int) -> numpy.ndarray:
+        if self.__low == self.__high:
+            # Numpy does not accept a degenerate triangle, random.triangular simply returns the limit
+            return numpy.full(shape=number_of_samples, fill_value=self.__low, dtype=numpy.float64)
+        return generator.triangular(left=self.__low, mode=self.__mode, right=self.__high, size=number_of_samples)
+
 
 class ConstantValue(Distribution):
     """
@@ -61,6 +86,9 @@ class ConstantValue(Distribution):
     def generate(self, generator: random.Random) -> float:
         return self.__value
 
+    def generate_batch(self, generator: numpy.random.Generator, number_of_samples: int) -> numpy.ndarray:
+        return numpy.full(shape=number_of_samples, fill_value=self.__value, dtype=numpy.float64)
+
 
 class Sampling(abc.ABC):
 
@@ -76,16 +104,40 @@ class Sampling(abc.ABC):
     def generate_sample(self, sample_size: int) -> Iterable[float]:
         pass
 
+    def generate_indexed_samples(self, start_index: int, number_of_samples: int, sample_size: int) -> numpy.ndarray:
+        """
+        Generate the samples with indices start_index to start_index + number_of_samples - 1 as a
+        (number_of_samples, sample_size) array. The result must only depend on the arguments, so that any process can
+        generate any part of the samples independently. Override this to support sampling in worker processes.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support generating indexed samples")
+
+    @property
+    def supports_indexed_samples(self) -> bool:
+        return type(self).generate_indexed_samples is not Sampling.generate_indexed_samples
+
 
 class DefaultSampling(Sampling):
+    """
+    Samples each parameter from its distribution.
+    By default the samples are drawn one at a time from a random.Random generator. If vectorized is True,
+    generate_all_samples instead fills a (number_of_samples, sample_size) array one parameter at a time using
+    Distribution.generate_batch and the numpy PCG64 generator, which is much faster for many samples but gives other
+    samples for the same seed. The indexed samples used by sample_in_workers always use the numpy generator.
+    """
 
     def __init__(self,
                  parameter_lower_bounds: List[float],
                  parameter_upper_bounds: List[float],
                  sample_properties: Optional[List[Distribution]],
-                 seed: int):
+                 seed: int,
+                 vectorized: bool = False):
 
         self.__generator = random.Random(seed)
+        self.__vectorized = vectorized
+        # The seed sequence entropy is fixed here, so copies of this object in other processes use the same streams
+        self.__seed_sequence = numpy.random.SeedSequence(seed)
+        self.__batch_generator = numpy.random.default_rng(self.__seed_sequence)
 
         if type(sample_properties) is list:
             self.__sample_properties = sample_properties
@@ -94,8 +146,363 @@ class DefaultSampling(Sampling):
                                          zip(parameter_lower_bounds, parameter_upper_bounds)]
             self.__sample_properties = default_sample_properties
 
+    @property
+    def vectorized(self) -> bool:
+        return self.__vectorized
+
     def generate_sample(self, sample_size: int) -> Iterable[float]:
+        if self.__vectorized:
+            # Drawn from the same stream as generate_all_samples, so a seed gives the same samples either way
+            return self.generate_all_samples(number_of_samples=1, sample_size=sample_size)[0].tolist()
+
         result = [0.0] * sample_size
         for variable_index, distribution in enumerate(self.__sample_properties):
             result[variable_index] = distribution.generate(generator=self.__generator)
         return result
+
+    def generate_all_samples(self, number_of_samples: int, sample_size: int) -> Union[numpy.ndarray, List[float]]:
+        if not self.__vectorized:
+            return super().generate_all_samples(number_of_samples=number_of_samples, sample_size=sample_size)
+
+        return self.__generate_samples(generator=self.__batch_generator,
+                                       number_of_samples=number_of_samples,
+                                       sample_size=sample_size)
+
+    def generate_indexed_samples(self, start_index: int, number_of_samples: int, sample_size: int) -> numpy.ndarray:
+        # Each chunk of samples is drawn from an independent stream keyed by its start index
+        generator = numpy.random.default_rng(numpy.random.SeedSequence(entropy=self.__seed_sequence.entropy,
+                                                                       spawn_key=(start_index,)))
+        return self.__generate_samples(generator=generator,
+                                       number_of_samples=number_of_samples,
+                                       sample_size=sample_size)
+
+    def __generate_samples(self,
+                           generator: numpy.random.Generator,
+                           number_of_samples: int,
+                           sample_size: int) -> numpy.ndarray:
+        # Fill the samples one parameter (column) at a time using the vectorized distributions
+        samples = numpy.empty(shape=(number_of_samples, sample_size), dtype=numpy.float64)
+        for variable_index, distribution in enumerate(self.__sample_properties):
+            samples[:, variable_index] = distribution.generate_batch(generator=generator,
+                                                                     number_of_samples=number_of_samples)
+        return samples
+
+
+class UnitHypercubeSampling(Sampling):
+    """
+    Base class for samplings that generate points in the unit hypercube [0, 1)^d, which are then scaled to the
+    parameter bounds. Consecutive calls to generate_all_samples continue the same sequence.
+    """
+
+    def __init__(self,
+                 parameter_lower_bounds: List[float],
+                 parameter_upper_bounds: List[float]):
+        self.__parameter_lower_bounds = numpy.array(parameter_lower_bounds, dtype=numpy.float64)
+        self.__parameter_upper_bounds = numpy.array(parameter_upper_bounds, dtype=numpy.float64)
+
+    @abc.abstractmethod
+    def generate_unit_samples(self, number_of_samples: int, sample_size: int) -> numpy.ndarray:
+        pass
+
+    @abc.abstractmethod
+    def generate_indexed_unit_samples(self,
+                                      start_index: int,
+                                      number_of_samples: int,
+                                      sample_size: int) -> numpy.ndarray:
+        pass
+
+    def generate_all_samples(self, number_of_samples: int, sample_size: int) -> numpy.ndarray:
+        return self.__scale_to_bounds(self.generate_unit_samples(number_of_samples=number_of_samples,
+                                                                 sample_size=sample_size))
+
+    def generate_indexed_samples(self, start_index: int, number_of_samples: int, sample_size: int) -> numpy.ndarray:
+        return self.__scale_to_bounds(self.generate_indexed_unit_samples(start_index=start_index,
+                                                                         number_of_samples=number_of_samples,
+                                                                         sample_size=sample_size))
+
+    def __scale_to_bounds(self, samples: numpy.ndarray) -> numpy.ndarray:
+        samples *= self.__parameter_upper_bounds - self.__parameter_lower_bounds
+        samples += self.__parameter_lower_bounds
+        return samples
+
+    def generate_sample(self, sample_size: int) -> Iterable[float]:
+        return self.generate_all_samples(number_of_samples=1, sample_size=sample_size)[0].tolist()
+
+
+class SobolSampling(UnitHypercubeSampling):
+    """
+    Sobol low-discrepancy sequence.
+    The direction numbers are built from primitive polynomials over GF(2) taken in order of degree, with initial
+    direction numbers drawn once from a fixed generator, so any number of parameters is supported.
+    If scramble is True a random digital shift based on seed is applied, this keeps the low-discrepancy properties.
+    """
+    __bits = 32
+    __direction_number_seed = 20210224
+
+    def __init__(self,
+                 parameter_lower_bounds: List[float],
+                 parameter_upper_bounds: List[float],
+                 seed: Optional[int] = None,
+                 scramble: bool = True):
+        super().__init__(parameter_lower_bounds=parameter_lower_bounds,
+                         parameter_upper_bounds=parameter_upper_bounds)
+        sample_size = len(parameter_lower_bounds)
+        self.__direction_numbers = SobolSampling.__generate_direction_numbers(dimensions=sample_size)
+        if scramble:
+            self.__shift = numpy.random.default_rng(seed).integers(low=0,
+                                                                   high=2 ** SobolSampling.__bits,
+                                                                   size=sample_size,
+                                                                   dtype=numpy.uint64)
+        else:
+            self.__shift = numpy.zeros(shape=sample_size, dtype=numpy.uint64)
+        self.__index = 0
+
+    def generate_unit_samples(self, number_of_samples: int, sample_size: int) -> numpy.ndarray:
+        points = self.generate_indexed_unit_samples(start_index=self.__index,
+                                                    number_of_samples=number_of_samples,
+                                                    sample_size=sample_size)
+        self.__index += number_of_samples
+        return points
+
+    def generate_indexed_unit_samples(self,
+                                      start_index: int,
+                                      number_of_samples: int,
+                                      sample_size: int) -> numpy.ndarray:
+        if start_index + number_of_samples > 2 ** SobolSampling.__bits:
+            raise ValueError(f"SobolSampling supports at most {2 ** SobolSampling.__bits} samples")
+
+        # Point i is the xor of the direction numbers selected by the bits of the gray code of i
+        indices = numpy.arange(start_index, start_index + number_of_samples, dtype=numpy.uint64)
+        gray_codes = indices ^ (indices >> numpy.uint64(1))
+        points = numpy.broadcast_to(self.__shift, (number_of_samples, sample_size)).copy()
+        for bit in range(int(gray_codes.max()).bit_length() if number_of_samples > 0 else 0):
+            selected = ((gray_codes >> numpy.uint64(bit)) & numpy.uint64(1)).astype(bool)
+            points[selected] ^= self.__direction_numbers[:, bit]
+
+        return points.astype(numpy.float64) / 2 ** SobolSampling.__bits
+
+    @staticmethod
+    def __generate_direction_numbers(dimensions: int) -> numpy.ndarray:
+        bits = SobolSampling.__bits
+        generator = numpy.random.default_rng(SobolSampling.__direction_number_seed)
+        direction_numbers = numpy.empty(shape=(dimensions, bits), dtype=numpy.uint64)
+        # The first dimension is the van der Corput sequence in base 2
+        direction_numbers[0] = [1 << (bits - 1 - bit) for bit in range(bits)]
+
+        for dimension, polynomial in enumerate(SobolSampling.__primitive_polynomials(count=dimensions - 1), start=1):
+            degree = polynomial.bit_length() - 1
+            # Initial direction numbers m_k are odd and less than 2^k
+            m = [int(generator.integers(low=0, high=2 ** k // 2)) * 2 + 1 for k in range(1, degree + 1)]
+            for k in range(degree, bits):
+                value = m[k - degree] ^ (m[k - degree] << degree)
+                for coefficient_index in range(1, degree):
+                    if (polynomial >> (degree - coefficient_index)) & 1:
+                        value ^= m[k - coefficient_index] << coefficient_index
+                m.append(value)
+            direction_numbers[dimension] = [m[bit] << (bits - 1 - bit) for bit in range(bits)]
+
+        return direction_numbers
+
+    @staticmethod
+    def __primitive_polynomials(count: int) -> List[int]:
+        # Polynomials over GF(2) are represented as integers, bit k is the coefficient of x^k
+        polynomials = []
+        degree = 1
+        while len(polynomials) < count:
+            order = 2 ** degree - 1
+            prime_factors = SobolSampling.__prime_factors(order)
+            for polynomial in range((1 << degree) + 1, 1 << (degree + 1), 2):
+                if len(polynomials) == count:
+                    break
+                if SobolSampling.__power_of_x(order, polynomial) == 1 and all(
+                        SobolSampling.__power_of_x(order // factor, polynomial) != 1 for factor in prime_factors):
+                    polynomials.append(polynomial)
+            degree += 1
+        return polynomials
+
+    @staticmethod
+    def __power_of_x(exponent: int, polynomial: int) -> int:
+        # Computes x^exponent modulo polynomial over GF(2)
+        degree = polynomial.bit_length() - 1
+
+        def multiply(first: int, second: int) -> int:
+            result = 0
+            while second:
+                if second & 1:
+                    result ^= first
+                second >>= 1
+                first <<= 1
+                if (first >> degree) & 1:
+                    first ^= polynomial
+            return result
+
+        result = 1
+        base = 2 if degree > 1 else 2 ^ polynomial
+        while exponent:
+            if exponent & 1:
+                result = multiply(result, base)
+            base = multiply(base, base)
+            exponent >>= 1
+        return result
+
+    @staticmethod
+    def __prime_factors(value: int) -> List[int]:
+        factors = []
+        factor = 2
+        while factor * factor <= value:
+            if value % factor == 0:
+                factors.append(factor)
+                while value % factor == 0:
+                    value //= factor
+            factor += 1
+        if value > 1:
+            factors.append(value)
+        return factors
+
+
+class HaltonSampling(UnitHypercubeSampling):
+    """
+    Halton low-discrepancy sequence using the first prime numbers as bases.
+    If scramble is True the digits are randomly permuted per parameter based on seed, which removes the
+    correlation between parameters that the plain Halton sequence has for larger primes.
+    """
+
+    def __init__(self,
+                 parameter_lower_bounds: List[float],
+                 parameter_upper_bounds: List[float],
+                 seed: Optional[int] = None,
+                 scramble: bool = True):
+        super().__init__(parameter_lower_bounds=parameter_lower_bounds,
+                         parameter_upper_bounds=parameter_upper_bounds)
+        self.__bases = HaltonSampling.__primes(count=len(parameter_lower_bounds))
+        generator = numpy.random.default_rng(seed)
+        self.__permutations = []
+        for base in self.__bases:
+            permutation = numpy.arange(base)
+            if scramble:
+                # Zero is kept in place so that the trailing zero digits do not contribute
+                permutation[1:] = generator.permutation(permutation[1:])
+            self.__permutations.append(permutation)
+        self.__index = 0
+
+    def generate_unit_samples(self, number_of_samples: int, sample_size: int) -> numpy.ndarray:
+        points = self.generate_indexed_unit_samples(start_index=self.__index,
+                                                    number_of_samples=number_of_samples,
+                                                    sample_size=sample_size)
+        self.__index += number_of_samples
+        return points
+
+    def generate_indexed_unit_samples(self,
+                                      start_index: int,
+                                      number_of_samples: int,
+                                      sample_size: int) -> numpy.ndarray:
+        # The first point of the sequence is the origin, so sample index 0 is Halton point 1
+        indices = numpy.arange(start_index + 1, start_index + 1 + number_of_samples, dtype=numpy.int64)
+        points = numpy.zeros(shape=(number_of_samples, sample_size), dtype=numpy.float64)
+        for dimension, (base, permutation) in enumerate(zip(self.__bases, self.__permutations)):
+            remaining = indices.copy()
+            factor = 1.0 / base
+            while remaining.any():
+                points[:, dimension] += factor * permutation[remaining % base]
+                remaining //= base
+                factor /= base
+
+        return points
+
+    @staticmethod
+    def __primes(count: int) -> List[int]:
+        primes = []
+        candidate = 2
+        while len(primes) < count:
+            if all(candidate % prime != 0 for prime in primes if prime * prime <= candidate):
+                primes.append(candidate)
+            candidate += 1
+        return primes
+
+
+class LatinHypercubeSampling(UnitHypercubeSampling):
+    """
+    Latin hypercube sampling, each call to generate_all_samples splits every parameter range into number_of_samples
+    equally sized strata and places exactly one sample in each of them.
+    """
+
+    def __init__(self,
+                 parameter_lower_bounds: List[float],
+                 parameter_upper_bounds: List[float],
+                 seed: Optional[int] = None):
+        super().__init__(parameter_lower_bounds=parameter_lower_bounds,
+                         parameter_upper_bounds=parameter_upper_bounds)
+        self.__seed_sequence = numpy.random.SeedSequence(seed)
+        self.__generator = numpy.random.default_rng(self.__seed_sequence)
+
+    def generate_unit_samples(self, number_of_samples: int, sample_size: int) -> numpy.ndarray:
+        return LatinHypercubeSampling.__latin_hypercube(generator=self.__generator,
+                                                        number_of_samples=number_of_samples,
+                                                        sample_size=sample_size)
+
+    def generate_indexed_unit_samples(self,
+                                      start_index: int,
+                                      number_of_samples: int,
+                                      sample_size: int) -> numpy.ndarray:
+        # Each chunk of samples is its own Latin hypercube, drawn from an independent stream keyed by its start index
+        generator = numpy.random.default_rng(numpy.random.SeedSequence(entropy=self.__seed_sequence.entropy,
+                                                                       spawn_key=(start_index,)))
+        return LatinHypercubeSampling.__latin_hypercube(generator=generator,
+                                                        number_of_samples=number_of_samples,
+                                                        sample_size=sample_size)
+
+    @staticmethod
+    def __latin_hypercube(generator: numpy.random.Generator, number_of_samples: int, sample_size: int) -> numpy.ndarray:
+        # Each parameter takes the strata in its own random order
+        strata = numpy.empty(shape=(number_of_samples, sample_size), dtype=numpy.float64)
+        for variable_index in range(sample_size):
+            strata[:, variable_index] = generator.permutation(number_of_samples)
+        return (strata + generator.random(size=(number_of_samples, sample_size))) / number_of_samples
+
+
+class WarmStartSampling(Sampling):
+    """
+    Wraps a Sampling so that the first samples are the given points, for example the optima of earlier solves of the
+    same problem. The samples after the points are the samples of the wrapped Sampling with the same indices.
+    """
+
+    def __init__(self, sampling: Sampling, points: numpy.ndarray):
+        """
+        :param sampling: The Sampling for the samples after the points
+        :param points: A (number_of_points, sample_size) array of the first samples
+        """
+        self.__sampling = sampling
+        self.__points = numpy.asarray(points, dtype=numpy.float64)
+        self.__index = 0
+
+    @property
+    def points(self) -> numpy.ndarray:
+        return self.__points
+
+    @property
+    def supports_indexed_samples(self) -> bool:
+        return self.__sampling.supports_indexed_samples
+
+    def generate_all_samples(self, number_of_samples: int, sample_size: int) -> numpy.ndarray:
+        samples = numpy.asarray(self.__sampling.generate_all_samples(number_of_samples=number_of_samples,
+                                                                     sample_size=sample_size),
+                                dtype=numpy.float64).reshape(number_of_samples, sample_size)
+        self.__replace_with_points(samples=samples, start_index=self.__index)
+        self.__index += number_of_samples
+        return samples
+
+    def generate_sample(self, sample_size: int) -> Iterable[float]:
+        return self.generate_all_samples(number_of_samples=1, sample_size=sample_size)[0].tolist()
+
+    def generate_indexed_samples(self, start_index: int, number_of_samples: int, sample_size: int) -> numpy.ndarray:
+        samples = numpy.asarray(self.__sampling.generate_indexed_samples(start_index=start_index,
+                                                                         number_of_samples=number_of_samples,
+                                                                         sample_size=sample_size),
+                                dtype=numpy.float64).reshape(number_of_samples, sample_size)
+        self.__replace_with_points(samples=samples, start_index=start_index)
+        return samples
+
+    def __replace_with_points(self, samples: numpy.ndarray, start_index: int):
+        # The samples with indices below the number of points are replaced by the points with the same indices
+        points = self.__points[start_index:start_index + len(samples)]
+        samples[:len(points)] = points
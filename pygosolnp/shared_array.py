@@ -0,0 +1,161 @@
+import mmap
+import os
+import sys
+import tempfile
+import threading
+from typing import Optional, Tuple, Union
+
+import numpy
+from numpy.lib.format import open_memmap
+
+# Held while this process talks to the shared memory tracker and while it forks processes, so that a process forked by
+# one thread never inherits the lock of the tracker from another thread in a locked state
+resource_tracker_lock = threading.RLock()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(before=resource_tracker_lock.acquire,
+                        after_in_parent=resource_tracker_lock.release,
+                        after_in_child=resource_tracker_lock.release)
+
+
+def start_shared_memory_tracking():
+    """
+    Starts the process that tracks the shared memory blocks of this process, if not already running.
+    Call this before starting processes that will attach to SharedArrays, so that they report to the same tracker
+    rather than starting their own, which would warn about leaked blocks when they exit.
+    """
+    if os.name == "posix" and sys.version_info >= (3, 8):
+        # Imported here, the tracker only exists from Python 3.8
+        from multiprocessing import resource_tracker
+        with resource_tracker_lock:
+            resource_tracker.ensure_running()
+
+
+class _MappedFile:
+    """
+    Stands in for multiprocessing.shared_memory.SharedMemory before Python 3.8, the block is a temporary file that each
+    process maps into memory.
+    """
+
+    def __init__(self, name: Optional[str], create: bool, size: int):
+        if create:
+            # Kept in memory where the system has a tmpfs for shared memory
+            directory = "/dev/shm" if os.path.isdir("/dev/shm") else None
+            file_descriptor, name = tempfile.mkstemp(prefix="pygosolnp_", dir=directory)
+            os.ftruncate(file_descriptor, size)
+        else:
+            file_descriptor = os.open(name, os.O_RDWR)
+        try:
+            self.__mmap = mmap.mmap(file_descriptor, size)
+        finally:
+            os.close(file_descriptor)
+        self.__name = name
+        self.buf = memoryview(self.__mmap)
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    def close(self):
+        # Raises BufferError while views of the buffer are referenced, like SharedMemory.close
+        self.buf.release()
+        self.__mmap.close()
+
+    def unlink(self):
+        os.remove(self.__name)
+
+
+class SharedArray:
+    """
+    A float64 numpy array stored in a multiprocessing.shared_memory block, or in a memory-mapped temporary file before
+    Python 3.8.
+    Instances passed to other processes attach to the same block, so all processes read and write the same values
+    without copying them. The process that created the array must call release when all processes are done with it.
+    """
+
+    def __init__(self, shape: Tuple[int, ...], name: Optional[str] = None):
+        """
+        :param shape: The shape of the array
+        :param name: [Optional, default None] The name of an existing block to attach to, if None a new block is created
+        """
+        self.__shape = tuple(shape)
+        self.__is_owner = name is None
+        number_of_bytes = int(numpy.prod(self.__shape)) * numpy.dtype(numpy.float64).itemsize
+        # Shared memory blocks can not be empty
+        size = max(1, number_of_bytes)
+        with resource_tracker_lock:
+            if sys.version_info >= (3, 13):
+                from multiprocessing.shared_memory import SharedMemory
+                # Only the creating process tracks the block, it is the one that unlinks it
+                self.__shared_memory = SharedMemory(name=name, create=self.__is_owner, size=size, track=self.__is_owner)
+            elif sys.version_info >= (3, 8):
+                from multiprocessing.shared_memory import SharedMemory
+                self.__shared_memory = SharedMemory(name=name, create=self.__is_owner, size=size)
+            else:
+                self.__shared_memory = _MappedFile(name=name, create=self.__is_owner, size=size)
+        self.__array = numpy.ndarray(shape=self.__shape, dtype=numpy.float64, buffer=self.__shared_memory.buf)
+
+    def __reduce__(self):
+        # Unpickled instances attach to the existing block rather than copying the values
+        return SharedArray, (self.__shape, self.__shared_memory.name)
+
+    @property
+    def array(self) -> numpy.ndarray:
+        return self.__array
+
+    @property
+    def name(self) -> str:
+        return self.__shared_memory.name
+
+    def release(self):
+        self.__array = None
+        try:
+            self.__shared_memory.close()
+        except BufferError:
+            # Views of the array are still referenced, the memory is then unmapped once they are garbage collected
+            pass
+        if self.__is_owner:
+            with resource_tracker_lock:
+                self.__shared_memory.unlink()
+
+
+class MemmapArray:
+    """
+    A float64 numpy array stored in a .npy file and mapped into memory with numpy.memmap.
+    Instances passed to other processes open the same file, so all processes read and write the same values through the
+    page cache of the operating system, which also decides how much of the array stays in memory. The file is kept after
+    release and can be opened again with numpy.load(path, mmap_mode="r").
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], shape: Optional[Tuple[int, ...]] = None):
+        """
+        :param path: The path of the .npy file
+        :param shape: [Optional, default None] The shape of a new array, which replaces the file at path, if None the
+        existing file is opened
+        """
+        self.__path = os.fspath(path)
+        if shape is None:
+            self.__array = open_memmap(self.__path, mode="r+")
+        else:
+            # Removed rather than overwritten, so that arrays still mapping the previous file keep their values
+            if os.path.exists(self.__path):
+                os.remove(self.__path)
+            self.__array = open_memmap(self.__path, mode="w+", dtype=numpy.float64, shape=tuple(shape))
+        self.__is_owner = shape is not None
+
+    def __reduce__(self):
+        # Unpickled instances open the existing file rather than copying the values
+        return MemmapArray, (self.__path,)
+
+    @property
+    def array(self) -> numpy.ndarray:
+        return self.__array
+
+    @property
+    def name(self) -> str:
+        return self.__path
+
+    def release(self):
+        # The file is unmapped once the views of the array are garbage collected
+        if self.__is_owner and self.__array is not None:
+            self.__array.flush()
+        self.__array = None
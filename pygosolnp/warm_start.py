@@ -0,0 +1,97 @@
+"""
+Stores the best optima of earlier solves, so that later solves of the same problem can start from them.
+
+The optima of each problem are stored in <key>.npz in the warm start directory, where the key is a hash of the name of
+the objective function, the number of parameters and an optional tag that tells related problems apart. All lambdas share
+the name <lambda>, so a tag is required for them.
+"""
+import hashlib
+import os
+import pickle
+from typing import Callable, Optional, Tuple, Union
+
+import numpy
+
+from pygosolnp.checkpoint import _load, _save
+
+# Number of optima kept for each problem
+WARM_START_SIZE = 10
+# Number of jittered copies of each optimum added to the warm start points
+WARM_START_COPIES = 4
+# Standard deviation of the jitter as a fraction of the distance between the parameter bounds
+WARM_START_JITTER = 0.01
+
+
+def warm_start_key(obj_func: Callable, number_of_parameters: int, tag: Optional[str] = None) -> str:
+    """
+    The key that the optima of a problem are stored under.
+    :param tag: [Optional, default None] Tells problems apart that share the objective function and number of parameters
+    """
+    function_name = f"{getattr(obj_func, '__module__', None)}:{getattr(obj_func, '__qualname__', repr(obj_func))}"
+    return hashlib.sha256(pickle.dumps((function_name, number_of_parameters, tag))).hexdigest()[:32]
+
+
+def jittered_points(optima: numpy.ndarray,
+                    par_lower_limit: numpy.ndarray,
+                    par_upper_limit: numpy.ndarray,
+                    generator: numpy.random.Generator,
+                    number_of_copies: int = WARM_START_COPIES,
+                    jitter: float = WARM_START_JITTER) -> numpy.ndarray:
+    """
+    The optima followed by number_of_copies copies of each optimum with normally distributed jitter, all clipped to the
+    parameter bounds.
+    :param optima: A (number_of_optima, number_of_parameters) array, best first
+    :param jitter: The standard deviation of the jitter as a fraction of the distance between the parameter bounds
+    """
+    # The optima may have been found with other bounds, which the key of the store does not include
+    optima = numpy.clip(optima, par_lower_limit, par_upper_limit)
+    copies = numpy.repeat(optima, number_of_copies, axis=0)
+    copies += generator.normal(scale=jitter, size=copies.shape) * (par_upper_limit - par_lower_limit)
+    numpy.clip(copies, par_lower_limit, par_upper_limit, out=copies)
+    return numpy.concatenate((optima, copies))
+
+
+class WarmStartStore:
+    """
+    The stored optima of one problem, best first.
+    """
+
+    def __init__(self, directory: Union[str, os.PathLike], key: str, size: int = WARM_START_SIZE):
+        """
+        :param directory: The warm start directory
+        :param key: The warm_start_key of the problem
+        :param size: [Optional, default WARM_START_SIZE] The number of optima kept
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.__path = os.path.join(os.fspath(directory), f"{key}.npz")
+        self.__size = size
+
+    @property
+    def path(self) -> str:
+        return self.__path
+
+    def load(self) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        :return: The stored (parameters, obj_values), with no rows if nothing is stored for the problem
+        """
+        arrays = _load(self.__path)
+        if arrays is None:
+            return numpy.empty(shape=(0, 0), dtype=numpy.float64), numpy.empty(shape=0, dtype=numpy.float64)
+        return arrays["parameters"], arrays["obj_values"]
+
+    def record(self, parameters: numpy.ndarray, obj_values: numpy.ndarray):
+        """
+        Merges the optima with the stored ones and keeps the best, optima that are already stored are kept once.
+        :param parameters: A (number_of_optima, number_of_parameters) array of feasible optima
+        :param obj_values: The objective value of each optimum
+        """
+        if len(obj_values) == 0:
+            return
+        stored_parameters, stored_obj_values = self.load()
+        if stored_parameters.shape[1:] == parameters.shape[1:]:
+            parameters = numpy.concatenate((stored_parameters, parameters))
+            obj_values = numpy.concatenate((stored_obj_values, obj_values))
+        parameters, unique_indices = numpy.unique(parameters, axis=0, return_index=True)
+        obj_values = obj_values[unique_indices]
+        best_indices = numpy.argsort(obj_values, kind="stable")[:self.__size]
+        _save(path=self.__path, arrays={"parameters": parameters[best_indices], "obj_values": obj_values[best_indices]})
@@ -0,0 +1,118 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+try:
+    from queue import SimpleQueue
+except ImportError:
+    # SimpleQueue is only available from Python 3.7
+    from queue import Queue as SimpleQueue
+
+from pygosolnp.backends import ExecutorBackend, ProcessBackend, SerialBackend, ThreadBackend
+from pygosolnp.benchmarks.permutations import permutation_function, \
+    parameter_lower_bounds as permutation_lower_bounds, parameter_upper_bounds as permutation_upper_bounds
+from pygosolnp.pygosolnp import solve, solve_iter, Solver
+
+
+def record_start(path: str, seconds: float) -> float:
+    # Appends a line to the file at path each time a task starts, and then takes the given time
+    with open(path, "a") as file:
+        file.write("started\n")
+    time.sleep(seconds)
+    return seconds
+
+
+class TestPygosolnpBackends(unittest.TestCase):
+    arguments = {"obj_func": permutation_function,
+                 "par_lower_limit": permutation_lower_bounds,
+                 "par_upper_limit": permutation_upper_bounds,
+                 "number_of_restarts": 3,
+                 "number_of_simulations": 3000,
+                 "seed": 443,
+                 "pysolnp_max_major_iter": 100}
+
+    def test_backends(self):
+        # All backends, and any combination of them for the evaluations and the restarts, give the same results
+        expected_results = solve(**self.arguments)
+        with ThreadPoolExecutor(max_workers=2) as thread_executor, \
+                ProcessPoolExecutor(max_workers=2) as process_executor:
+            backend_factories = [lambda: {"backend": SerialBackend()},
+                                 lambda: {"backend": ThreadBackend(number_of_threads=2)},
+                                 lambda: {"backend": ProcessBackend(number_of_processes=2)},
+                                 lambda: {"backend": thread_executor},
+                                 lambda: {"backend": process_executor},
+                                 lambda: {"backend": ProcessBackend(number_of_processes=2),
+                                          "restart_backend": ThreadBackend(number_of_threads=2)},
+                                 lambda: {"backend": ThreadBackend(number_of_threads=2),
+                                          "restart_backend": process_executor}]
+            for backend_factory in backend_factories:
+                results = solve(**self.arguments, **backend_factory())
+                self.assertListEqual(results.starting_guesses, expected_results.starting_guesses)
+                self.assertListEqual(results.all_results, expected_results.all_results)
+
+                iterated_results = list(solve_iter(**self.arguments, **backend_factory()))
+                self.assertCountEqual(iterated_results, expected_results.all_results)
+
+    def test_solver_backends(self):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            with Solver(obj_func=permutation_function, backend=executor) as solver:
+                self.assertIsInstance(solver.backend, ExecutorBackend)
+                self.assertTrue(solver.backend.is_in_process)
+                self.assertEqual(solver.backend.number_of_workers, 2)
+                self.assertIs(solver.restart_backend, solver.backend)
+                solver.solve(par_lower_limit=permutation_lower_bounds,
+                             par_upper_limit=permutation_upper_bounds,
+                             number_of_simulations=500)
+            # The executor is not shut down along with the Solver
+            self.assertEqual(executor.submit(sum, [1, 2]).result(), 3)
+
+    def test_thread_backend_close(self):
+        # Closing the backend cancels the queued tasks and waits for the running one
+        backend = ThreadBackend(number_of_threads=1)
+        is_released = threading.Event()
+        futures = backend.submit_tasks(completed=SimpleQueue(), function=lambda: is_released.wait(5.0),
+                                       iterable=[(), (), ()])
+        threading.Timer(0.1, is_released.set).start()
+        backend.close()
+        self.assertTrue(futures[0].result())
+        self.assertTrue(futures[1].cancelled())
+        self.assertTrue(futures[2].cancelled())
+
+    def test_process_backend_cancel_tasks(self):
+        # Cancelling the tasks of one run does not start the running tasks of another run on the same Solver again
+        with Solver(obj_func=permutation_function, number_of_processes=1) as solver, \
+                tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "starts.txt")
+            completed = SimpleQueue()
+            solver.backend.submit_tasks(completed=completed, function=record_start, iterable=[(path, 1.0)])
+            other_tasks = solver.backend.submit_tasks(completed=SimpleQueue(), function=record_start,
+                                                      iterable=[(path, 0.0), (path, 0.0)])
+            time.sleep(0.5)
+            # The other tasks are waiting for the process, so they are dropped
+            solver.backend.cancel_tasks(other_tasks)
+            self.assertEqual(completed.get(), 1.0)
+            with open(path) as file:
+                self.assertEqual(file.read().count("started"), 1)
+
+            # A cancelled running task replaces the processes, the tasks of other runs are then started again
+            running_tasks = solver.backend.submit_tasks(completed=SimpleQueue(), function=record_start,
+                                                        iterable=[(path, 10.0)])
+            solver.backend.submit_tasks(completed=completed, function=record_start, iterable=[(path, 0.0)])
+            time.sleep(0.5)
+            solver.backend.cancel_tasks(running_tasks)
+            self.assertEqual(completed.get(), 0.0)
+            self.assertListEqual(solver.backend.run_tasks(function=record_start, iterable=[(path, 0.0)]), [0.0])
+
+    def test_bad_backends(self):
+        with self.assertRaises(ValueError):
+            Solver(obj_func=permutation_function, number_of_processes=2, backend=SerialBackend())
+        with self.assertRaises(ValueError):
+            Solver(obj_func=permutation_function, backend="threads")
+        with self.assertRaises(ValueError):
+            ThreadBackend(number_of_threads=0)
+        with self.assertRaises(ValueError):
+            ProcessBackend(number_of_processes=1.5)
+        with self.assertRaises(ValueError):
+            ExecutorBackend(executor=ThreadPoolExecutor(max_workers=1), number_of_workers=0)
@@ -0,0 +1,99 @@
+import multiprocessing
+import socket
+import unittest
+
+from pygosolnp.backends import ProcessBackend
+from pygosolnp.benchmarks.permutations import permutation_function, \
+    parameter_lower_bounds as permutation_lower_bounds, parameter_upper_bounds as permutation_upper_bounds
+from pygosolnp.distributed import DistributedBackend, run_worker
+from pygosolnp.pygosolnp import solve, solve_iter, EvaluationType
+from tests.resources import alkyla_equality_function, parameter_lower_bounds, parameter_upper_bounds, \
+    alkyla_inequality_function, alkyla_objective_function, inequality_lower_bounds, inequality_upper_bounds, \
+    equality_values
+
+AUTHKEY = b"pygosolnp-test"
+
+
+def free_port() -> int:
+    with socket.socket() as free_socket:
+        free_socket.bind(("localhost", 0))
+        return free_socket.getsockname()[1]
+
+
+class TestPygosolnpDistributed(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.addresses = [("localhost", free_port()) for _ in range(3)]
+        cls.workers = [multiprocessing.Process(target=run_worker, args=(address, AUTHKEY), daemon=True) for address in
+                       cls.addresses]
+        for worker in cls.workers:
+            worker.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        for worker in cls.workers:
+            worker.terminate()
+            worker.join()
+
+    def test_distributed_backend(self):
+        # Localhost workers give the same results as solving in this process
+        arguments = {"obj_func": permutation_function,
+                     "par_lower_limit": permutation_lower_bounds,
+                     "par_upper_limit": permutation_upper_bounds,
+                     "number_of_restarts": 3,
+                     "number_of_simulations": 3000,
+                     "seed": 443,
+                     "pysolnp_max_major_iter": 100}
+        for settings in [{}, {"sample_in_workers": True}, {"evaluation_chunk_size": 500, "early_restart_fraction": 0.3}]:
+            expected_results = solve(**arguments, **settings)
+            results = solve(**arguments, **settings, backend=DistributedBackend(self.addresses, AUTHKEY))
+            self.assertListEqual(results.starting_guesses, expected_results.starting_guesses)
+            self.assertListEqual(results.all_results, expected_results.all_results)
+
+            results = solve(**arguments, **settings,
+                            backend=ProcessBackend(number_of_processes=2),
+                            restart_backend=DistributedBackend(self.addresses, AUTHKEY))
+            self.assertListEqual(results.all_results, expected_results.all_results)
+
+            iterated_results = list(solve_iter(**arguments, **settings,
+                                               backend=DistributedBackend(self.addresses, AUTHKEY)))
+            self.assertCountEqual(iterated_results, expected_results.all_results)
+
+    def test_distributed_backend_constraints(self):
+        arguments = {"obj_func": alkyla_objective_function,
+                     "par_lower_limit": parameter_lower_bounds,
+                     "par_upper_limit": parameter_upper_bounds,
+                     "eq_func": alkyla_equality_function,
+                     "eq_values": equality_values,
+                     "ineq_func": alkyla_inequality_function,
+                     "ineq_lower_bounds": inequality_lower_bounds,
+                     "ineq_upper_bounds": inequality_upper_bounds,
+                     "number_of_restarts": 2,
+                     "number_of_simulations": 2000,
+                     "seed": 443,
+                     "evaluation_type": EvaluationType.PENALTY_BARRIER_FUNCTION}
+        expected_results = solve(**arguments)
+        results = solve(**arguments, backend=DistributedBackend(self.addresses, AUTHKEY))
+        self.assertListEqual(results.all_results, expected_results.all_results)
+
+    def test_distributed_functions_imported_by_name(self):
+        # Functions that the workers can not import by name are rejected before any tasks are sent
+        with self.assertRaises(ValueError):
+            solve(obj_func=lambda parameters: sum(parameters),
+                  par_lower_limit=permutation_lower_bounds,
+                  par_upper_limit=permutation_upper_bounds,
+                  backend=DistributedBackend(self.addresses, AUTHKEY))
+        # The backend was closed, so the workers are free for the next coordinator
+        results = solve(obj_func=permutation_function,
+                        par_lower_limit=permutation_lower_bounds,
+                        par_upper_limit=permutation_upper_bounds,
+                        number_of_simulations=500,
+                        backend=DistributedBackend(self.addresses, AUTHKEY, connect_timeout=1.0))
+        self.assertEqual(len(results.all_results), 1)
+
+    def test_bad_distributed_backend(self):
+        with self.assertRaises(ValueError):
+            DistributedBackend(addresses=[], authkey=AUTHKEY)
+        with self.assertRaises(ValueError):
+            DistributedBackend(addresses=self.addresses, authkey="not bytes")
@@ -1,8 +1,12 @@
 import unittest
 
-from pygosolnp.evaluation_functions import penalty_barrier_function
+import numpy
+
+from pygosolnp.evaluation_functions import penalty_barrier_function, objective_func_exclude_ineq, \
+    penalty_barrier_function_batch, objective_func_exclude_ineq_batch
 from tests.resources import alkyla_equality_function, alkyla_inequality_function, alkyla_objective_function, \
-    inequality_lower_bounds, inequality_upper_bounds, equality_values
+    inequality_lower_bounds, inequality_upper_bounds, equality_values, parameter_lower_bounds, parameter_upper_bounds, \
+    alkyla_objective_function_batch, alkyla_equality_function_batch, alkyla_inequality_function_batch
 
 
 class TestPygosolnpEvaluationFunctions(unittest.TestCase):
@@ -16,3 +20,32 @@ class TestPygosolnpEvaluationFunctions(unittest.TestCase):
                                          ineq_lower_bounds=inequality_lower_bounds,
                                          ineq_upper_bounds=inequality_upper_bounds)
         self.assertAlmostEqual(value, 348.8093, 4)
+
+    def test_batch_evaluation_functions(self):
+        guesses = numpy.random.default_rng(443).uniform(low=parameter_lower_bounds,
+                                                        high=parameter_upper_bounds,
+                                                        size=(1000, len(parameter_lower_bounds)))
+        # Random guesses are rarely within the inequality bounds, add some that are
+        guesses[:10] = [18.5028, 11.1751, 106.5718, 32.5594, 11.7499, 87.3705, 93.9245, 10.6753, 2.6611, 149.6736]
+
+        for scalar_function, batch_function in [(objective_func_exclude_ineq, objective_func_exclude_ineq_batch),
+                                                (penalty_barrier_function, penalty_barrier_function_batch)]:
+            batch_values = batch_function(guesses,
+                                          obj_func=alkyla_objective_function_batch,
+                                          eq_func=alkyla_equality_function_batch,
+                                          eq_values=equality_values,
+                                          ineq_func=alkyla_inequality_function_batch,
+                                          ineq_lower_bounds=inequality_lower_bounds,
+                                          ineq_upper_bounds=inequality_upper_bounds)
+            self.assertEqual(batch_values.shape, (1000,))
+            self.assertTrue(numpy.isfinite(batch_values[:10]).all())
+            for guess, batch_value in zip(guesses.tolist(), batch_values):
+                value = scalar_function(guess,
+                                        obj_func=alkyla_objective_function,
+                                        eq_func=alkyla_equality_function,
+                                        eq_values=equality_values,
+                                        ineq_func=alkyla_inequality_function,
+                                        ineq_lower_bounds=inequality_lower_bounds,
+                                        ineq_upper_bounds=inequality_upper_bounds)
+                # The batch functions accumulate in the same order as the scalar functions, so values are identical
+                self.assertEqual(batch_value, value)
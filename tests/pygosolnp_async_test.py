@@ -0,0 +1,64 @@
+import asyncio
+import sys
+import unittest
+
+from pygosolnp.backends import ThreadBackend
+from pygosolnp.benchmarks.permutations import permutation_function, \
+    parameter_lower_bounds as permutation_lower_bounds, parameter_upper_bounds as permutation_upper_bounds
+from pygosolnp.pygosolnp import solve, solve_async, solve_async_iter, Solver
+
+
+# IsolatedAsyncioTestCase is only available from Python 3.8
+@unittest.skipIf(sys.version_info < (3, 8), "Requires IsolatedAsyncioTestCase")
+class TestPygosolnpAsync(getattr(unittest, "IsolatedAsyncioTestCase", unittest.TestCase)):
+    arguments = {"obj_func": permutation_function,
+                 "par_lower_limit": permutation_lower_bounds,
+                 "par_upper_limit": permutation_upper_bounds,
+                 "number_of_restarts": 3,
+                 "number_of_simulations": 3000,
+                 "seed": 443,
+                 "pysolnp_max_major_iter": 100}
+
+    async def test_solve_async(self):
+        expected_results = solve(**self.arguments)
+        for backend_factory in [lambda: {}, lambda: {"number_of_processes": 2},
+                                lambda: {"backend": ThreadBackend(number_of_threads=2)}]:
+            results = await solve_async(**self.arguments, **backend_factory())
+            self.assertListEqual(results.starting_guesses, expected_results.starting_guesses)
+            self.assertListEqual(results.all_results, expected_results.all_results)
+
+            iterated_results = [result async for result in solve_async_iter(**self.arguments, **backend_factory())]
+            self.assertCountEqual(iterated_results, expected_results.all_results)
+
+    async def test_concurrent_solve_async(self):
+        # Several solves share the event loop and the default executor
+        expected_results = solve(**self.arguments)
+        for backend_arguments in [{}, {"number_of_processes": 2}]:
+            all_results = await asyncio.gather(*[solve_async(**self.arguments, **backend_arguments) for _ in range(3)])
+            for results in all_results:
+                self.assertListEqual(results.all_results, expected_results.all_results)
+
+        with Solver(obj_func=permutation_function, number_of_processes=2) as solver:
+            solver_arguments = {key: value for key, value in self.arguments.items() if key != "obj_func"}
+            all_results = await asyncio.gather(*[solver.solve_async(**solver_arguments) for _ in range(2)])
+            for results in all_results:
+                self.assertListEqual(results.all_results, expected_results.all_results)
+
+    async def test_cancel_solve_async(self):
+        task = asyncio.ensure_future(solve_async(**dict(self.arguments, number_of_simulations=100000),
+                                                 number_of_processes=2))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+        # Leaving the iteration early cleans up the run
+        async for result in solve_async_iter(**self.arguments, number_of_processes=2):
+            self.assertIsNotNone(result.obj_value)
+            break
+
+    async def test_solve_async_validation(self):
+        with self.assertRaises(ValueError):
+            solve_async_iter(**dict(self.arguments, number_of_restarts=0))
+        with self.assertRaises(ValueError):
+            await solve_async(**dict(self.arguments, number_of_restarts=0))
@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+
+from pygosolnp.benchmarks.permutations import permutation_function, \
+    parameter_lower_bounds as permutation_lower_bounds, parameter_upper_bounds as permutation_upper_bounds
+from pygosolnp.pygosolnp import solve, solve_iter
+
+
+class TestPygosolnpCheckpoint(unittest.TestCase):
+    arguments = {"obj_func": permutation_function,
+                 "par_lower_limit": permutation_lower_bounds,
+                 "par_upper_limit": permutation_upper_bounds,
+                 "number_of_restarts": 6,
+                 "number_of_simulations": 2000,
+                 "seed": 443,
+                 "pysolnp_max_major_iter": 100}
+
+    def test_resume_interrupted_solve(self):
+        # Resuming after the iterator was closed gives the same results as a solve that was not interrupted
+        for evaluation_chunk_size in [None, 500]:
+            for number_of_processes in [None, 2]:
+                arguments = dict(self.arguments,
+                                 evaluation_chunk_size=evaluation_chunk_size,
+                                 number_of_processes=number_of_processes)
+                expected_results = solve(**arguments)
+                with tempfile.TemporaryDirectory() as checkpoint_dir:
+                    iterator = solve_iter(**arguments, checkpoint_dir=checkpoint_dir)
+                    next(iterator)
+                    iterator.close()
+                    self.assertEqual(len(os.listdir(checkpoint_dir)), 1)
+
+                    results = solve(**arguments, checkpoint_dir=checkpoint_dir, resume=True)
+                    self.assertFalse(results.is_partial)
+                    self.assertListEqual(results.all_results, expected_results.all_results)
+                    self.assertListEqual(results.starting_guesses, expected_results.starting_guesses)
+
+    def test_resume_finished_solve(self):
+        # A finished solve is not evaluated again
+        number_of_calls = []
+
+        def obj_func(parameters):
+            number_of_calls.append(1)
+            return permutation_function(parameters)
+
+        arguments = dict(self.arguments, obj_func=obj_func)
+        with tempfile.TemporaryDirectory() as checkpoint_dir:
+            expected_results = solve(**arguments, checkpoint_dir=checkpoint_dir)
+            number_of_calls.clear()
+            results = solve(**arguments, checkpoint_dir=checkpoint_dir, resume=True)
+            self.assertEqual(len(number_of_calls), 0)
+            self.assertListEqual(results.all_results, expected_results.all_results)
+
+            # Without resume, and for another seed, the solve starts over
+            solve(**arguments, checkpoint_dir=checkpoint_dir)
+            self.assertGreater(len(number_of_calls), 0)
+            number_of_calls.clear()
+            solve(**dict(arguments, seed=1), checkpoint_dir=checkpoint_dir, resume=True)
+            self.assertGreater(len(number_of_calls), 0)
+            self.assertEqual(len(os.listdir(checkpoint_dir)), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,19 @@
+import os
+import tempfile
 import unittest
 from unittest.mock import patch
 
+import numpy
+
+from pygosolnp.benchmarks.permutations import permutation_function, \
+    parameter_lower_bounds as permutation_lower_bounds, parameter_upper_bounds as permutation_upper_bounds
+from pygosolnp.model import ProblemModel
 from pygosolnp.pygosolnp import solve, EvaluationType
-from pygosolnp.sampling import NormalDistribution, UniformDistribution, TriangleDistribution, ConstantValue
+from pygosolnp.sampling import NormalDistribution, UniformDistribution, TriangleDistribution, ConstantValue, \
+    SobolSampling
 from tests.resources import alkyla_equality_function, parameter_lower_bounds, parameter_upper_bounds, \
     alkyla_inequality_function, alkyla_objective_function, inequality_lower_bounds, inequality_upper_bounds, \
-    equality_values
+    equality_values, alkyla_objective_function_batch, alkyla_equality_function_batch, alkyla_inequality_function_batch
 from tests.mock.mock_random import MockRandom
 
 
@@ -139,3 +147,324 @@ class TestPygosolnpFeatures(unittest.TestCase):
 
         expected = [19.262864952192448, 3.771726139520572, 69.77797447275604, 19.068793973427482, 19.33182084216137, 89.89207643509036, 16.299077190999093, 7.656803716342179, 3.6, 141.68084366746555, 16.527810282976148, 2.8024116596314954, 113.8847499219252, 41.913648375763266, 13.653863317763928, 89.36107961371863, 31.65003670354735, 6.742247466242993, 3.6, 144.41878023451304, 9.155674825062048, 10.587247668990255, 89.6903787978092, 38.29483391669842, 8.064799536849511, 89.43255250817325, 86.41114587298019, 5.961162104738718, 3.6, 147.6264662441887, 10.067591751749159, 13.136604255021913, 73.43265943827133, 44.724776804281476, 0.7740903344904604, 88.462319551243, 50.21684783727512, 5.77672041074722, 3.6, 145.39269004124904, 9.068225746042762, 12.61405383313014, 68.82767844281483, 16.611623195615945, 9.00169037647699, 85.31447609370339, 51.318693144764346, 9.28229782560638, 3.6, 150.88899802298727, 2.853206753025248, 13.650346506177705, 12.332917949430415, 43.013069327734556, 19.840074115550717, 91.20142486328595, 79.33118000010684, 3.8956025310633953, 3.6, 153.4160006648588, 0.6434958413807812, 2.9463400863302613, 102.90608010105203, 38.77132597397568, 3.023003386685923, 85.51893369450241, 59.20378581486704, 4.856217794173671, 3.6, 159.0155564965776, 19.650096860859275, 14.557888535778906, 24.793341705879453, 28.499566032377153, 12.098785988152493, 92.47510246654802, 44.847907830159485, 7.819085343574262, 3.6, 154.12786686990134, 8.266201078057069, 10.758463796133531, 0.2800364042800263, 23.509199466708623, 6.6730557487734306, 86.50613863644213, 65.27792963956803, 10.344369491252513, 3.6, 153.0090154093769, 13.044272915070119, 3.896854881633315, 86.85241703973514, 22.201841915524042, 17.718325429729628, 89.780805965076, 64.98014550674284, 8.237553597176323, 3.6, 150.8605530994913]
         self.assertListEqual(results.starting_guesses, expected)
+
+    def test_evaluation_chunk_size(self):
+        # Sobol sampling continues its sequence between chunks, so streaming evaluates exactly the same guesses
+        def run_solve(evaluation_chunk_size, number_of_processes):
+            return solve(obj_func=permutation_function,
+                         par_lower_limit=permutation_lower_bounds,
+                         par_upper_limit=permutation_upper_bounds,
+                         number_of_restarts=3,
+                         number_of_simulations=1000,
+                         number_of_processes=number_of_processes,
+                         start_guess_sampling=SobolSampling(parameter_lower_bounds=permutation_lower_bounds,
+                                                            parameter_upper_bounds=permutation_upper_bounds,
+                                                            seed=443),
+                         evaluation_chunk_size=evaluation_chunk_size,
+                         pysolnp_max_major_iter=100)
+
+        results = run_solve(evaluation_chunk_size=None, number_of_processes=None)
+        self.assertEqual(len(results.starting_guesses), 1000 * 4)
+
+        for number_of_processes in [None, 2]:
+            streamed_results = run_solve(evaluation_chunk_size=64, number_of_processes=number_of_processes)
+            # Only the guesses used for the restarts are kept when streaming
+            self.assertEqual(len(streamed_results.starting_guesses), 3 * 4)
+            self.assertListEqual([result.parameters for result in streamed_results.all_results],
+                                 [result.parameters for result in results.all_results])
+
+    def test_sample_in_workers(self):
+        # Starting guesses generated in the workers are the same regardless of the number of processes
+        def run_solve(number_of_processes, evaluation_chunk_size=None):
+            return solve(obj_func=permutation_function,
+                         par_lower_limit=permutation_lower_bounds,
+                         par_upper_limit=permutation_upper_bounds,
+                         number_of_restarts=3,
+                         number_of_simulations=5000,
+                         number_of_processes=number_of_processes,
+                         seed=443,
+                         evaluation_chunk_size=evaluation_chunk_size,
+                         sample_in_workers=True,
+                         pysolnp_max_major_iter=100)
+
+        results = run_solve(number_of_processes=None)
+        self.assertEqual(len(results.starting_guesses), 5000 * 4)
+
+        for number_of_processes in [1, 3]:
+            multiprocess_results = run_solve(number_of_processes=number_of_processes)
+            self.assertListEqual(multiprocess_results.starting_guesses, results.starting_guesses)
+            self.assertListEqual([result.parameters for result in multiprocess_results.all_results],
+                                 [result.parameters for result in results.all_results])
+
+        streamed_results = run_solve(number_of_processes=2, evaluation_chunk_size=2048)
+        self.assertListEqual([result.parameters for result in streamed_results.all_results],
+                             [result.parameters for result in results.all_results])
+
+    def test_batch_functions(self):
+        def run_solve(**batch_functions):
+            return solve(obj_func=alkyla_objective_function,
+                         par_lower_limit=parameter_lower_bounds,
+                         par_upper_limit=parameter_upper_bounds,
+                         eq_func=alkyla_equality_function,
+                         eq_values=equality_values,
+                         ineq_func=alkyla_inequality_function,
+                         ineq_lower_bounds=inequality_lower_bounds,
+                         ineq_upper_bounds=inequality_upper_bounds,
+                         number_of_restarts=2,
+                         number_of_simulations=5000,
+                         seed=443,
+                         evaluation_type=EvaluationType.PENALTY_BARRIER_FUNCTION,
+                         **batch_functions)
+
+        results = run_solve()
+        for batch_functions in [{"obj_func_batch": alkyla_objective_function_batch},
+                                {"obj_func_batch": alkyla_objective_function_batch,
+                                 "eq_func_batch": alkyla_equality_function_batch,
+                                 "ineq_func_batch": alkyla_inequality_function_batch},
+                                {"obj_func_batch": alkyla_objective_function_batch,
+                                 "ineq_func_batch": alkyla_inequality_function_batch,
+                                 "number_of_processes": 2}]:
+            batch_results = run_solve(**batch_functions)
+            self.assertListEqual(batch_results.starting_guesses, results.starting_guesses)
+            self.assertListEqual([result.parameters for result in batch_results.all_results],
+                                 [result.parameters for result in results.all_results])
+
+    def test_chunked_evaluation_scheduling(self):
+        # The evaluations are split into ranges differently per number of processes, the results are the same
+        def run_solve(number_of_processes, evaluation_chunk_size=None):
+            return solve(obj_func=alkyla_objective_function,
+                         par_lower_limit=parameter_lower_bounds,
+                         par_upper_limit=parameter_upper_bounds,
+                         eq_func=alkyla_equality_function,
+                         eq_values=equality_values,
+                         ineq_func=alkyla_inequality_function,
+                         ineq_lower_bounds=inequality_lower_bounds,
+                         ineq_upper_bounds=inequality_upper_bounds,
+                         number_of_restarts=2,
+                         number_of_simulations=3001,
+                         number_of_processes=number_of_processes,
+                         seed=443,
+                         evaluation_type=EvaluationType.PENALTY_BARRIER_FUNCTION,
+                         evaluation_chunk_size=evaluation_chunk_size)
+
+        for number_of_processes, evaluation_chunk_size in [(3, None), (3, 1000), (2, 37)]:
+            results = run_solve(number_of_processes=None, evaluation_chunk_size=evaluation_chunk_size)
+            multiprocess_results = run_solve(number_of_processes=number_of_processes,
+                                             evaluation_chunk_size=evaluation_chunk_size)
+            self.assertListEqual(multiprocess_results.starting_guesses, results.starting_guesses)
+            self.assertListEqual([result.parameters for result in multiprocess_results.all_results],
+                                 [result.parameters for result in results.all_results])
+
+    def test_early_restart_fraction(self):
+        def run_solve(number_of_processes, early_restart_fraction, **kwargs):
+            return solve(obj_func=alkyla_objective_function,
+                         par_lower_limit=parameter_lower_bounds,
+                         par_upper_limit=parameter_upper_bounds,
+                         eq_func=alkyla_equality_function,
+                         eq_values=equality_values,
+                         ineq_func=alkyla_inequality_function,
+                         ineq_lower_bounds=inequality_lower_bounds,
+                         ineq_upper_bounds=inequality_upper_bounds,
+                         number_of_restarts=3,
+                         number_of_simulations=2000,
+                         number_of_processes=number_of_processes,
+                         seed=443,
+                         evaluation_type=EvaluationType.PENALTY_BARRIER_FUNCTION,
+                         early_restart_fraction=early_restart_fraction,
+                         **kwargs)
+
+        results = run_solve(number_of_processes=None, early_restart_fraction=None)
+        for number_of_processes, early_restart_fraction, kwargs in [(None, 0.1, {}),
+                                                                   (2, 0.1, {}),
+                                                                   (2, 0.5, {"evaluation_chunk_size": 3000}),
+                                                                   (2, 1.0, {})]:
+            early_results = run_solve(number_of_processes=number_of_processes,
+                                      early_restart_fraction=early_restart_fraction,
+                                      **kwargs)
+            # The restarts of the final best guesses come first, early restarts of replaced guesses are added
+            self.assertListEqual(early_results.starting_guesses, results.starting_guesses)
+            self.assertListEqual(early_results.all_results[:3], results.all_results)
+            self.assertLessEqual(len(early_results.all_results), 6)
+
+        # Only the restarts that are replaced by better guesses are extra
+        self.assertEqual(len(run_solve(number_of_processes=2, early_restart_fraction=1.0).all_results), 3)
+
+    def test_restart_result_details(self):
+        # The workers evaluate each optimum, so the results match evaluating the problem functions at the parameters
+        for number_of_processes in [None, 2]:
+            results = solve(obj_func=alkyla_objective_function,
+                            par_lower_limit=parameter_lower_bounds,
+                            par_upper_limit=parameter_upper_bounds,
+                            eq_func=alkyla_equality_function,
+                            eq_values=equality_values,
+                            ineq_func=alkyla_inequality_function,
+                            ineq_lower_bounds=inequality_lower_bounds,
+                            ineq_upper_bounds=inequality_upper_bounds,
+                            number_of_restarts=4,
+                            number_of_simulations=2000,
+                            seed=443,
+                            number_of_processes=number_of_processes,
+                            evaluation_type=EvaluationType.PENALTY_BARRIER_FUNCTION)
+            for result in results.all_results:
+                self.assertEqual(result.obj_value, alkyla_objective_function(result.parameters))
+                self.assertListEqual(result.eq_func_values, list(alkyla_equality_function(result.parameters)))
+                self.assertListEqual(result.ineq_func_values, list(alkyla_inequality_function(result.parameters)))
+                self.assertIsInstance(result.pysolnp_converged, bool)
+            self.assertTrue(any(result.converged for result in results.all_results))
+
+        results = solve(obj_func=permutation_function,
+                        par_lower_limit=permutation_lower_bounds,
+                        par_upper_limit=permutation_upper_bounds,
+                        number_of_restarts=2,
+                        number_of_simulations=500,
+                        seed=443)
+        for result in results.all_results:
+            self.assertIsNone(result.eq_func_values)
+            self.assertIsNone(result.ineq_func_values)
+
+    def test_columnar_results(self):
+        # The arrays of the Results hold the same values as the Result of each restart
+        results = solve(obj_func=permutation_function,
+                        par_lower_limit=permutation_lower_bounds,
+                        par_upper_limit=permutation_upper_bounds,
+                        number_of_restarts=3,
+                        number_of_simulations=500,
+                        seed=443,
+                        pysolnp_max_major_iter=100)
+        self.assertIs(results.best_solution, results.best_solution)
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results.starting_guess_array.shape, (500, 4))
+        self.assertEqual(results.starting_guess_scores.shape, (500,))
+        self.assertListEqual(results.starting_guess_array.reshape(-1).tolist(), results.starting_guesses)
+        self.assertListEqual(results.starting_guess_scores.tolist(),
+                             [permutation_function(guess) for guess in results.starting_guess_array.tolist()])
+        for index, result in enumerate(results.all_results):
+            self.assertEqual(results[index], result)
+            self.assertListEqual(results.parameters[index].tolist(), result.parameters)
+            self.assertEqual(results.obj_values[index], result.obj_value)
+            self.assertEqual(results.converged[index], result.converged)
+
+        converged_results = [result for result in results.all_results if result.converged]
+        self.assertEqual(results.best_solution, min(converged_results, key=lambda result: result.obj_value))
+
+    def test_memmap_dir(self):
+        # The buffers in memory-mapped files give the same results, and the files are kept for later analysis
+        arguments = {"obj_func": permutation_function,
+                     "par_lower_limit": permutation_lower_bounds,
+                     "par_upper_limit": permutation_upper_bounds,
+                     "number_of_restarts": 3,
+                     "number_of_simulations": 500,
+                     "seed": 443,
+                     "pysolnp_max_major_iter": 100}
+        for number_of_processes in [None, 2]:
+            expected_results = solve(**arguments, number_of_processes=number_of_processes)
+            with tempfile.TemporaryDirectory() as memmap_dir:
+                results = solve(**arguments, number_of_processes=number_of_processes, memmap_dir=memmap_dir)
+                self.assertListEqual(results.all_results, expected_results.all_results)
+                self.assertListEqual(results.starting_guesses, expected_results.starting_guesses)
+
+                eval_results = numpy.load(os.path.join(memmap_dir, "eval_results.npy"), mmap_mode="r")
+                self.assertListEqual(eval_results.tolist(), results.starting_guess_scores.tolist())
+                parameter_guesses = numpy.load(os.path.join(memmap_dir, "parameter_guesses.npy"), mmap_mode="r")
+                self.assertListEqual(parameter_guesses[:500].tolist(), results.starting_guess_array.tolist())
+                del eval_results, parameter_guesses, results
+
+    def test_restart_clustering(self):
+        # On a problem with a single basin the best guesses crowd around the optimum, clustering spreads them out. The
+        # guesses that the restarts started from are read from the checkpoint.
+        def objective_function(parameters):
+            return (parameters[0] - 1.0) ** 2 + (parameters[1] - 1.0) ** 2
+
+        arguments = {"obj_func": objective_function,
+                     "par_lower_limit": [-10.0, -10.0],
+                     "par_upper_limit": [10.0, 10.0],
+                     "number_of_restarts": 8,
+                     "number_of_simulations": 2000}
+        critical_distance = ProblemModel(**arguments, restart_clustering=True).critical_distance
+        for evaluation_chunk_size in [None, 300]:
+            for restart_clustering in [False, True]:
+                with tempfile.TemporaryDirectory() as checkpoint_dir:
+                    results = solve(**arguments, seed=1, evaluation_chunk_size=evaluation_chunk_size,
+                                    restart_clustering=restart_clustering, checkpoint_dir=checkpoint_dir)
+                    fingerprint, = os.listdir(checkpoint_dir)
+                    with numpy.load(os.path.join(checkpoint_dir, fingerprint, "restarts.npz")) as restarts:
+                        guesses = restarts["started_guesses"] / 20.0
+                self.assertEqual(len(results), 8)
+                self.assertAlmostEqual(results.best_solution.obj_value, 0.0, places=6)
+                distances = numpy.sqrt(((guesses[:, None, :] - guesses[None, :, :]) ** 2).sum(axis=2))
+                closest_distance = distances[~numpy.eye(len(guesses), dtype=bool)].min()
+                if restart_clustering:
+                    self.assertGreater(closest_distance, critical_distance)
+                else:
+                    self.assertLess(closest_distance, critical_distance)
+
+    def test_mlsl_rounds(self):
+        # Himmelblau's function has four minima, which MLSL finds with far fewer restarts than number_of_restarts
+        def himmelblau_function(parameters):
+            return (parameters[0] ** 2 + parameters[1] - 11.0) ** 2 + (parameters[0] + parameters[1] ** 2 - 7.0) ** 2
+
+        arguments = {"obj_func": himmelblau_function,
+                     "par_lower_limit": [-5.0, -5.0],
+                     "par_upper_limit": [5.0, 5.0],
+                     "number_of_restarts": 50,
+                     "number_of_simulations": 100,
+                     "mlsl_rounds": 20,
+                     "seed": 3,
+                     "pysolnp_max_major_iter": 100}
+        results = solve(**arguments)
+        self.assertLess(len(results), 50)
+        self.assertTrue(results.converged.all())
+        self.assertEqual(len(numpy.unique(numpy.round(results.parameters, 3), axis=0)), 4)
+        # The reported starting guesses are the best guess of each round
+        self.assertEqual(len(results.starting_guess_scores), 20)
+        self.assertListEqual(solve(**arguments, number_of_processes=2).all_results, results.all_results)
+
+        # A single basin is taken to be the only one after eight restarts, the remaining rounds are not evaluated
+        def quadratic_function(parameters):
+            return (parameters[0] - 1.0) ** 2 + (parameters[1] - 1.0) ** 2
+
+        results = solve(obj_func=quadratic_function,
+                        par_lower_limit=[-10.0, -10.0],
+                        par_upper_limit=[10.0, 10.0],
+                        number_of_restarts=100,
+                        number_of_simulations=10000,
+                        mlsl_rounds=100,
+                        seed=1,
+                        pysolnp_max_major_iter=100)
+        self.assertEqual(len(results), 8)
+        self.assertLess(len(results.starting_guess_scores), 1000)
+        self.assertFalse(results.is_partial)
+        for result in results.all_results:
+            self.assertAlmostEqual(result.obj_value, 0.0, places=6)
+
+    def test_racing_survivors(self):
+        # The raced restarts spend far fewer objective function calls on the restarts that do not lead to the optimum
+        number_of_calls = [0]
+
+        def objective_function(parameters):
+            number_of_calls[0] += 1
+            return alkyla_objective_function(parameters)
+
+        arguments = {"obj_func": objective_function,
+                     "par_lower_limit": parameter_lower_bounds,
+                     "par_upper_limit": parameter_upper_bounds,
+                     "eq_func": alkyla_equality_function,
+                     "eq_values": equality_values,
+                     "ineq_func": alkyla_inequality_function,
+                     "ineq_lower_bounds": inequality_lower_bounds,
+                     "ineq_upper_bounds": inequality_upper_bounds,
+                     "number_of_restarts": 16,
+                     "number_of_simulations": 2000,
+                     "evaluation_type": EvaluationType.PENALTY_BARRIER_FUNCTION,
+                     "seed": 0,
+                     "pysolnp_max_major_iter": 100}
+        expected_results = solve(**arguments)
+        expected_number_of_calls = number_of_calls[0]
+        number_of_calls[0] = 0
+        results = solve(**arguments, racing_survivors=2)
+
+        # Every restart is reported, the ones that were not raced to the end with their last optimum
+        self.assertEqual(len(results), 16)
+        self.assertLess(number_of_calls[0], expected_number_of_calls / 4)
+        self.assertAlmostEqual(numpy.nanmin(results.obj_values[results.converged]),
+                               numpy.nanmin(expected_results.obj_values[expected_results.converged]), places=3)
@@ -0,0 +1,111 @@
+import unittest
+
+import numpy
+
+from pygosolnp.benchmarks.permutations import permutation_function, \
+    parameter_lower_bounds as permutation_lower_bounds, parameter_upper_bounds as permutation_upper_bounds
+from pygosolnp.evaluation_functions import penalty_barrier_function
+from pygosolnp.pygosolnp import solve, EvaluationType
+from tests.resources import alkyla_equality_function, parameter_lower_bounds, parameter_upper_bounds, \
+    alkyla_inequality_function, alkyla_objective_function, inequality_lower_bounds, inequality_upper_bounds, \
+    equality_values
+
+
+class TestPygosolnpIncremental(unittest.TestCase):
+
+    def test_changed_bounds(self):
+        # Only the samples outside the bounds of the earlier solve are evaluated
+        evaluated_guesses = []
+
+        def obj_func_batch(guesses):
+            evaluated_guesses.extend(guesses.tolist())
+            return [permutation_function(guess) for guess in guesses.tolist()]
+
+        arguments = {"obj_func": permutation_function,
+                     "obj_func_batch": obj_func_batch,
+                     "number_of_restarts": 2,
+                     "number_of_simulations": 500,
+                     "seed": 443,
+                     "pysolnp_max_major_iter": 100}
+        results = solve(**arguments,
+                        par_lower_limit=permutation_lower_bounds,
+                        par_upper_limit=permutation_upper_bounds)
+        self.assertIsNotNone(results.evaluation_settings)
+
+        lower_bounds = [bound + 1.0 for bound in permutation_lower_bounds]
+        upper_bounds = [bound + 1.0 for bound in permutation_upper_bounds]
+        evaluated_guesses.clear()
+        incremental_results = solve(**arguments,
+                                    par_lower_limit=lower_bounds,
+                                    par_upper_limit=upper_bounds,
+                                    evaluation_chunk_size=100,
+                                    previous_results=results)
+        self.assertLess(len(evaluated_guesses), 500)
+
+        # Without chunks the Results hold the reused guesses followed by the evaluated ones
+        evaluated_guesses.clear()
+        incremental_results = solve(**arguments,
+                                    par_lower_limit=lower_bounds,
+                                    par_upper_limit=upper_bounds,
+                                    previous_results=results)
+        is_inside = ((results.starting_guess_array >= lower_bounds) &
+                     (results.starting_guess_array <= upper_bounds)).all(axis=1)
+        number_of_reused_guesses = int(is_inside.sum())
+        self.assertListEqual(incremental_results.starting_guess_array[:number_of_reused_guesses].tolist(),
+                             results.starting_guess_array[is_inside].tolist())
+        self.assertListEqual(incremental_results.starting_guess_scores[:number_of_reused_guesses].tolist(),
+                             results.starting_guess_scores[is_inside].tolist())
+        new_guesses = incremental_results.starting_guess_array[number_of_reused_guesses:]
+        self.assertFalse(((new_guesses >= permutation_lower_bounds) &
+                          (new_guesses <= permutation_upper_bounds)).all(axis=1).any())
+        self.assertListEqual(new_guesses.tolist(), evaluated_guesses)
+
+    def test_streamed_previous_results(self):
+        # Streamed Results only keep the best guesses, so the bounds of the earlier solve are sampled again
+        arguments = {"obj_func": lambda parameters: (parameters[0] - 0.8) ** 2 + (parameters[1] - 0.8) ** 2,
+                     "number_of_restarts": 2,
+                     "number_of_simulations": 1000,
+                     "seed": 443,
+                     "evaluation_chunk_size": 100}
+        results = solve(**arguments, par_lower_limit=[0.0, 0.0], par_upper_limit=[1.0, 1.0])
+        self.assertFalse(results.has_all_guesses)
+        self.assertEqual(len(results.starting_guess_array), 2)
+
+        # The best guesses of the earlier solve are outside the new bounds, so all the guesses are new samples
+        incremental_results = solve(**arguments, par_lower_limit=[0.0, 0.0], par_upper_limit=[0.5, 0.5],
+                                    previous_results=results)
+        self.assertEqual(len(incremental_results.starting_guess_array), 2)
+        self.assertAlmostEqual(incremental_results.best_solution.obj_value, 0.18, places=3)
+
+    def test_changed_constraints(self):
+        # The penalty barrier scores are evaluated again when the equality values change
+        arguments = {"obj_func": alkyla_objective_function,
+                     "par_lower_limit": parameter_lower_bounds,
+                     "par_upper_limit": parameter_upper_bounds,
+                     "eq_func": alkyla_equality_function,
+                     "ineq_func": alkyla_inequality_function,
+                     "ineq_lower_bounds": inequality_lower_bounds,
+                     "ineq_upper_bounds": inequality_upper_bounds,
+                     "number_of_restarts": 2,
+                     "number_of_simulations": 500,
+                     "seed": 443,
+                     "evaluation_type": EvaluationType.PENALTY_BARRIER_FUNCTION}
+        results = solve(**arguments, eq_values=equality_values)
+        changed_eq_values = [value + 0.01 for value in equality_values]
+        incremental_results = solve(**arguments, eq_values=changed_eq_values, previous_results=results)
+
+        # The bounds are the same, so the guesses are all reused and no new samples are evaluated
+        self.assertListEqual(incremental_results.starting_guess_array.tolist(), results.starting_guess_array.tolist())
+        expected_scores = [penalty_barrier_function(variables=guess,
+                                                    obj_func=alkyla_objective_function,
+                                                    eq_func=alkyla_equality_function,
+                                                    eq_values=changed_eq_values,
+                                                    ineq_func=alkyla_inequality_function,
+                                                    ineq_lower_bounds=inequality_lower_bounds,
+                                                    ineq_upper_bounds=inequality_upper_bounds)
+                           for guess in results.starting_guess_array.tolist()]
+        numpy.testing.assert_allclose(incremental_results.starting_guess_scores, expected_scores)
+
+
+if __name__ == '__main__':
+    unittest.main()
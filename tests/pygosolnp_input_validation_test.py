@@ -2,7 +2,7 @@ import itertools
 import unittest
 
 from pygosolnp.pygosolnp import solve
-from pygosolnp.sampling import NormalDistribution
+from pygosolnp.sampling import NormalDistribution, Sampling
 from .resources import alkyla_equality_function, parameter_lower_bounds, parameter_upper_bounds, \
     alkyla_inequality_function, alkyla_objective_function, inequality_lower_bounds, inequality_upper_bounds, \
     equality_values
@@ -271,3 +271,160 @@ class TestPygosolnpInputValidation(unittest.TestCase):
                   eq_values=equality_values,
                   pysolnp_max_major_iter=0)
 
+
+    def test_bad_evaluation_chunk_size(self):
+        with self.assertRaises(ValueError):
+            solve(obj_func=alkyla_objective_function,
+                  par_lower_limit=parameter_lower_bounds,
+                  par_upper_limit=parameter_upper_bounds,
+                  evaluation_chunk_size=0)
+
+        with self.assertRaises(ValueError):
+            solve(obj_func=alkyla_objective_function,
+                  par_lower_limit=parameter_lower_bounds,
+                  par_upper_limit=parameter_upper_bounds,
+                  evaluation_chunk_size=100.0)
+
+    def test_bad_sample_in_workers(self):
+        with self.assertRaises(ValueError):
+            solve(obj_func=alkyla_objective_function,
+                  par_lower_limit=parameter_lower_bounds,
+                  par_upper_limit=parameter_upper_bounds,
+                  sample_in_workers="yes")
+
+        class ListSampling(Sampling):
+            def generate_sample(self, sample_size: int):
+                return [1.0] * sample_size
+
+        # Samplings need to support indexed samples to be used in the worker processes
+        with self.assertRaises(ValueError):
+            solve(obj_func=alkyla_objective_function,
+                  par_lower_limit=parameter_lower_bounds,
+                  par_upper_limit=parameter_upper_bounds,
+                  start_guess_sampling=ListSampling(),
+                  sample_in_workers=True)
+
+    def test_bad_early_restart_fraction(self):
+        for early_restart_fraction in [0.0, 1.5, -0.5, "half", True]:
+            with self.assertRaises(ValueError):
+                solve(obj_func=alkyla_objective_function,
+                      par_lower_limit=parameter_lower_bounds,
+                      par_upper_limit=parameter_upper_bounds,
+                      early_restart_fraction=early_restart_fraction)
+
+    def test_bad_time_budget(self):
+        for time_budget in [0.0, -1.0, "1s", True]:
+            with self.assertRaises(ValueError):
+                solve(obj_func=alkyla_objective_function,
+                      par_lower_limit=parameter_lower_bounds,
+                      par_upper_limit=parameter_upper_bounds,
+                      time_budget=time_budget)
+
+    def test_bad_target_obj_value(self):
+        for target_obj_value in ["0", True]:
+            with self.assertRaises(ValueError):
+                solve(obj_func=alkyla_objective_function,
+                      par_lower_limit=parameter_lower_bounds,
+                      par_upper_limit=parameter_upper_bounds,
+                      target_obj_value=target_obj_value)
+
+    def test_bad_min_feasible_solutions(self):
+        for min_feasible_solutions in [0, 1.0, True]:
+            with self.assertRaises(ValueError):
+                solve(obj_func=alkyla_objective_function,
+                      par_lower_limit=parameter_lower_bounds,
+                      par_upper_limit=parameter_upper_bounds,
+                      target_obj_value=0.0,
+                      min_feasible_solutions=min_feasible_solutions)
+
+    def test_bad_checkpoint(self):
+        for checkpoint_dir, resume in [(1, False), (None, True), ("checkpoints", 1)]:
+            with self.assertRaises(ValueError):
+                solve(obj_func=alkyla_objective_function,
+                      par_lower_limit=parameter_lower_bounds,
+                      par_upper_limit=parameter_upper_bounds,
+                      checkpoint_dir=checkpoint_dir,
+                      resume=resume)
+
+    def test_bad_memmap_dir(self):
+        with self.assertRaises(ValueError):
+            solve(obj_func=alkyla_objective_function,
+                  par_lower_limit=parameter_lower_bounds,
+                  par_upper_limit=parameter_upper_bounds,
+                  memmap_dir=1)
+
+    def test_bad_warm_start(self):
+        for warm_start_dir, warm_start_tag in [(1, None), ("warm_start", 1)]:
+            with self.assertRaises(ValueError):
+                solve(obj_func=alkyla_objective_function,
+                      par_lower_limit=parameter_lower_bounds,
+                      par_upper_limit=parameter_upper_bounds,
+                      warm_start_dir=warm_start_dir,
+                      warm_start_tag=warm_start_tag)
+
+    def test_bad_previous_results(self):
+        with self.assertRaises(ValueError):
+            solve(obj_func=alkyla_objective_function,
+                  par_lower_limit=parameter_lower_bounds,
+                  par_upper_limit=parameter_upper_bounds,
+                  previous_results=[])
+
+    def test_bad_restart_clustering(self):
+        with self.assertRaises(ValueError):
+            solve(obj_func=alkyla_objective_function,
+                  par_lower_limit=parameter_lower_bounds,
+                  par_upper_limit=parameter_upper_bounds,
+                  restart_clustering=1)
+
+    def test_bad_mlsl_rounds(self):
+        with self.assertRaises(ValueError):
+            solve(obj_func=alkyla_objective_function,
+                  par_lower_limit=parameter_lower_bounds,
+                  par_upper_limit=parameter_upper_bounds,
+                  mlsl_rounds=0)
+
+        # The rounds decide how the guesses are evaluated, so the options that change this can not be combined with them
+        with self.assertRaises(ValueError):
+            solve(obj_func=alkyla_objective_function,
+                  par_lower_limit=parameter_lower_bounds,
+                  par_upper_limit=parameter_upper_bounds,
+                  mlsl_rounds=10,
+                  evaluation_chunk_size=100)
+
+    def test_bad_racing_survivors(self):
+        with self.assertRaises(ValueError):
+            solve(obj_func=alkyla_objective_function,
+                  par_lower_limit=parameter_lower_bounds,
+                  par_upper_limit=parameter_upper_bounds,
+                  racing_survivors=0)
+
+        with self.assertRaises(ValueError):
+            solve(obj_func=alkyla_objective_function,
+                  par_lower_limit=parameter_lower_bounds,
+                  par_upper_limit=parameter_upper_bounds,
+                  racing_survivors=2,
+                  mlsl_rounds=10)
+
+    def test_bad_batch_functions(self):
+        # Batch callbacks must be callable
+        with self.assertRaises(ValueError):
+            solve(obj_func=alkyla_objective_function,
+                  par_lower_limit=parameter_lower_bounds,
+                  par_upper_limit=parameter_upper_bounds,
+                  obj_func_batch=[1, 2, 3])
+
+        # Batch callbacks are only used for the evaluations, pysolnp needs the regular callbacks
+        with self.assertRaises(ValueError):
+            solve(obj_func=alkyla_objective_function,
+                  par_lower_limit=parameter_lower_bounds,
+                  par_upper_limit=parameter_upper_bounds,
+                  eq_func_batch=alkyla_equality_function,
+                  eq_values=equality_values)
+
+        with self.assertRaises(ValueError):
+            solve(obj_func=alkyla_objective_function,
+                  par_lower_limit=parameter_lower_bounds,
+                  par_upper_limit=parameter_upper_bounds,
+                  ineq_func_batch=alkyla_inequality_function,
+                  ineq_lower_bounds=inequality_lower_bounds,
+                  ineq_upper_bounds=inequality_upper_bounds)
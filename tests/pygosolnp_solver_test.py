@@ -0,0 +1,105 @@
+import unittest
+
+from pygosolnp.benchmarks.permutations import permutation_function, \
+    parameter_lower_bounds as permutation_lower_bounds, parameter_upper_bounds as permutation_upper_bounds
+from pygosolnp.pygosolnp import solve, solve_iter, Solver, EvaluationType
+from tests.resources import alkyla_equality_function, parameter_lower_bounds, parameter_upper_bounds, \
+    alkyla_inequality_function, alkyla_objective_function, inequality_lower_bounds, inequality_upper_bounds, \
+    equality_values
+
+
+class TestPygosolnpSolver(unittest.TestCase):
+
+    def test_solver_session(self):
+        # Repeated solves in one session give the same results as separate solve calls
+        runs = [{"seed": 443, "par_lower_limit": permutation_lower_bounds},
+                {"seed": 444, "par_lower_limit": [-2.0] * 4},
+                {"seed": 443, "par_lower_limit": permutation_lower_bounds, "sample_in_workers": True}]
+        for number_of_processes in [None, 2]:
+            with Solver(obj_func=permutation_function, number_of_processes=number_of_processes) as solver:
+                for run in runs:
+                    results = solver.solve(par_upper_limit=permutation_upper_bounds,
+                                           number_of_restarts=2,
+                                           number_of_simulations=500,
+                                           pysolnp_max_major_iter=100,
+                                           **run)
+                    expected_results = solve(obj_func=permutation_function,
+                                             par_upper_limit=permutation_upper_bounds,
+                                             number_of_restarts=2,
+                                             number_of_simulations=500,
+                                             pysolnp_max_major_iter=100,
+                                             **run)
+                    self.assertListEqual(results.starting_guesses, expected_results.starting_guesses)
+                    self.assertListEqual(results.all_results, expected_results.all_results)
+
+            self.assertTrue(solver.is_closed)
+            with self.assertRaises(ValueError):
+                solver.solve(par_lower_limit=permutation_lower_bounds, par_upper_limit=permutation_upper_bounds)
+
+    def test_solver_session_constraints(self):
+        # The registered constraint functions are only used in the runs that supply their bounds
+        with Solver(obj_func=alkyla_objective_function,
+                    eq_func=alkyla_equality_function,
+                    ineq_func=alkyla_inequality_function,
+                    number_of_processes=2) as solver:
+            for eq_values in [equality_values, None]:
+                results = solver.solve(par_lower_limit=parameter_lower_bounds,
+                                       par_upper_limit=parameter_upper_bounds,
+                                       eq_values=eq_values,
+                                       ineq_lower_bounds=inequality_lower_bounds,
+                                       ineq_upper_bounds=inequality_upper_bounds,
+                                       number_of_restarts=2,
+                                       number_of_simulations=2000,
+                                       seed=443,
+                                       evaluation_type=EvaluationType.PENALTY_BARRIER_FUNCTION)
+                expected_results = solve(obj_func=alkyla_objective_function,
+                                         par_lower_limit=parameter_lower_bounds,
+                                         par_upper_limit=parameter_upper_bounds,
+                                         eq_func=alkyla_equality_function if eq_values is not None else None,
+                                         eq_values=eq_values,
+                                         ineq_func=alkyla_inequality_function,
+                                         ineq_lower_bounds=inequality_lower_bounds,
+                                         ineq_upper_bounds=inequality_upper_bounds,
+                                         number_of_restarts=2,
+                                         number_of_simulations=2000,
+                                         seed=443,
+                                         evaluation_type=EvaluationType.PENALTY_BARRIER_FUNCTION)
+                self.assertListEqual(results.all_results, expected_results.all_results)
+
+    def test_bad_solver_number_of_processes(self):
+        with self.assertRaises(ValueError):
+            Solver(obj_func=permutation_function, number_of_processes=0)
+
+    def test_solve_iter(self):
+        # The iterated results are the results of solve in the order the restarts finish
+        for number_of_processes in [None, 2]:
+            for early_restart_fraction in [None, 0.1]:
+                arguments = {"obj_func": permutation_function,
+                             "par_lower_limit": permutation_lower_bounds,
+                             "par_upper_limit": permutation_upper_bounds,
+                             "number_of_restarts": 3,
+                             "number_of_simulations": 500,
+                             "number_of_processes": number_of_processes,
+                             "seed": 443,
+                             "early_restart_fraction": early_restart_fraction,
+                             "pysolnp_max_major_iter": 100}
+                iterated_results = list(solve_iter(**arguments))
+                expected_results = solve(**arguments)
+                self.assertCountEqual(iterated_results, expected_results.all_results)
+
+        with Solver(obj_func=permutation_function, number_of_processes=2) as solver:
+            iterator = solver.solve_iter(par_lower_limit=permutation_lower_bounds,
+                                         par_upper_limit=permutation_upper_bounds,
+                                         number_of_restarts=2,
+                                         number_of_simulations=500,
+                                         seed=443)
+            self.assertEqual(len(list(iterator)), 2)
+
+    def test_solve_iter_validation(self):
+        # The inputs are validated when solve_iter is called rather than when the iteration starts
+        with self.assertRaises(ValueError):
+            solve_iter(obj_func=permutation_function,
+                       par_lower_limit=permutation_lower_bounds,
+                       par_upper_limit=permutation_upper_bounds,
+                       number_of_restarts=0,
+                       number_of_processes=2)
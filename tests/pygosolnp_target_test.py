@@ -0,0 +1,50 @@
+import unittest
+
+from pygosolnp.benchmarks.permutations import permutation_function, \
+    parameter_lower_bounds as permutation_lower_bounds, parameter_upper_bounds as permutation_upper_bounds
+from pygosolnp.pygosolnp import solve, solve_iter
+
+
+class TestPygosolnpTarget(unittest.TestCase):
+    arguments = {"obj_func": permutation_function,
+                 "par_lower_limit": permutation_lower_bounds,
+                 "par_upper_limit": permutation_upper_bounds,
+                 "number_of_restarts": 6,
+                 "number_of_simulations": 2000,
+                 "seed": 443,
+                 "pysolnp_max_major_iter": 100}
+
+    def test_unreached_target(self):
+        # A target that no restart reaches gives the same results as no target
+        for number_of_processes in [None, 2]:
+            expected_results = solve(**self.arguments, number_of_processes=number_of_processes)
+            results = solve(**self.arguments, number_of_processes=number_of_processes, target_obj_value=-1.0)
+            self.assertFalse(results.is_partial)
+            self.assertListEqual(results.all_results, expected_results.all_results)
+            self.assertListEqual(results.starting_guesses, expected_results.starting_guesses)
+
+    def test_target_during_restarts(self):
+        # The remaining restarts are cancelled once enough restarts reach the target
+        for number_of_processes in [None, 2]:
+            for min_feasible_solutions in [1, 2]:
+                results = solve(**self.arguments,
+                                number_of_processes=number_of_processes,
+                                target_obj_value=0.5,
+                                min_feasible_solutions=min_feasible_solutions)
+                self.assertFalse(results.is_partial)
+                self.assertLess(len(results.all_results), self.arguments["number_of_restarts"])
+                self.assertGreaterEqual(len([result for result in results.all_results if result.obj_value <= 0.5]),
+                                        min_feasible_solutions)
+
+        iterated_results = list(solve_iter(**self.arguments, target_obj_value=0.5))
+        self.assertEqual(len(iterated_results), 1)
+        self.assertLessEqual(iterated_results[0].obj_value, 0.5)
+
+    def test_target_during_evaluations(self):
+        # Every starting guess reaches the target, so the evaluations stop after the first round
+        for number_of_processes in [None, 2]:
+            results = solve(**self.arguments, number_of_processes=number_of_processes, target_obj_value=1e6)
+            self.assertFalse(results.is_partial)
+            self.assertEqual(len(results.all_results), 1)
+            self.assertLess(len(results.starting_guesses),
+                            self.arguments["number_of_simulations"] * len(permutation_lower_bounds))
@@ -0,0 +1,86 @@
+import asyncio
+import sys
+import time
+import unittest
+
+from pygosolnp.backends import ThreadBackend
+from pygosolnp.benchmarks.permutations import permutation_function, \
+    parameter_lower_bounds as permutation_lower_bounds, parameter_upper_bounds as permutation_upper_bounds
+from pygosolnp.pygosolnp import solve, solve_iter, Solver
+from tests.resources import slow_permutation_function
+
+
+class TestPygosolnpTimeBudget(unittest.TestCase):
+    arguments = {"par_lower_limit": permutation_lower_bounds,
+                 "par_upper_limit": permutation_upper_bounds,
+                 "number_of_restarts": 2,
+                 "number_of_simulations": 20,
+                 "seed": 443,
+                 "pysolnp_max_major_iter": 400,
+                 "pysolnp_max_minor_iter": 800}
+
+    def test_unused_time_budget(self):
+        # A time budget that does not run out gives the same results as no time budget
+        arguments = dict(self.arguments, obj_func=permutation_function, number_of_simulations=2000,
+                         early_restart_fraction=0.5)
+        for backend_factory in [lambda: {}, lambda: {"number_of_processes": 2},
+                                lambda: {"backend": ThreadBackend(number_of_threads=2)}]:
+            expected_results = solve(**arguments, **backend_factory())
+            results = solve(**arguments, time_budget=100.0, **backend_factory())
+            self.assertFalse(results.is_partial)
+            self.assertListEqual(results.all_results, expected_results.all_results)
+            self.assertListEqual(results.starting_guesses, expected_results.starting_guesses)
+
+    def test_time_budget_during_evaluations(self):
+        # Each evaluation takes about 10 ms, so the evaluations are stopped and no restarts are run
+        for backend_factory in [lambda: {}, lambda: {"number_of_processes": 2},
+                                lambda: {"backend": ThreadBackend(number_of_threads=2)}]:
+            start_time = time.monotonic()
+            results = solve(obj_func=slow_permutation_function,
+                            **dict(self.arguments, number_of_simulations=1000),
+                            time_budget=0.5,
+                            **backend_factory())
+            self.assertLess(time.monotonic() - start_time, 3.0)
+            self.assertTrue(results.is_partial)
+            self.assertListEqual(results.all_results, [])
+            self.assertIsNone(results.best_solution)
+            self.assertLess(len(results.starting_guesses), 1000 * len(permutation_lower_bounds))
+
+    def test_time_budget_during_restarts(self):
+        # The running restarts take several seconds and are stopped by terminating the processes
+        start_time = time.monotonic()
+        results = solve(obj_func=slow_permutation_function, **self.arguments, number_of_processes=2, time_budget=1.0)
+        self.assertLess(time.monotonic() - start_time, 3.0)
+        self.assertTrue(results.is_partial)
+        self.assertListEqual(results.all_results, [])
+
+        self.assertListEqual(
+            list(solve_iter(obj_func=slow_permutation_function, **self.arguments, number_of_processes=2,
+                            time_budget=1.0)), [])
+
+    def test_time_budget_in_session(self):
+        quick_arguments = dict(self.arguments, pysolnp_max_major_iter=1, pysolnp_max_minor_iter=1)
+        expected_results = solve(obj_func=slow_permutation_function, **quick_arguments)
+        with Solver(obj_func=slow_permutation_function, number_of_processes=2) as solver:
+            results = solver.solve(**self.arguments, time_budget=1.0)
+            self.assertTrue(results.is_partial)
+
+            # The processes that were replaced to stop the restarts run the next solve as usual
+            results = solver.solve(**quick_arguments)
+            self.assertFalse(results.is_partial)
+            self.assertListEqual(results.all_results, expected_results.all_results)
+
+    @unittest.skipIf(sys.version_info < (3, 7), "Requires asyncio.run")
+    def test_time_budget_with_concurrent_solve(self):
+        other_arguments = dict(self.arguments, seed=444, number_of_restarts=1)
+        expected_results = solve(obj_func=slow_permutation_function, **other_arguments)
+        with Solver(obj_func=slow_permutation_function, number_of_processes=2) as solver:
+            async def solve_concurrently():
+                return await asyncio.gather(solver.solve_async(**self.arguments, time_budget=1.0),
+                                            solver.solve_async(**other_arguments))
+
+            # The running tasks of the other solve are submitted again when the processes are replaced
+            cancelled_results, other_results = asyncio.run(solve_concurrently())
+            self.assertTrue(cancelled_results.is_partial)
+            self.assertFalse(other_results.is_partial)
+            self.assertListEqual(other_results.all_results, expected_results.all_results)
@@ -0,0 +1,87 @@
+import tempfile
+import unittest
+
+import numpy
+
+from pygosolnp.benchmarks.permutations import permutation_function, \
+    parameter_lower_bounds as permutation_lower_bounds, parameter_upper_bounds as permutation_upper_bounds
+from pygosolnp.pygosolnp import solve
+from pygosolnp.warm_start import WarmStartStore, warm_start_key, jittered_points, WARM_START_COPIES
+
+
+class TestPygosolnpWarmStart(unittest.TestCase):
+    arguments = {"obj_func": permutation_function,
+                 "par_lower_limit": permutation_lower_bounds,
+                 "par_upper_limit": permutation_upper_bounds,
+                 "pysolnp_max_major_iter": 100}
+
+    def test_warm_start_store(self):
+        with tempfile.TemporaryDirectory() as warm_start_dir:
+            store = WarmStartStore(directory=warm_start_dir,
+                                   key=warm_start_key(obj_func=permutation_function, number_of_parameters=2),
+                                   size=2)
+            parameters, obj_values = store.load()
+            self.assertEqual(len(parameters), 0)
+
+            # The best optima are kept once, best first
+            store.record(parameters=numpy.array([[1.0, 1.0], [2.0, 2.0]]), obj_values=numpy.array([3.0, 2.0]))
+            store.record(parameters=numpy.array([[2.0, 2.0], [3.0, 3.0]]), obj_values=numpy.array([2.0, 1.0]))
+            parameters, obj_values = store.load()
+            self.assertListEqual(parameters.tolist(), [[3.0, 3.0], [2.0, 2.0]])
+            self.assertListEqual(obj_values.tolist(), [1.0, 2.0])
+
+        self.assertNotEqual(warm_start_key(obj_func=permutation_function, number_of_parameters=2),
+                            warm_start_key(obj_func=permutation_function, number_of_parameters=2, tag="other"))
+
+        points = jittered_points(optima=numpy.array([[0.0, 1.0]]),
+                                 par_lower_limit=numpy.array([0.0, 0.0]),
+                                 par_upper_limit=numpy.array([1.0, 1.0]),
+                                 generator=numpy.random.default_rng(443))
+        self.assertEqual(points.shape, (1 + WARM_START_COPIES, 2))
+        self.assertListEqual(points[0].tolist(), [0.0, 1.0])
+        self.assertTrue(((points >= 0.0) & (points <= 1.0)).all())
+
+        # Optima found with other bounds are clipped to the current bounds
+        points = jittered_points(optima=numpy.array([[2.0, -1.0]]),
+                                 par_lower_limit=numpy.array([0.0, 0.0]),
+                                 par_upper_limit=numpy.array([1.0, 1.0]),
+                                 generator=numpy.random.default_rng(443))
+        self.assertListEqual(points[0].tolist(), [1.0, 0.0])
+        self.assertTrue(((points >= 0.0) & (points <= 1.0)).all())
+
+    def test_warm_started_solve(self):
+        # The optima of an earlier solve are the first starting guesses of the next solve of the same problem
+        with tempfile.TemporaryDirectory() as warm_start_dir:
+            results = solve(**self.arguments, number_of_restarts=6, number_of_simulations=2000, seed=443,
+                            warm_start_dir=warm_start_dir)
+            for number_of_processes in [None, 2]:
+                warm_started_results = solve(**self.arguments, number_of_restarts=1, number_of_simulations=50, seed=1,
+                                             number_of_processes=number_of_processes, warm_start_dir=warm_start_dir)
+                self.assertListEqual(warm_started_results.starting_guess_array[0].tolist(),
+                                     results.best_solution.parameters)
+                self.assertLessEqual(warm_started_results.best_solution.obj_value, results.best_solution.obj_value)
+
+            # Another tag starts from random guesses
+            other_results = solve(**self.arguments, number_of_restarts=1, number_of_simulations=50, seed=1,
+                                  warm_start_dir=warm_start_dir, warm_start_tag="other")
+            self.assertNotEqual(other_results.starting_guess_array[0].tolist(), results.best_solution.parameters)
+
+            # The optima are clipped when the bounds change, so all the starting guesses are within the new bounds
+            narrowed_results = solve(**dict(self.arguments, par_upper_limit=[0.0] * 4), number_of_restarts=1,
+                                     number_of_simulations=50, seed=1, warm_start_dir=warm_start_dir)
+            self.assertTrue((narrowed_results.starting_guess_array <= 0.0).all())
+            self.assertTrue((narrowed_results.starting_guess_array >= permutation_lower_bounds).all())
+
+    def test_warm_start_lambda(self):
+        # All lambdas have the same name, so their optima can only be told apart by the tag
+        with tempfile.TemporaryDirectory() as warm_start_dir:
+            arguments = dict(self.arguments, obj_func=lambda x: permutation_function(x), number_of_restarts=1,
+                             number_of_simulations=50, seed=1, warm_start_dir=warm_start_dir)
+            with self.assertRaises(ValueError):
+                solve(**arguments)
+            results = solve(**arguments, warm_start_tag="lambda")
+            self.assertIsNotNone(results.best_solution)
+
+
+if __name__ == '__main__':
+    unittest.main()
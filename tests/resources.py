@@ -1,3 +1,10 @@
+import time
+
+import numpy
+
+from pygosolnp.benchmarks.permutations import permutation_function
+
+
 # Use the alkyla function from pysolnp benchmarks to tests lagrangian function
 def alkyla_objective_function(x):
     result = -0.63 * x[3] * x[6] + 50.4 * x[0] + 3.5 * x[1] + x[2] + 33.6 * x[4]
@@ -28,3 +35,22 @@ inequality_lower_bounds = [0.99, 0.99, 0.9, 0.99]
 inequality_upper_bounds = [100 / 99, 100 / 99, 10 / 9, 100 / 99]
 parameter_lower_bounds = [0.0, 0.0, 0.0, 10.0, 0.0, 85.0, 10.0, 3.0, 1.0, 145.0]
 parameter_upper_bounds = [20.0, 16.0, 120.0, 50.0, 20.0, 93.0, 95.0, 12.0, 4.0, 162.0]
+
+
+# Vectorized versions of the alkyla functions, x is a 2d array with one guess per row
+def alkyla_objective_function_batch(x):
+    return alkyla_objective_function(x.T)
+
+
+def alkyla_equality_function_batch(x):
+    return numpy.column_stack(alkyla_equality_function(x.T))
+
+
+def alkyla_inequality_function_batch(x):
+    return numpy.column_stack(alkyla_inequality_function(x.T))
+
+
+# The permutation function with a delay per call, for tests of runs that are stopped by the time budget
+def slow_permutation_function(x):
+    time.sleep(0.01)
+    return permutation_function(x)
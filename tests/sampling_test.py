@@ -0,0 +1,230 @@
+import random
+import unittest
+
+import numpy
+
+from pygosolnp.benchmarks.permutations import permutation_function
+from pygosolnp.pygosolnp import solve
+from pygosolnp.sampling import Distribution, UniformDistribution, NormalDistribution, TriangleDistribution, \
+    ConstantValue, DefaultSampling, SobolSampling, HaltonSampling, LatinHypercubeSampling, WarmStartSampling
+from tests.resources import parameter_lower_bounds, parameter_upper_bounds
+
+
+class FixedStepDistribution(Distribution):
+    # User-defined distribution which only implements the scalar interface
+    def generate(self, generator: random.Random) -> float:
+        return generator.uniform(1.0, 2.0)
+
+
+class TestPygosolnpSampling(unittest.TestCase):
+
+    def test_distribution_generate_batch(self):
+        generator = numpy.random.default_rng(123)
+        number_of_samples = 1000
+
+        uniform = UniformDistribution(lower=-2.0, upper=3.0).generate_batch(generator=generator,
+                                                                           number_of_samples=number_of_samples)
+        self.assertEqual(uniform.shape, (number_of_samples,))
+        self.assertTrue(numpy.all((uniform >= -2.0) & (uniform <= 3.0)))
+
+        normal = NormalDistribution(mean=5.0, standard_deviation=0.0).generate_batch(generator=generator,
+                                                                                    number_of_samples=number_of_samples)
+        self.assertTrue(numpy.all(normal == 5.0))
+
+        triangle = TriangleDistribution(lower=1.0, upper=4.0, mode=2.0).generate_batch(
+            generator=generator, number_of_samples=number_of_samples)
+        self.assertTrue(numpy.all((triangle >= 1.0) & (triangle <= 4.0)))
+
+        degenerate_triangle = TriangleDistribution(lower=1.0, upper=1.0, mode=1.0).generate_batch(
+            generator=generator, number_of_samples=number_of_samples)
+        self.assertTrue(numpy.all(degenerate_triangle == 1.0))
+
+        constant = ConstantValue(value=3.6).generate_batch(generator=generator, number_of_samples=number_of_samples)
+        self.assertTrue(numpy.all(constant == 3.6))
+
+    def test_distribution_generate_batch_scalar_fallback(self):
+        values = FixedStepDistribution().generate_batch(generator=numpy.random.default_rng(123), number_of_samples=50)
+        self.assertEqual(values.dtype, numpy.float64)
+        self.assertEqual(values.shape, (50,))
+        self.assertTrue(numpy.all((values >= 1.0) & (values <= 2.0)))
+
+    def test_default_sampling_generate_all_samples(self):
+        number_of_samples = 100
+        sample_size = len(parameter_lower_bounds)
+        sample_properties = [UniformDistribution(lower=lower, upper=upper) for lower, upper in
+                             zip(parameter_lower_bounds, parameter_upper_bounds)]
+        sample_properties[0] = FixedStepDistribution()
+        sample_properties[1] = ConstantValue(value=7.0)
+
+        def create_sampling(vectorized):
+            return DefaultSampling(parameter_lower_bounds=parameter_lower_bounds,
+                                   parameter_upper_bounds=parameter_upper_bounds,
+                                   sample_properties=sample_properties,
+                                   seed=443,
+                                   vectorized=vectorized)
+
+        # By default the samples are a flat list drawn one sample at a time from random.Random
+        sampling = create_sampling(vectorized=False)
+        expected_samples = []
+        for _ in range(number_of_samples):
+            expected_samples.extend(sampling.generate_sample(sample_size=sample_size))
+        self.assertListEqual(create_sampling(vectorized=False).generate_all_samples(number_of_samples=number_of_samples,
+                                                                                   sample_size=sample_size),
+                             expected_samples)
+
+        samples = create_sampling(vectorized=True).generate_all_samples(number_of_samples=number_of_samples,
+                                                                        sample_size=sample_size)
+
+        self.assertEqual(samples.shape, (number_of_samples, sample_size))
+        self.assertEqual(samples.dtype, numpy.float64)
+        self.assertTrue(samples.flags["C_CONTIGUOUS"])
+        self.assertTrue(numpy.all((samples[:, 0] >= 1.0) & (samples[:, 0] <= 2.0)))
+        self.assertTrue(numpy.all(samples[:, 1] == 7.0))
+        self.assertTrue(numpy.all(samples[:, 2:] >= parameter_lower_bounds[2:]))
+        self.assertTrue(numpy.all(samples[:, 2:] <= parameter_upper_bounds[2:]))
+
+        # The same seed reproduces the same samples
+        same_samples = create_sampling(vectorized=True).generate_all_samples(number_of_samples=number_of_samples,
+                                                                             sample_size=sample_size)
+        numpy.testing.assert_array_equal(samples, same_samples)
+
+        # Single samples are drawn from the same stream as the batches
+        self.assertListEqual(create_sampling(vectorized=True).generate_sample(sample_size=sample_size),
+                             create_sampling(vectorized=True).generate_all_samples(number_of_samples=1,
+                                                                                   sample_size=sample_size)[0].tolist())
+
+    def test_sobol_sampling(self):
+        # Unscrambled Sobol points for the first two parameters, scaled to the bounds [-1, 1] and [0, 4]
+        sampling = SobolSampling(parameter_lower_bounds=[-1.0, 0.0],
+                                 parameter_upper_bounds=[1.0, 4.0],
+                                 scramble=False)
+        samples = sampling.generate_all_samples(number_of_samples=4, sample_size=2)
+        numpy.testing.assert_array_equal(samples, [[-1.0, 0.0], [0.0, 2.0], [0.5, 1.0], [-0.5, 3.0]])
+
+        # Each parameter range split into 2^10 strata has exactly one sample in each stratum
+        number_of_samples = 2 ** 10
+        sample_size = len(parameter_lower_bounds)
+        samples = SobolSampling(parameter_lower_bounds=parameter_lower_bounds,
+                                parameter_upper_bounds=parameter_upper_bounds,
+                                seed=443).generate_all_samples(number_of_samples=number_of_samples,
+                                                               sample_size=sample_size)
+        unit_samples = (samples - parameter_lower_bounds) / (
+                numpy.array(parameter_upper_bounds) - numpy.array(parameter_lower_bounds))
+        for variable_index in range(sample_size):
+            strata = numpy.floor(unit_samples[:, variable_index] * number_of_samples)
+            self.assertEqual(len(numpy.unique(strata)), number_of_samples)
+
+        # Consecutive calls continue the same sequence
+        sampling = SobolSampling(parameter_lower_bounds=parameter_lower_bounds,
+                                 parameter_upper_bounds=parameter_upper_bounds,
+                                 seed=443)
+        first_half = sampling.generate_all_samples(number_of_samples=number_of_samples // 2, sample_size=sample_size)
+        second_half = sampling.generate_all_samples(number_of_samples=number_of_samples // 2, sample_size=sample_size)
+        numpy.testing.assert_array_equal(numpy.vstack((first_half, second_half)), samples)
+
+    def test_halton_sampling(self):
+        sampling = HaltonSampling(parameter_lower_bounds=[0.0, 0.0, 0.0],
+                                  parameter_upper_bounds=[1.0, 1.0, 1.0],
+                                  scramble=False)
+        samples = sampling.generate_all_samples(number_of_samples=3, sample_size=3)
+        numpy.testing.assert_allclose(samples, [[1 / 2, 1 / 3, 1 / 5], [1 / 4, 2 / 3, 2 / 5], [3 / 4, 1 / 9, 3 / 5]])
+
+        samples = HaltonSampling(parameter_lower_bounds=parameter_lower_bounds,
+                                 parameter_upper_bounds=parameter_upper_bounds,
+                                 seed=443).generate_all_samples(number_of_samples=1000,
+                                                                sample_size=len(parameter_lower_bounds))
+        self.assertTrue(numpy.all(samples >= parameter_lower_bounds))
+        self.assertTrue(numpy.all(samples <= parameter_upper_bounds))
+
+    def test_latin_hypercube_sampling(self):
+        number_of_samples = 50
+        samples = LatinHypercubeSampling(parameter_lower_bounds=[0.0, -10.0],
+                                         parameter_upper_bounds=[1.0, 10.0],
+                                         seed=443).generate_all_samples(number_of_samples=number_of_samples,
+                                                                        sample_size=2)
+        numpy.testing.assert_array_equal(numpy.sort(numpy.floor(samples[:, 0] * number_of_samples)),
+                                         numpy.arange(number_of_samples))
+        numpy.testing.assert_array_equal(numpy.sort(numpy.floor((samples[:, 1] + 10.0) / 20.0 * number_of_samples)),
+                                         numpy.arange(number_of_samples))
+
+    def test_low_discrepancy_sampling_solve(self):
+        for sampling_class in [SobolSampling, HaltonSampling, LatinHypercubeSampling]:
+            sampling = sampling_class(parameter_lower_bounds=[-4.0] * 4,
+                                      parameter_upper_bounds=[4.0] * 4,
+                                      seed=443)
+            results = solve(obj_func=permutation_function,
+                            par_lower_limit=[-4.0] * 4,
+                            par_upper_limit=[4.0] * 4,
+                            number_of_restarts=4,
+                            number_of_simulations=2000,
+                            pysolnp_max_major_iter=100,
+                            start_guess_sampling=sampling)
+            self.assertEqual(len(results.starting_guesses), 2000 * 4)
+            self.assertIsNotNone(results.best_solution)
+
+    def test_generate_indexed_samples(self):
+        sample_size = len(parameter_lower_bounds)
+        for sampling_class in [DefaultSampling, SobolSampling, HaltonSampling, LatinHypercubeSampling]:
+            def create_sampling():
+                if sampling_class is DefaultSampling:
+                    return DefaultSampling(parameter_lower_bounds=parameter_lower_bounds,
+                                           parameter_upper_bounds=parameter_upper_bounds,
+                                           sample_properties=None,
+                                           seed=443)
+                return sampling_class(parameter_lower_bounds=parameter_lower_bounds,
+                                      parameter_upper_bounds=parameter_upper_bounds,
+                                      seed=443)
+
+            sampling = create_sampling()
+            self.assertTrue(sampling.supports_indexed_samples)
+            first_chunk = sampling.generate_indexed_samples(start_index=0, number_of_samples=64,
+                                                            sample_size=sample_size)
+            second_chunk = sampling.generate_indexed_samples(start_index=64, number_of_samples=64,
+                                                             sample_size=sample_size)
+            self.assertEqual(first_chunk.shape, (64, sample_size))
+            self.assertFalse(numpy.array_equal(first_chunk, second_chunk))
+
+            # Another instance generates the same chunk in any order
+            other_sampling = create_sampling()
+            numpy.testing.assert_array_equal(
+                other_sampling.generate_indexed_samples(start_index=64, number_of_samples=64,
+                                                        sample_size=sample_size), second_chunk)
+            numpy.testing.assert_array_equal(
+                other_sampling.generate_indexed_samples(start_index=0, number_of_samples=64,
+                                                        sample_size=sample_size), first_chunk)
+
+        # Sobol and Halton sequences are index based, so the indexed samples continue the sequence
+        sampling = SobolSampling(parameter_lower_bounds=parameter_lower_bounds,
+                                 parameter_upper_bounds=parameter_upper_bounds,
+                                 seed=443)
+        numpy.testing.assert_array_equal(
+            sampling.generate_indexed_samples(start_index=0, number_of_samples=128, sample_size=sample_size),
+            sampling.generate_all_samples(number_of_samples=128, sample_size=sample_size))
+
+    def test_warm_start_sampling(self):
+        # The first samples are the points, the samples after them are those of the wrapped sampling
+        sample_size = len(parameter_lower_bounds)
+        points = numpy.array([parameter_lower_bounds, parameter_upper_bounds], dtype=numpy.float64)
+        sampling = SobolSampling(parameter_lower_bounds=parameter_lower_bounds,
+                                 parameter_upper_bounds=parameter_upper_bounds,
+                                 seed=443)
+        expected_samples = sampling.generate_indexed_samples(start_index=0, number_of_samples=8, sample_size=sample_size)
+        expected_samples[:2] = points
+
+        warm_start_sampling = WarmStartSampling(sampling=sampling, points=points)
+        self.assertTrue(warm_start_sampling.supports_indexed_samples)
+        numpy.testing.assert_array_equal(
+            warm_start_sampling.generate_indexed_samples(start_index=0, number_of_samples=8, sample_size=sample_size),
+            expected_samples)
+        numpy.testing.assert_array_equal(
+            warm_start_sampling.generate_indexed_samples(start_index=1, number_of_samples=7, sample_size=sample_size),
+            expected_samples[1:])
+
+        # Samples generated in turn continue after the points
+        warm_start_sampling = WarmStartSampling(sampling=SobolSampling(parameter_lower_bounds=parameter_lower_bounds,
+                                                                       parameter_upper_bounds=parameter_upper_bounds,
+                                                                       seed=443),
+                                                points=points)
+        self.assertListEqual(list(warm_start_sampling.generate_sample(sample_size=sample_size)), parameter_lower_bounds)
+        numpy.testing.assert_array_equal(
+            warm_start_sampling.generate_all_samples(number_of_samples=7, sample_size=sample_size), expected_samples[1:])
@@ -0,0 +1,47 @@
+import os
+import pickle
+import tempfile
+import unittest
+
+import numpy
+
+from pygosolnp.shared_array import SharedArray, MemmapArray
+
+
+class TestPygosolnpSharedArray(unittest.TestCase):
+
+    def test_shared_array(self):
+        shared_array = SharedArray(shape=(3, 2))
+        try:
+            shared_array.array[:] = [[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]]
+
+            # An unpickled instance attaches to the same memory instead of copying it
+            attached_array = pickle.loads(pickle.dumps(shared_array))
+            numpy.testing.assert_array_equal(attached_array.array, shared_array.array)
+            attached_array.array[1] = [7.0, 8.0]
+            self.assertListEqual(shared_array.array[1].tolist(), [7.0, 8.0])
+            attached_array.release()
+        finally:
+            shared_array.release()
+
+    def test_empty_shared_array(self):
+        shared_array = SharedArray(shape=(0, 4))
+        self.assertEqual(shared_array.array.shape, (0, 4))
+        shared_array.release()
+
+    def test_memmap_array(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "array.npy")
+            memmap_array = MemmapArray(path=path, shape=(3, 2))
+            memmap_array.array[:] = [[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]]
+
+            # An unpickled instance opens the same file instead of copying the values
+            attached_array = pickle.loads(pickle.dumps(memmap_array))
+            numpy.testing.assert_array_equal(attached_array.array, memmap_array.array)
+            attached_array.array[1] = [7.0, 8.0]
+            self.assertListEqual(memmap_array.array[1].tolist(), [7.0, 8.0])
+            attached_array.release()
+            memmap_array.release()
+
+            # The file is kept after release
+            self.assertListEqual(numpy.load(path).tolist(), [[1.0, 2.0], [7.0, 8.0], [5.0, 6.0]])